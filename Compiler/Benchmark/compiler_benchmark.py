@@ -0,0 +1,281 @@
+"""
+Times every phase of the forgeapi_compiler pipeline on synthetic workloads.
+
+Reports wall time, throughput and peak memory per phase for each workload scale,
+the scaling exponent of every phase across the scales and the comparison with a stored baseline.
+
+Usage (from the Compiler directory):
+    python3 -m Benchmark.compiler_benchmark [--tables 50,100,200,400] [--save-baseline NAME] [--compare NAME]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import forgeapi_compiler
+from CompilerBackend.sql_code_generator import SQLCodeGenerator
+from CompilerBackend.nodejs_endpoint_generator import NodeJSCodeGenerator
+from CompilerBackend.appjs_route_generator import AppJSRouteGenerator
+from CompilerBackend.env_generator import EnvGenerator
+from Benchmark.workload_generator import WorkloadGenerator
+
+BENCHMARK_FORMAT_VERSION = 1
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+PHASES = (
+    'initialize_lexer',
+    'parse_tokens',
+    'process_database_schema',
+    'SQLCodeGenerator.generate',
+    'NodeJSCodeGenerator.generate_code',
+    'write_files',
+)
+
+def run_pipeline(source, output_dir, measure):
+    """
+    Run the compiler pipeline once, measuring every phase
+    :param source: The .forgeapi source code
+    :param output_dir: Directory the generated files are written to
+    :param measure: Context manager factory taking the phase name, e.g. PhaseTimer.phase
+    """
+    with measure('initialize_lexer'):
+        tokens = forgeapi_compiler.initialize_lexer(source)
+    with measure('parse_tokens'):
+        parse_tree = forgeapi_compiler.parse_tokens(tokens)
+    with measure('process_database_schema'):
+        endpoint_data = forgeapi_compiler.extract_endpoint_data(parse_tree)
+        database_schema = forgeapi_compiler.process_database_schema(parse_tree)
+        primary_keys = forgeapi_compiler.get_primary_keys(database_schema)
+        auto_id_columns = forgeapi_compiler.get_auto_id_columns(database_schema)
+    with measure('SQLCodeGenerator.generate'):
+        sql_code = SQLCodeGenerator(database_schema).generate()
+    with measure('NodeJSCodeGenerator.generate_code'):
+        nodejs_code = NodeJSCodeGenerator(auto_id_columns, primary_keys, endpoint_data).generate_code()
+    with measure('write_files'):
+        forgeapi_compiler.write_sql_to_file(sql_code, os.path.join(output_dir, 'schema.sql'))
+        forgeapi_compiler.write_env_to_file(EnvGenerator(database_schema.name).generate_env_content(),
+                                            os.path.join(output_dir, '.env'))
+        forgeapi_compiler.write_endpoints_to_files(nodejs_code, os.path.join(output_dir, 'REST'))
+        app_js_generator = AppJSRouteGenerator(os.path.join(output_dir, 'app.js'))
+        app_js_generator.insert_routes(os.path.join(output_dir, 'routes.js'),
+                                       app_js_generator.generate_routes(endpoint_data))
+
+class PhaseTimer:
+    """
+    Collects the wall time of each phase, or the tracemalloc peak if memory tracing is enabled.
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Measure the code executed inside the with-block as phase name
+        :param name: The name of the phase
+        """
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        if self.trace_memory:
+            self.results[name] = tracemalloc.get_traced_memory()[1] - start_memory
+        else:
+            self.results[name] = elapsed
+
+def benchmark_workload(workload, repeats):
+    """
+    Benchmark the pipeline on one workload
+    :param workload: The WorkloadGenerator describing the workload
+    :param repeats: Number of timing runs, the fastest run of every phase is reported
+    :return: Dictionary with the workload description and the results of every phase
+    """
+    source = workload.generate()
+    phase_times = {phase: math.inf for phase in PHASES}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeats):
+            timer = PhaseTimer()
+            run_pipeline(source, output_dir, timer.phase)
+            for phase, elapsed in timer.results.items():
+                phase_times[phase] = min(phase_times[phase], elapsed)
+
+        # Memory is measured in a separate run, because tracing allocations distorts the timings
+        memory_timer = PhaseTimer(trace_memory=True)
+        tracemalloc.start()
+        try:
+            run_pipeline(source, output_dir, memory_timer.phase)
+        finally:
+            tracemalloc.stop()
+
+    lines = source.count('\n')
+    phases = {}
+    for phase in PHASES:
+        phases[phase] = {
+            'seconds': phase_times[phase],
+            'tables_per_second': workload.table_count / phase_times[phase] if phase_times[phase] else None,
+            'peak_memory_bytes': memory_timer.results[phase],
+        }
+    total_seconds = sum(phase_times.values())
+    return {
+        'tables': workload.table_count,
+        'columns': workload.column_count,
+        'fk_density': workload.fk_density,
+        'endpoints_per_table': workload.endpoints_per_table,
+        'source_bytes': len(source),
+        'source_lines': lines,
+        'total_seconds': total_seconds,
+        'lines_per_second': lines / total_seconds if total_seconds else None,
+        'phases': phases,
+    }
+
+def scaling_exponents(results):
+    """
+    Fit time = c * tables^k for every phase by least squares on the log-log scale
+    :param results: The benchmark results of the workloads, ordered by scale
+    :return: Dictionary mapping each phase (and 'total') to its exponent k, 1.0 means linear scaling
+    """
+    if len(results) < 2:
+        return {}
+    exponents = {}
+    x = [math.log(result['tables']) for result in results]
+    series = {phase: [result['phases'][phase]['seconds'] for result in results] for phase in PHASES}
+    series['total'] = [result['total_seconds'] for result in results]
+    for name, seconds in series.items():
+        if min(seconds) <= 0:
+            continue
+        y = [math.log(value) for value in seconds]
+        x_mean = sum(x) / len(x)
+        y_mean = sum(y) / len(y)
+        variance = sum((xi - x_mean) ** 2 for xi in x)
+        if variance:
+            exponents[name] = sum((xi - x_mean) * (yi - y_mean) for xi, yi in zip(x, y)) / variance
+    return exponents
+
+def print_report(report):
+    """
+    Print the benchmark report as tables
+    :param report: The report created by run_benchmarks
+    """
+    for result in report['results']:
+        print(f"\n{result['tables']} tables, {result['columns']} columns, {result['endpoints_per_table']} endpoints per table "
+              f"({result['source_lines']} lines, {result['source_bytes'] / 1024:.1f} KiB)")
+        print(f"  {'phase':<36}{'time ms':>10}{'tables/s':>12}{'peak KiB':>12}")
+        for phase in PHASES:
+            phase_result = result['phases'][phase]
+            print(f"  {phase:<36}{phase_result['seconds'] * 1000:>10.2f}"
+                  f"{phase_result['tables_per_second'] or 0:>12.0f}{phase_result['peak_memory_bytes'] / 1024:>12.1f}")
+        print(f"  {'total':<36}{result['total_seconds'] * 1000:>10.2f}   {result['lines_per_second'] or 0:.0f} lines/s")
+
+    if report['scaling_exponents']:
+        print("\nScaling exponent (time ~ tables^k, 1.0 is linear)")
+        for name, exponent in report['scaling_exponents'].items():
+            print(f"  {name:<36}{exponent:>10.2f}")
+
+def run_benchmarks(table_counts, column_count, fk_density, endpoints_per_table, repeats, seed):
+    """
+    Benchmark the pipeline on a series of workloads of growing table count
+    :return: The benchmark report as a JSON serializable dictionary
+    """
+    results = []
+    for table_count in table_counts:
+        workload = WorkloadGenerator(table_count, column_count, fk_density, endpoints_per_table, seed)
+        results.append(benchmark_workload(workload, repeats))
+    return {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'results': results,
+        'scaling_exponents': scaling_exponents(results),
+    }
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Compare the phase timings of the report with a baseline report
+    :param report: The current benchmark report
+    :param baseline: The baseline benchmark report
+    :param threshold: Relative slowdown (e.g. 0.1 for 10%) at which a phase counts as regression
+    :return: List of regression descriptions
+    """
+    regressions = []
+    baseline_results = {result['tables']: result for result in baseline['results']}
+    print(f"\nComparison with baseline from {baseline.get('created', 'unknown')} (threshold {threshold:.0%})")
+    for result in report['results']:
+        baseline_result = baseline_results.get(result['tables'])
+        if baseline_result is None:
+            continue
+        for phase in PHASES + ('total',):
+            current = result['total_seconds'] if phase == 'total' else result['phases'][phase]['seconds']
+            previous = baseline_result['total_seconds'] if phase == 'total' else baseline_result['phases'][phase]['seconds']
+            if not previous:
+                continue
+            change = current / previous - 1
+            marker = ''
+            if change > threshold:
+                marker = '  REGRESSION'
+                regressions.append(f"{phase} at {result['tables']} tables: {change:+.1%}")
+            print(f"  {result['tables']:>6} tables  {phase:<36}{previous * 1000:>10.2f} -> {current * 1000:>10.2f} ms"
+                  f"  {change:+7.1%}{marker}")
+    return regressions
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark the ForgeAPI compiler pipeline")
+    argument_parser.add_argument('--tables', default='50,100,200,400',
+                                 help="Comma separated table counts of the workloads (default: 50,100,200,400)")
+    argument_parser.add_argument('--columns', type=int, default=8, help="Number of columns per table (default: 8)")
+    argument_parser.add_argument('--fk-density', type=float, default=0.5,
+                                 help="Average number of foreign keys per table (default: 0.5)")
+    argument_parser.add_argument('--endpoints', type=int, default=4, help="Number of endpoints per table (default: 4)")
+    argument_parser.add_argument('--repeats', type=int, default=3, help="Timing runs per workload (default: 3)")
+    argument_parser.add_argument('--seed', type=int, default=0, help="Seed of the workload generator (default: 0)")
+    argument_parser.add_argument('--json', help="Write the report to this JSON file")
+    argument_parser.add_argument('--save-baseline', metavar='NAME', help="Store the report as baseline NAME")
+    argument_parser.add_argument('--compare', metavar='NAME', help="Compare the report with baseline NAME")
+    argument_parser.add_argument('--threshold', type=float, default=0.1,
+                                 help="Relative slowdown reported as regression (default: 0.1)")
+    argument_parser.add_argument('--fail-on-regression', action='store_true',
+                                 help="Exit with status 1 if a regression against the baseline is found")
+    arguments = argument_parser.parse_args()
+
+    # The compiler logs every written file, which would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    table_counts = [int(count) for count in arguments.tables.split(',')]
+    report = run_benchmarks(table_counts, arguments.columns, arguments.fk_density,
+                            arguments.endpoints, arguments.repeats, arguments.seed)
+    print_report(report)
+
+    if arguments.json:
+        with open(arguments.json, 'w') as outputFile:
+            json.dump(report, outputFile, indent=2)
+
+    if arguments.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(arguments.save_baseline), 'w') as outputFile:
+            json.dump(report, outputFile, indent=2)
+        print(f"\nBaseline stored in {baseline_path(arguments.save_baseline)}")
+
+    if arguments.compare:
+        try:
+            with open(baseline_path(arguments.compare)) as inputFile:
+                baseline = json.load(inputFile)
+        except FileNotFoundError:
+            print(f"Baseline {arguments.compare} not found in {BASELINE_DIR}")
+            sys.exit(1)
+        regressions = compare_with_baseline(report, baseline, arguments.threshold)
+        if regressions and arguments.fail_on_regression:
+            print("\nRegressions found:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
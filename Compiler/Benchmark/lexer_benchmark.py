@@ -0,0 +1,74 @@
+"""
+Compares the master-regex Lexer against the former per-token implementation.
+
+Usage (from the Compiler directory):
+    python3 -m Benchmark.lexer_benchmark [tables] [repeats]
+"""
+import re
+import sys
+import timeit
+from CompilerFrontend.Lexer.lexer import Lexer
+from CompilerFrontend.Lexer.token_definition import TokenDefinition
+from Benchmark.workload_generator import WorkloadGenerator
+
+class LegacyLexer:
+    """
+    The lexer as it was before the master-regex engine, kept as a reference for the benchmark.
+    It compiles every TokenDefinition at every position and skips comments recursively.
+    """
+    def __init__(self, input_text):
+        self.input_text = input_text
+        self.position = 0
+        self.tokens = []
+
+    def _get_next_substring(self):
+        if self.position >= len(self.input_text):
+            return None, None
+
+        for token in TokenDefinition:
+            pattern = re.compile(token.value)
+            match = pattern.match(self.input_text, self.position)
+            if match:
+                token_value = match.group(0)
+                self.position = match.end()
+                if token == TokenDefinition.COMMENT:
+                    return self._get_next_substring()
+                return token, token_value
+
+        current_char = self.input_text[self.position]
+        self.position += 1
+        return None, current_char
+
+    def tokenize(self):
+        while self.position < len(self.input_text):
+            token, substring = self._get_next_substring()
+            if token:
+                if token not in (TokenDefinition.WS, TokenDefinition.NEWLINE):
+                    self.tokens.append((token, substring))
+            elif substring:
+                raise ValueError(f"Unknown token at position {self.position}: '{substring}'")
+        return self.tokens
+
+def run_benchmark(table_count=200, repeats=5):
+    """
+    Time both lexers on the same generated source and verify they produce identical tokens
+    :param table_count: The number of tables in the generated source
+    :param repeats: The number of timing runs, the best one is reported
+    """
+    source = WorkloadGenerator(table_count).generate()
+
+    if [token[:2] for token in Lexer(source).tokenize()] != LegacyLexer(source).tokenize():
+        raise AssertionError("Lexer and LegacyLexer produced different tokens")
+
+    legacy_time = min(timeit.repeat(lambda: LegacyLexer(source).tokenize(), number=1, repeat=repeats))
+    master_time = min(timeit.repeat(lambda: Lexer(source).tokenize(), number=1, repeat=repeats))
+
+    print(f"Source: {table_count} tables, {len(source)} characters, {source.count(chr(10))} lines")
+    print(f"  LegacyLexer: {legacy_time * 1000:.2f} ms")
+    print(f"  Lexer:       {master_time * 1000:.2f} ms")
+    print(f"  Speedup:     {legacy_time / master_time:.1f}x")
+
+if __name__ == "__main__":
+    table_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(table_count, repeats)
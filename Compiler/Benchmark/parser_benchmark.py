@@ -0,0 +1,274 @@
+"""
+Compares the table-driven Parser against the former recursive descent implementation.
+
+Usage (from the Compiler directory):
+    python3 -m Benchmark.parser_benchmark [tables] [repeats]
+"""
+import sys
+import timeit
+from CompilerFrontend.Lexer.lexer import Lexer
+from CompilerFrontend.Lexer.token_definition import TokenDefinition
+from CompilerFrontend.Parser.ast_nodes import Database, Table, Column, ForeignKey, RestBlock, RestTable, Endpoint, Include, Index, \
+    LogPolicy, Partition
+from CompilerFrontend.Parser.parser import Parser
+from CompilerFrontend.Parser.parser_generator import GRAMMAR_PATH, PARSE_TABLES_PATH, ParserGenerator
+from Benchmark.workload_generator import WorkloadGenerator
+
+# A source using every construct of the grammar, the generated workload only uses a part of it
+FEATURE_SOURCE = """
+DATABASE features {
+    LOG RETAIN 10000 CHECKPOINT 500
+    TABLE customers {
+        COLUMN id auto_id PK not null,
+        COLUMN name string(100) not null,
+        COLUMN joined date
+        INDEX(name, joined)
+    }
+    TABLE orders {
+        COLUMN id integer PK not null, COLUMN customer_id integer not null PK,
+        COLUMN total float, COLUMN paid boolean, COLUMN created_at timestamp not null
+        FK(customers.id)
+        INDEX(created_at),
+        PARTITION BY RANGE(created_at) EVERY 1 MONTH
+    }
+    TABLE events {
+        COLUMN id integer PK
+        PARTITION BY HASH(id) 8
+    }
+    REST {
+        customers {
+            get /customers PAGE 50 MAX 500 CONSISTENCY leader CACHE 5000 MAX 100,
+            get /customer?id -> name, joined,
+            get /customer_names -> name, PAGE 20
+            post[] /customers?name&joined MAX 1000,
+            put /customer?id&name
+            delete /customer?id
+        },
+        orders { get /orders?customer_id CACHE 1000, post /order?id&customer_id&total }
+        events { }
+    }
+}
+"""
+
+class LegacyParser:
+    """
+    The recursive descent parser as it was before the parse tables were generated, kept as a reference for the benchmark.
+    Every rule is a method comparing the TokenDefinition of the current token.
+    Unlike before, a FK directly after the attributes of a column ends the column instead of looping forever.
+    """
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.current_token = next(self.tokens, None)
+
+    def _advance(self):
+        self.current_token = next(self.tokens, None)
+
+    def _expect(self, *expected_tokens):
+        current_token = self.current_token[0] if self.current_token else None
+        if current_token in expected_tokens:
+            token_value = self.current_token[1]
+            self._advance()
+            return token_value
+        expected_names = ', '.join([repr(token) for token in expected_tokens])
+        raise SyntaxError(f"Expected one of {expected_names}, but found {self.current_token!r}")
+
+    def _at(self, *token_types):
+        return self.current_token and self.current_token[0] in token_types
+
+    def parse(self):
+        self._expect(TokenDefinition.DATABASE)
+        dbname = self._expect(TokenDefinition.IDENTIFIER)
+        self._expect(TokenDefinition.LBRACE)
+        log_policy = self._parse_log_policy() if self._at(TokenDefinition.LOG) else None
+        tables = []
+        while self._at(TokenDefinition.TABLE, TokenDefinition.INCLUDE):
+            if self.current_token[0] == TokenDefinition.INCLUDE:
+                self._advance()
+                tables.append(Include(self._expect(TokenDefinition.STRING_LITERAL)[1:-1]))
+            else:
+                tables.append(self._parse_table())
+        rest_block = self._parse_rest_block() if self._at(TokenDefinition.REST) else None
+        self._expect(TokenDefinition.RBRACE)
+        return Database(dbname, tuple(tables), rest_block, log_policy)
+
+    def _parse_log_policy(self):
+        self._expect(TokenDefinition.LOG)
+        retain = None
+        checkpoint_interval = None
+        if self._at(TokenDefinition.RETAIN):
+            self._advance()
+            retain = int(self._expect(TokenDefinition.NUMBER))
+        if self._at(TokenDefinition.CHECKPOINT):
+            self._advance()
+            checkpoint_interval = int(self._expect(TokenDefinition.NUMBER))
+        return LogPolicy(retain, checkpoint_interval)
+
+    def _parse_table(self):
+        self._expect(TokenDefinition.TABLE)
+        tablename = self._expect(TokenDefinition.IDENTIFIER)
+        self._expect(TokenDefinition.LBRACE)
+        parts = []
+        for token_type, parse_part in ((TokenDefinition.COLUMN, self._parse_column), (TokenDefinition.FK, self._parse_foreign_key),
+                                       (TokenDefinition.INDEX, self._parse_index)):
+            nodes = []
+            while self._at(token_type):
+                nodes.append(parse_part())
+                if self._at(TokenDefinition.COMMA):
+                    self._advance()
+            parts.append(tuple(nodes))
+        partition = self._parse_partition() if self._at(TokenDefinition.PARTITION) else None
+        self._expect(TokenDefinition.RBRACE)
+        return Table(tablename, *parts, partition)
+
+    def _parse_column(self):
+        self._expect(TokenDefinition.COLUMN)
+        columnname = self._expect(TokenDefinition.IDENTIFIER)
+        datatype = self._expect(TokenDefinition.STRING, TokenDefinition.INTEGER, TokenDefinition.FLOAT, TokenDefinition.BOOLEAN,
+                                TokenDefinition.DATE, TokenDefinition.TIMESTAMP, TokenDefinition.AUTO_ID)
+        primary_key = False
+        not_null = False
+        while self._at(TokenDefinition.PK, TokenDefinition.NOT_NULL):
+            if self.current_token[0] == TokenDefinition.PK:
+                primary_key = True
+            else:
+                not_null = True
+            self._advance()
+        return Column(columnname, datatype, primary_key, not_null)
+
+    def _parse_foreign_key(self):
+        self._expect(TokenDefinition.FK)
+        self._expect(TokenDefinition.LPAREN)
+        referenced_table = self._expect(TokenDefinition.IDENTIFIER)
+        self._expect(TokenDefinition.DOT)
+        referenced_column = self._expect(TokenDefinition.IDENTIFIER)
+        self._expect(TokenDefinition.RPAREN)
+        return ForeignKey(referenced_table, referenced_column)
+
+    def _parse_index(self):
+        self._expect(TokenDefinition.INDEX)
+        self._expect(TokenDefinition.LPAREN)
+        columns = [self._expect(TokenDefinition.IDENTIFIER)]
+        while self._at(TokenDefinition.COMMA):
+            self._advance()
+            columns.append(self._expect(TokenDefinition.IDENTIFIER))
+        self._expect(TokenDefinition.RPAREN)
+        return Index(tuple(columns))
+
+    def _parse_partition(self):
+        self._expect(TokenDefinition.PARTITION)
+        self._expect(TokenDefinition.BY)
+        method = self._expect(TokenDefinition.RANGE, TokenDefinition.HASH).lower()
+        self._expect(TokenDefinition.LPAREN)
+        column = self._expect(TokenDefinition.IDENTIFIER)
+        self._expect(TokenDefinition.RPAREN)
+        if method == 'hash':
+            return Partition(method, column, partitions=int(self._expect(TokenDefinition.NUMBER)))
+        self._expect(TokenDefinition.EVERY)
+        interval = int(self._expect(TokenDefinition.NUMBER))
+        unit = self._expect(TokenDefinition.IDENTIFIER) if self._at(TokenDefinition.IDENTIFIER) else None
+        return Partition(method, column, interval=interval, unit=unit)
+
+    def _parse_rest_block(self):
+        self._expect(TokenDefinition.REST)
+        self._expect(TokenDefinition.LBRACE)
+        rest_tables = []
+        while self.current_token and self.current_token[0] != TokenDefinition.RBRACE:
+            table_name = self._expect(TokenDefinition.IDENTIFIER)
+            self._expect(TokenDefinition.LBRACE)
+            endpoints = []
+            while self._at(TokenDefinition.GET, TokenDefinition.POST, TokenDefinition.PUT, TokenDefinition.DELETE):
+                endpoints.append(self._parse_rest_endpoint(table_name))
+                if self._at(TokenDefinition.COMMA):
+                    self._advance()
+            self._expect(TokenDefinition.RBRACE)
+            rest_tables.append(RestTable(table_name, tuple(endpoints)))
+            if self._at(TokenDefinition.COMMA):
+                self._advance()
+        self._expect(TokenDefinition.RBRACE)
+        return RestBlock(tuple(rest_tables))
+
+    def _parse_maximum(self):
+        if self._at(TokenDefinition.MAX):
+            self._advance()
+            return int(self._expect(TokenDefinition.NUMBER))
+        return None
+
+    def _parse_rest_endpoint(self, table_name):
+        method = self._expect(TokenDefinition.GET, TokenDefinition.POST, TokenDefinition.PUT, TokenDefinition.DELETE)
+        batch = False
+        if self._at(TokenDefinition.LBRACKET):
+            self._advance()
+            self._expect(TokenDefinition.RBRACKET)
+            batch = True
+        url = self._expect(TokenDefinition.URL)
+        query_params = []
+        if self._at(TokenDefinition.QUESTION_MARK):
+            self._advance()
+            query_params.append(self._expect(TokenDefinition.IDENTIFIER))
+            while self._at(TokenDefinition.AMPERSAND):
+                self._advance()
+                query_params.append(self._expect(TokenDefinition.IDENTIFIER))
+        max_batch_size = self._parse_maximum() if batch else None
+        columns = []
+        if self._at(TokenDefinition.ARROW):
+            self._advance()
+            columns.append(self._expect(TokenDefinition.IDENTIFIER))
+            while self._at(TokenDefinition.COMMA):
+                self._advance()
+                if not self._at(TokenDefinition.IDENTIFIER):
+                    break
+                columns.append(self._expect(TokenDefinition.IDENTIFIER))
+        page_size = None
+        max_page_size = None
+        if self._at(TokenDefinition.PAGE):
+            self._advance()
+            page_size = int(self._expect(TokenDefinition.NUMBER))
+            max_page_size = self._parse_maximum()
+        consistency = 'quorum'
+        if self._at(TokenDefinition.CONSISTENCY):
+            self._advance()
+            consistency = self._expect(TokenDefinition.IDENTIFIER)
+        cache_ttl = None
+        cache_size = None
+        if self._at(TokenDefinition.CACHE):
+            self._advance()
+            cache_ttl = int(self._expect(TokenDefinition.NUMBER))
+            cache_size = self._parse_maximum()
+        return Endpoint(table_name, method, url, tuple(query_params), tuple(columns), page_size, max_page_size, consistency,
+                        batch, max_batch_size, cache_ttl, cache_size)
+
+def check_parse_tables():
+    """
+    Verify that the parse tables were generated from the current grammar
+    """
+    with open(GRAMMAR_PATH, 'r') as grammar_file, open(PARSE_TABLES_PATH, 'r') as tables_file:
+        if ParserGenerator(grammar_file.read()).generate() != tables_file.read():
+            raise AssertionError("The parse tables are stale, regenerate them with CompilerFrontend.Parser.parser_generator")
+
+def run_benchmark(table_count=200, repeats=5):
+    """
+    Time both parsers on the same tokens of a generated source and verify they produce identical trees
+    :param table_count: The number of tables in the generated source
+    :param repeats: The number of timing runs, the best one is reported
+    """
+    check_parse_tables()
+    source = WorkloadGenerator(table_count).generate()
+    tokens = Lexer(source).tokenize()
+
+    for checked_source in (source, FEATURE_SOURCE):
+        checked_tokens = Lexer(checked_source).tokenize()
+        if Parser(checked_tokens).parse() != LegacyParser(checked_tokens).parse():
+            raise AssertionError("Parser and LegacyParser produced different trees")
+
+    legacy_time = min(timeit.repeat(lambda: LegacyParser(tokens).parse(), number=1, repeat=repeats))
+    table_time = min(timeit.repeat(lambda: Parser(tokens).parse(), number=1, repeat=repeats))
+
+    print(f"Source: {table_count} tables, {len(tokens)} tokens")
+    print(f"  LegacyParser: {legacy_time * 1000:.2f} ms")
+    print(f"  Parser:       {table_time * 1000:.2f} ms")
+    print(f"  Speedup:      {legacy_time / table_time:.1f}x")
+
+if __name__ == "__main__":
+    table_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(table_count, repeats)
@@ -0,0 +1,142 @@
+"""
+Generates synthetic .forgeapi sources at a configurable scale for the compiler benchmarks.
+
+Usage (from the Compiler directory):
+    python3 -m Benchmark.workload_generator output.forgeapi [--tables N] [--columns M] [--fk-density D] [--endpoints K]
+"""
+import argparse
+import random
+
+# Datatypes used for the generated non-key columns
+DATATYPES = ('string(100)', 'integer', 'float', 'boolean', 'date', 'timestamp', 'string(255)')
+
+# HTTP methods of the generated endpoints, cycled per table
+METHODS = ('get', 'post', 'put', 'delete')
+
+class WorkloadGenerator:
+    """
+    Generates a valid .forgeapi source with tables, foreign keys and REST endpoints.
+
+    - Parameters:
+      table_count: int - Number of tables (N).
+      column_count: int - Number of columns per table (M), including the primary key and foreign key columns.
+      fk_density: float - Average number of foreign keys per table, each referencing an earlier table.
+      endpoints_per_table: int - Number of REST endpoints per table (K).
+      seed: int - Seed for the random generator, the same arguments always produce the same source.
+    """
+    def __init__(self, table_count=100, column_count=8, fk_density=0.5, endpoints_per_table=4, seed=0):
+        if table_count < 1 or column_count < 1:
+            raise ValueError("A workload needs at least one table with one column.")
+        self.table_count = table_count
+        self.column_count = column_count
+        self.fk_density = fk_density
+        self.endpoints_per_table = endpoints_per_table
+        self.random = random.Random(seed)
+
+    def _foreign_key_targets(self, table_index):
+        """
+        Choose the earlier tables referenced by a table
+        :param table_index: The index of the table
+        :return: Sorted list of indices of the referenced tables
+        """
+        if table_index == 0:
+            return []
+        count = int(self.fk_density)
+        if self.random.random() < self.fk_density - count:
+            count += 1
+        count = min(count, table_index)
+        return sorted(self.random.sample(range(table_index), count))
+
+    def _generate_table(self, table_index):
+        """
+        Generate the definition of a single table
+        :param table_index: The index of the table
+        :return: The table definition and the names of its columns
+        """
+        columns = [f"COLUMN table{table_index}_id auto_id PK not null"]
+        column_names = [f"table{table_index}_id"]
+        targets = self._foreign_key_targets(table_index)
+        for target in targets:
+            columns.append(f"COLUMN table{target}_id integer not null")
+            column_names.append(f"table{target}_id")
+        for column_index in range(len(columns), self.column_count):
+            datatype = DATATYPES[column_index % len(DATATYPES)]
+            not_null = " not null" if self.random.random() < 0.5 else ""
+            columns.append(f"COLUMN col{column_index} {datatype}{not_null}")
+            column_names.append(f"col{column_index}")
+
+        lines = [f"    TABLE table{table_index} {{"]
+        lines.append(",\n".join(f"        {column}" for column in columns) + ("," if targets else ""))
+        lines.extend(f"        FK (table{target}.table{target}_id)," for target in targets[:-1])
+        lines.extend(f"        FK (table{target}.table{target}_id)" for target in targets[-1:])
+        lines.append("    }")
+        return "\n".join(lines), column_names
+
+    def _generate_endpoints(self, table_index, column_names):
+        """
+        Generate the REST block entry of a single table
+        :param table_index: The index of the table
+        :param column_names: The names of the columns of the table
+        :return: The REST table definition
+        """
+        primary_key = column_names[0]
+        other_columns = column_names[1:]
+        lines = [f"        table{table_index} {{"]
+        for endpoint_index in range(self.endpoints_per_table):
+            method = METHODS[endpoint_index % len(METHODS)]
+            url = f"/{method}Table{table_index}_{endpoint_index}"
+            if method == 'get':
+                filter_count = self.random.randint(0, min(2, len(other_columns)))
+                params = self.random.sample(other_columns, filter_count)
+            elif method == 'post':
+                params = column_names
+            elif method == 'put':
+                params = [primary_key] + other_columns[-1:]
+            else:
+                params = [primary_key]
+            query = f"?{'&'.join(params)}" if params else ""
+            lines.append(f"            {method} {url}{query}")
+        lines.append("        }")
+        return "\n".join(lines)
+
+    def generate(self):
+        """
+        Generate the complete source
+        :return: The .forgeapi source code as a string
+        """
+        tables = []
+        rest_tables = []
+        for table_index in range(self.table_count):
+            table, column_names = self._generate_table(table_index)
+            tables.append(table)
+            if self.endpoints_per_table > 0:
+                rest_tables.append(self._generate_endpoints(table_index, column_names))
+
+        source = f"% Synthetic workload: {self.table_count} tables, {self.column_count} columns, " \
+                 f"fk density {self.fk_density}, {self.endpoints_per_table} endpoints per table\n"
+        source += "DATABASE benchmark {\n" + "\n\n".join(tables) + "\n"
+        if rest_tables:
+            source += "\n    REST {\n" + "\n".join(rest_tables) + "\n    }\n"
+        source += "}\n"
+        return source
+
+    def write(self, file_path):
+        """
+        Generate the source and write it to a file
+        :param file_path: The path to the output file
+        """
+        with open(file_path, 'w') as outputFile:
+            outputFile.write(self.generate())
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Generate a synthetic .forgeapi workload")
+    argument_parser.add_argument('output_file', help="The .forgeapi file to write")
+    argument_parser.add_argument('--tables', type=int, default=100, help="Number of tables (default: 100)")
+    argument_parser.add_argument('--columns', type=int, default=8, help="Number of columns per table (default: 8)")
+    argument_parser.add_argument('--fk-density', type=float, default=0.5,
+                                 help="Average number of foreign keys per table (default: 0.5)")
+    argument_parser.add_argument('--endpoints', type=int, default=4, help="Number of endpoints per table (default: 4)")
+    argument_parser.add_argument('--seed', type=int, default=0, help="Seed of the random generator (default: 0)")
+    arguments = argument_parser.parse_args()
+    WorkloadGenerator(arguments.tables, arguments.columns, arguments.fk_density,
+                      arguments.endpoints, arguments.seed).write(arguments.output_file)
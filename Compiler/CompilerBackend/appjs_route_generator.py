@@ -1,49 +1,57 @@
 import os
+from CompilerBackend.artifact_emitter import ArtifactEmitter
 
-APPJS_ROUTE_GENERATOR_VERSION = '1.0'
+APPJS_ROUTE_GENERATOR_VERSION = '2.0'
 
 class AppJSRouteGenerator:
-    def __init__(self, app_js_path):
+    def __init__(self, app_js_path, emitter=None):
         self.app_js_path = app_js_path
+        self.emitter = emitter or ArtifactEmitter()  # Writes the routes file only if it changed
 
     def insert_routes(self, routes_file_dir, generated_routes):
         """
         Inserts generated routes into the app.js content
         The routes will be inserted at the location where the content of "insert_marker" is found
         
-        :param app_js_content: The content of app.js file as a string
+        :param routes_file_dir: The path to the routes file
         :param generated_routes: A string containing the registered routes
-        :return: The modified content of app.js with the routes inserted
+        :return: 'created', 'updated' or 'unchanged'
         """
-        
-        with open(routes_file_dir, 'w') as file:
-            return file.write(generated_routes)
-        print(f"Routes have been registered in {routes_file_dir}.")
+        return self.emitter.emit(routes_file_dir, generated_routes)
 
-    def generate_routes(self, data):
+    def generate_routes(self, data, layout='endpoint'):
         """
         Generate all routes based on the provided data.
-        :param data: The input data containing tables and endpoints.
+        :param data: The RestBlock node containing tables and endpoints.
+        :param layout: Layout of the route modules, 'endpoint', 'table' or 'bundle'.
         :return: A string containing all generated Fastify route registrations.
         """
         generated_routes = ""
         generated_routes += "module.exports = async function (fastify) {\n"
-        
-        for table in data['tables']:
-            for endpoint in table['endpoints']:
-                generated_routes += f"    fastify.register(require('./REST/{endpoint['table']}{endpoint['url']}'));\n"
+
+        if layout == 'bundle':
+            generated_routes += "    fastify.register(require('./REST/routes'));\n"
+        elif layout == 'table':
+            # Tables may have REST tables in several modules, but only one route module
+            for table_name in dict.fromkeys(table.table for table in data.tables):
+                generated_routes += f"    fastify.register(require('./REST/{table_name}'));\n"
+        else:
+            for table in data.tables:
+                for endpoint in table.endpoints:
+                    generated_routes += f"    fastify.register(require('./REST/{endpoint.table}{endpoint.url}'));\n"
         
         generated_routes += "};\n"
         return generated_routes
 
-    def register_routes(self, data):
+    def register_routes(self, data, layout='endpoint'):
         """
         The main method that orchestrates reading, updating, and writing app.js with generated routes
-        :param data: Dictionary containing the tables and endpoints to generate routes from
+        :param data: RestBlock node containing the tables and endpoints to generate routes from
+        :param layout: Layout of the route modules, 'endpoint', 'table' or 'bundle'
         """
 
         # Generate Fastify routes
-        generated_routes = self.generate_routes(data)
+        generated_routes = self.generate_routes(data, layout)
         
         # Insert the generated routes into registered-routes.txt
         registered_routes_file = "./RaftNode/routes.js"
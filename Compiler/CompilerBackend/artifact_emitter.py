@@ -0,0 +1,112 @@
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+
+class ArtifactEmitter:
+    """
+    Writes generated artifacts only if their content changed.
+
+    Unchanged files are not touched, so their modification times stay the same and build caches
+    (e.g. the Docker build of the RaftNode) remain valid. Changed files are written to a temporary
+    file and renamed, so readers never see a partially written artifact.
+    The emitter can be shared between threads.
+
+    - Parameters:
+      record_diffs: bool - Whether to keep the previous and new content of updated files in diffs.
+    """
+    def __init__(self, record_diffs=False):
+        self.created = []
+        self.updated = []
+        self.unchanged = []
+        self.removed = []
+        self.emitted_paths = set()  # Absolute paths of all artifacts emitted by this emitter
+        self.record_diffs = record_diffs
+        self.diffs = {}  # Path of an updated file -> (previous content, new content)
+        self._lock = threading.Lock()
+        # The umask can only be read by setting it, so it is done once here instead of in writer threads
+        self._umask = os.umask(0)
+        os.umask(self._umask)
+
+    def emit(self, file_path, content):
+        """
+        Write the content to the file if the file does not exist or its content differs
+        :param file_path: The path to the artifact
+        :param content: The generated content as a string
+        :return: 'created', 'updated' or 'unchanged'
+        """
+        data = content.encode('utf-8')
+        status = 'created'
+        if os.path.exists(file_path):
+            with open(file_path, 'rb') as inputFile:
+                existing_data = inputFile.read()
+            if hashlib.sha256(existing_data).digest() == hashlib.sha256(data).digest():
+                status = 'unchanged'
+            else:
+                status = 'updated'
+                if self.record_diffs:
+                    with self._lock:
+                        self.diffs[file_path] = (existing_data.decode('utf-8', 'replace'), content)
+
+        if status != 'unchanged':
+            self._write_atomically(file_path, data)
+
+        with self._lock:
+            getattr(self, status).append(file_path)
+            self.emitted_paths.add(os.path.abspath(file_path))
+        return status
+
+    def _write_atomically(self, file_path, data):
+        """
+        Write the data to a temporary file next to the target and rename it to the target
+        :param file_path: The path to the artifact
+        :param data: The content as bytes
+        """
+        directory = os.path.dirname(file_path) or '.'
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as outputFile:
+                outputFile.write(data)
+            # mkstemp creates private files, generated artifacts get the permissions of a normal new file
+            if os.path.exists(file_path):
+                os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+            else:
+                os.chmod(temp_path, 0o666 & ~self._umask)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def remove_stale_files(self, directory, extension):
+        """
+        Delete files with the extension below the directory which were not emitted by this emitter
+        Subdirectories left empty are deleted as well, the directory itself is kept
+        :param directory: The root directory of the generated artifacts
+        :param extension: The extension of generated files, e.g. '.js'
+        :return: List of the deleted files
+        """
+        removed = []
+        if not os.path.isdir(directory):
+            return removed
+        root_directory = os.path.abspath(directory)
+        for root, dirs, files in os.walk(root_directory, topdown=False):
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                if file_name.endswith(extension) and file_path not in self.emitted_paths:
+                    os.remove(file_path)
+                    removed.append(file_path)
+            if root != root_directory and not os.listdir(root):
+                os.rmdir(root)
+        with self._lock:
+            self.removed.extend(removed)
+        return removed
+
+    def summary(self):
+        """
+        Summarize the emitted artifacts
+        :return: A short human readable summary
+        """
+        return (f"{len(self.created)} created, {len(self.updated)} updated, "
+                f"{len(self.unchanged)} unchanged, {len(self.removed)} removed")
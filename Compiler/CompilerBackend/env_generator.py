@@ -1,13 +1,45 @@
+import os
 import secrets
 import string
 
 class EnvGenerator:
-    def __init__(self, dbname):
+    def __init__(self, dbname, env_file_path=None, log_policy=None):
+        """
+        :param dbname: The name of the database
+        :param env_file_path: Optional path to a previously generated .env file. Its passwords are reused
+                              if it belongs to the same database, so the file does not change between runs.
+        :param log_policy: Optional LogPolicy node with the retention of the consensus log
+        """
+        if log_policy is not None and log_policy.checkpoint_interval is not None and log_policy.checkpoint_interval < 1:
+            raise ValueError(f"Checkpoint interval {log_policy.checkpoint_interval} of the consensus log must be at least 1.")
         self.dbname = dbname
+        self.log_policy = log_policy
         self.user = f"{dbname}User"
-        self.password = self.generate_secure_password()
-        self.root_password = self.generate_secure_password()
-        
+        existing_env = self.read_existing_env(env_file_path)
+        if existing_env.get('MYSQL_DATABASE') == dbname and existing_env.get('MYSQL_USER') == self.user \
+                and existing_env.get('MYSQL_PASSWORD') and existing_env.get('MYSQL_ROOT_PASSWORD'):
+            self.password = existing_env['MYSQL_PASSWORD']
+            self.root_password = existing_env['MYSQL_ROOT_PASSWORD']
+        else:
+            self.password = self.generate_secure_password()
+            self.root_password = self.generate_secure_password()
+
+    def read_existing_env(self, env_file_path):
+        """
+        Read the variables of a previously generated .env file
+        :param env_file_path: The path to the .env file, or None
+        :return: Dictionary of the variables, empty if there is no such file
+        """
+        variables = {}
+        if not env_file_path or not os.path.exists(env_file_path):
+            return variables
+        with open(env_file_path, 'r') as envFile:
+            for line in envFile:
+                name, separator, value = line.strip().partition('=')
+                if separator:
+                    variables[name] = value
+        return variables
+
     def generate_secure_password(self, length=128):
         """
         Generate a secure random password
@@ -29,4 +61,10 @@ class EnvGenerator:
             f"MYSQL_DATABASE={self.dbname}\n"
             f"MYSQL_ROOT_PASSWORD={self.root_password}\n"
         )
+        # Retention of the consensus log, the RaftNode keeps all entries and uses its default interval without them
+        if self.log_policy is not None:
+            if self.log_policy.retain is not None:
+                env_content += f"LOG_RETAIN={self.log_policy.retain}\n"
+            if self.log_policy.checkpoint_interval is not None:
+                env_content += f"LOG_CHECKPOINT_INTERVAL={self.log_policy.checkpoint_interval}\n"
         return env_content
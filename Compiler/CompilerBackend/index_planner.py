@@ -0,0 +1,153 @@
+import re
+from dataclasses import replace
+from CompilerFrontend.Parser.ast_nodes import Index
+
+INDEX_PLANNER_VERSION = '1.1'
+
+# Methods whose generated SQL filters the table by all query parameters
+FILTER_METHODS = ('get', 'delete')
+
+# Maximum key length of an InnoDB index in bytes
+MAX_INDEX_KEY_BYTES = 3072
+
+# Key length in bytes of the ForgeAPI datatypes, strings use up to 4 bytes per character plus 2 length bytes
+DATATYPE_KEY_BYTES = {
+    'auto_id': 4,
+    'integer': 4,
+    'float': 4,
+    'boolean': 1,
+    'date': 3,
+    'timestamp': 4,
+}
+
+class IndexPlanner:
+    """
+    Adds secondary indexes to the database schema for the lookups of the generated endpoints.
+
+    Every foreign key column and every filter set of a GET or DELETE endpoint gets an index,
+    unless it is already served by the primary key or by a leading prefix of another index.
+    A derived index is extended instead of adding a new one if its columns are a subset of a larger
+    filter set, so an index on (dept_id) and a filter on dept_id and salary end up as one index (dept_id, salary).
+    The columns returned by a GET endpoint are appended to the index of its filter, so the index covers the query.
+
+    - Parameters:
+      schema: Database - The database schema, the tables may contain explicit indexes.
+      endpoint_data: RestBlock - The REST block whose query parameters are the filter sets.
+    """
+    def __init__(self, schema, endpoint_data):
+        self.schema = schema
+        self.endpoint_data = endpoint_data
+        self.added_indexes = []  # List of (table name, indexed columns, reasons) of the derived indexes
+        self.skipped_indexes = []  # List of (table name, columns, reason) of indexes exceeding the maximum key length
+
+    def plan(self):
+        """
+        Add the derived indexes to the tables of the schema
+        :return: A Database node whose tables contain the explicit and the derived indexes
+        """
+        filter_sets = self._collect_filter_sets()
+        tables = []
+        for table in self.schema.tables:
+            column_names = [column.name for column in table.columns]
+            for index in table.indexes:
+                for column_name in index.columns:
+                    if column_name not in column_names:
+                        raise ValueError(f"Index of table '{table.name}' references unknown column '{column_name}'.")
+
+            requirements = [((foreign_key.column,), f"FK ({foreign_key.table}.{foreign_key.column})", ())
+                            for foreign_key in table.foreign_keys if foreign_key.column in column_names]
+            for columns, reason, returned_columns in filter_sets.get(table.name, []):
+                requirements.append((tuple(column for column in columns if column in column_names), reason,
+                                     tuple(column for column in returned_columns if column in column_names)))
+
+            derived_indexes = self._plan_table(table, requirements)
+            if derived_indexes:
+                for columns, reasons in derived_indexes:
+                    self.added_indexes.append((table.name, columns, reasons))
+                table = replace(table, indexes=table.indexes + tuple(Index(columns) for columns, reasons in derived_indexes))
+            tables.append(table)
+        return replace(self.schema, tables=tuple(tables))
+
+    def _collect_filter_sets(self):
+        """
+        Collect the filter columns of the GET and DELETE endpoints per table
+        :return: Dictionary mapping table names to lists of (filter columns, reason, returned columns) tuples
+        """
+        filter_sets = {}
+        for rest_table in self.endpoint_data.tables:
+            for endpoint in rest_table.endpoints:
+                if endpoint.method in FILTER_METHODS and endpoint.query_params:
+                    filter_sets.setdefault(rest_table.table, []).append(
+                        (endpoint.query_params, f"{endpoint.method.upper()} {endpoint.url}", endpoint.columns))
+        return filter_sets
+
+    def _key_bytes(self, table, columns):
+        """
+        Estimate the key length of an index
+        :param table: Table node of the index
+        :param columns: The indexed columns
+        :return: The maximum key length in bytes
+        """
+        datatypes = {column.name: column.datatype for column in table.columns}
+        key_bytes = 0
+        for column in columns:
+            size = re.search(r'\((\d+)\)', datatypes[column])
+            key_bytes += int(size.group(1)) * 4 + 2 if size else DATATYPE_KEY_BYTES.get(datatypes[column], 8)
+        return key_bytes
+
+    def _plan_table(self, table, requirements):
+        """
+        Derive the indexes of a single table
+        :param table: Table node with its explicit indexes
+        :param requirements: List of (columns, reason, returned columns) tuples which should be served by an index
+        :return: List of (indexed columns, reasons) tuples of the derived indexes
+        """
+        primary_keys = [column.name for column in table.columns if column.primary_key]
+        explicit_indexes = [index.columns for index in table.indexes]
+        derived_indexes = []  # Lists of [columns, reasons], columns may still be extended
+        covering_requirements = []
+
+        # Smaller filter sets first, so larger ones can extend their indexes without losing the prefix
+        for columns, reason, returned_columns in sorted(requirements, key=lambda requirement: len(set(requirement[0]))):
+            column_set = set(columns)
+            if not column_set or (primary_keys and primary_keys[0] in column_set):
+                continue  # The leading column of the primary key already narrows the rows down
+            if returned_columns:
+                covering_requirements.append((column_set, reason, returned_columns))
+            if any(set(index[:len(column_set)]) == column_set for index in explicit_indexes):
+                continue
+
+            covering_index = next((index for index in derived_indexes
+                                   if set(index[0][:len(column_set)]) == column_set), None)
+            if covering_index is not None:
+                if reason not in covering_index[1]:
+                    covering_index[1].append(reason)
+                continue
+
+            extensible_indexes = [index for index in derived_indexes if set(index[0]) < column_set]
+            if extensible_indexes:
+                index = max(extensible_indexes, key=lambda index: len(index[0]))
+                extended_columns = index[0] + tuple(column for column in dict.fromkeys(columns) if column not in index[0])
+                if self._key_bytes(table, extended_columns) <= MAX_INDEX_KEY_BYTES:
+                    index[0] = extended_columns
+                    index[1].append(reason)
+                    continue
+
+            new_columns = tuple(dict.fromkeys(columns))
+            if self._key_bytes(table, new_columns) <= MAX_INDEX_KEY_BYTES:
+                derived_indexes.append([new_columns, [reason]])
+            else:
+                self.skipped_indexes.append((table.name, new_columns, reason))
+
+        # Append the returned columns to the derived index of the filter, secondary indexes contain the primary key anyway
+        for column_set, reason, returned_columns in covering_requirements:
+            index = next((index for index in derived_indexes if set(index[0][:len(column_set)]) == column_set), None)
+            if index is None:
+                continue  # Served by an explicit index, which is left as declared
+            missing_columns = tuple(column for column in dict.fromkeys(returned_columns)
+                                    if column not in index[0] and column not in primary_keys)
+            if missing_columns and self._key_bytes(table, index[0] + missing_columns) <= MAX_INDEX_KEY_BYTES:
+                index[0] = index[0] + missing_columns
+                if reason not in index[1]:
+                    index[1].append(reason)
+        return [(columns, reasons) for columns, reasons in derived_indexes]
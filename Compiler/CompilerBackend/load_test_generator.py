@@ -0,0 +1,51 @@
+import json
+
+LOAD_TEST_GENERATOR_VERSION = '1.0'
+
+# Version of the format of the endpoint definitions read by the load test
+LOAD_TEST_ENDPOINTS_FORMAT = 1
+
+# Share of the requests of an endpoint in the default request mix, changed with --mix of the load test
+DEFAULT_ENDPOINT_WEIGHT = 1
+
+class LoadTestGenerator:
+    """
+    Generates the endpoint definitions LoadTest/endpoints.json of the load test harness LoadTest/load_test.py from the REST block.
+
+    Every endpoint is described by its method, URL and the Fastify schemas of its query string and body, taken from
+    the NodeJSCodeGenerator, so the random payloads of the load test pass the validation of the generated endpoints.
+
+    - Parameters:
+      database_name: str - Name of the database, written to the reports of the load test.
+      nodejs_generator: NodeJSCodeGenerator - The generator of the endpoints, resolves their options and schemas.
+    """
+    def __init__(self, database_name, nodejs_generator):
+        self.database_name = database_name
+        self.nodejs_generator = nodejs_generator
+
+    def generate(self):
+        """
+        Generate the endpoint definitions
+        :return: The JSON document of LoadTest/endpoints.json
+        """
+        endpoints = []
+        for table_name, method, url, query_params, returned_columns, pagination, consistency, max_batch_size, \
+                read_cache, invalidates_cache, columns in self.nodejs_generator.resolve_endpoints():
+            schema = self.nodejs_generator.generate_route_schema(method, query_params, returned_columns, pagination,
+                                                                 max_batch_size, columns)
+            endpoints.append({
+                'name': url.replace('/', ''),
+                'table': table_name,
+                'method': method.upper(),
+                'url': url,
+                'weight': DEFAULT_ENDPOINT_WEIGHT,
+                'querystring': schema.get('querystring'),
+                'body': schema.get('body'),
+            })
+
+        definitions = {
+            'format': LOAD_TEST_ENDPOINTS_FORMAT,
+            'database': self.database_name,
+            'endpoints': endpoints,
+        }
+        return json.dumps(definitions, indent=2) + "\n"
@@ -1,10 +1,70 @@
-NODEJ_CODE_GENERATOR_VERSION = '1.4.2'
+import re
+from CompilerBackend.parallel_generation import generate_in_parallel
+
+NODEJ_CODE_GENERATOR_VERSION = '2.0.0'
+
+# Maximum page size of paginated endpoints which do not declare one with MAX
+DEFAULT_MAX_PAGE_SIZE = 1000
+
+# Query parameters reserved for the page requested from a paginated endpoint
+PAGINATION_PARAMETERS = ('cursor', 'limit')
+
+# Maximum number of rows of batch endpoints which do not declare one with MAX
+DEFAULT_MAX_BATCH_SIZE = 1000
+
+# Maximum number of placeholders of a prepared statement in MariaDB
+MAX_STATEMENT_PLACEHOLDERS = 65535
+
+# Maximum number of cached results of cached endpoints which do not declare one with MAX
+DEFAULT_MAX_CACHE_ENTRIES = 1000
+
+# Methods whose endpoints write to their table and invalidate its cached reads
+WRITE_METHODS = ('post', 'put', 'delete')
+
+# Length of string columns declared without one, the length of their VARCHAR
+DEFAULT_STRING_LENGTH = 255
+
+# Modules of the RaftNode required by the generated endpoints, relative to the RaftNode directory
+RUNTIME_MODULES = {
+    'consensusVoting': 'Consensus/consensusVoting',
+    'readCache': 'DB/readCache',
+}
+
+# Layouts of the generated route modules: one module per endpoint, one per table or one for all endpoints
+ROUTE_MODULE_LAYOUTS = ('endpoint', 'table', 'bundle')
+
+# Maximum length of a JavaScript object literal written on one line
+MAX_INLINE_OBJECT_LENGTH = 80
+
+# JSON schemas of the ForgeAPI datatypes, used by Fastify to validate requests and to serialize responses
+# MariaDB accepts timestamps with a space or a 'T' between date and time, but no time zone
+JSON_SCHEMA_TYPES = {
+    'auto_id': {'type': 'integer'},
+    'integer': {'type': 'integer'},
+    'float': {'type': 'number'},
+    'boolean': {'type': 'boolean'},
+    'date': {'type': 'string', 'format': 'date'},
+    'timestamp': {'type': 'string', 'pattern': r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?$'},
+}
+
+# Functions of consensusVoting reading with the consistency level of a GET endpoint
+# quorum: all nodes execute the query and vote on the result, leader: local read on the leader holding its lease,
+# any: local read on the node receiving the request
+CONSISTENCY_READ_FUNCTIONS = {
+    'quorum': 'get',
+    'leader': 'getFromLeader',
+    'any': 'getFromAny',
+}
 
 class NodeJSCodeGenerator:
-    def __init__(self, auto_id_column, primary_keys, endpoint_data):
+    def __init__(self, auto_id_column, primary_keys, endpoint_data, cache=None, profiler=None, jobs=1, table_columns=None):
         self.endpoint_data = endpoint_data
         self.primary_keys = primary_keys
+        self.table_columns = table_columns  # Optional mapping of table names to their Column nodes by name, validates returned columns and defines the schemas
         self.auto_id_columns = auto_id_column
+        self.cache = cache  # Optional CompilationCache for the generated endpoint code
+        self.profiler = profiler  # Optional CompileProfiler counting the generated endpoints
+        self.jobs = jobs  # Number of worker processes generating the endpoint code
         self.generated_endpoints = []  # List to store the generated endpoints
 
     def format_query_params(self, method, query_params):
@@ -23,7 +83,7 @@ class NodeJSCodeGenerator:
                 return f"{{ {', '.join(query_params)} }} = req.body"
         return ""
     
-    def generate_sql_query(self, table_name, method, query_params):
+    def generate_sql_query(self, table_name, method, query_params, returned_columns=()):
         """
         Generates an SQL statement based on the HTTP method, table name, URL, and query parameters.
 
@@ -31,11 +91,12 @@ class NodeJSCodeGenerator:
         :param method: HTTP method (GET, POST, PUT, DELETE).
         :param url: URL path (used to derive query parameters).
         :param query_params: List of query parameters.
+        :param returned_columns: Columns selected by a GET endpoint, all columns if empty.
         :return: The SQL statement as a string.
         """
         if method == 'get':
             # Generate SELECT query
-            columns = '*'
+            columns = ', '.join(returned_columns) if returned_columns else '*'
             sql_query = f"SELECT {columns} FROM {table_name}"
             # Assuming the URL contains query parameters, e.g., /path?param=value
             if query_params:
@@ -48,9 +109,10 @@ class NodeJSCodeGenerator:
             sql_query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
         
         elif method == 'put':
-            # Generate UPDATE query
-            set_clause = ', '.join([f"{param} = ?" for param in query_params])
-            sql_query = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+            # Generate UPDATE query of the row identified by the primary key
+            updated_columns, primary_key = self.resolve_update_columns(table_name, query_params)
+            set_clause = ', '.join([f"{column} = ?" for column in updated_columns])
+            sql_query = f"UPDATE {table_name} SET {set_clause} WHERE {' AND '.join([f'{column} = ?' for column in primary_key])}"
         
         elif method == 'delete':
             # Generate DELETE query
@@ -61,19 +123,83 @@ class NodeJSCodeGenerator:
         
         return sql_query
 
-    def generate_query_processing(self, method, query_params):
+    def generate_paginated_sql_queries(self, table_name, query_params, returned_columns, pagination):
+        """
+        Generates the SELECT statements of a paginated GET endpoint using keyset pagination on the primary key.
+        One more row than the page size is selected to detect whether a next page exists.
+
+        :param table_name: Name of the table to generate the SQL for.
+        :param query_params: List of query parameters.
+        :param returned_columns: Columns selected by the endpoint, all columns if empty.
+        :param pagination: Tuple of the primary key, the default and the maximum page size.
+        :return: Tuple of the SQL statements for the first page and for the pages after a cursor.
+        """
+        primary_key = pagination[0]
+        columns = ', '.join(returned_columns) if returned_columns else '*'
+        conditions = [f"{param} = ?" for param in query_params]
+        first_page_query = f"SELECT {columns} FROM {table_name}"
+        if conditions:
+            first_page_query += f" WHERE {' AND '.join(conditions)}"
+        next_page_query = f"SELECT {columns} FROM {table_name} WHERE {' AND '.join(conditions + [f'{primary_key} > ?'])}"
+        order_clause = f" ORDER BY {primary_key} LIMIT ?"
+        return first_page_query + order_clause, next_page_query + order_clause
+
+    def generate_pagination_code(self, query_params):
+        """
+        Generates the code reading the requested page of a paginated GET endpoint
+        The schema of the endpoint validates the limit and sets its default
+
+        :param query_params: List of query parameters.
+        :return: The generated code in JavaScript notation for Fastify servers.
+        """
+        filter_values = ''.join(f"{param}, " for param in query_params)
+        pagination_code = (
+            f"        // Read the requested page, the cursor is the primary key of the last row of the previous page\n"
+            f"        const {{ cursor, limit }} = req.query;\n"
+            f"        const pageParamList = cursor === undefined ? [{filter_values}limit + 1] : [{filter_values}cursor, limit + 1];\n\n"
+        )
+        return pagination_code
+
+    def generate_batch_code(self, name, query_params, max_batch_size):
+        """
+        Generates the code collecting the values of a batch insert and the multi-row INSERT statement
+        All rows are inserted by one statement, so the whole batch is one entry of the consensus log
+
+        :param name: Name of the endpoint, prefix of its module level constants.
+        :param query_params: List of the inserted columns, required in every row.
+        :param max_batch_size: Maximum number of rows of a batch.
+        :return: The generated code in JavaScript notation for Fastify servers.
+        """
+        batch_code = (
+            f"        // Collect the values of all rows, the schema guarantees an array of 1 to {max_batch_size} complete rows\n"
+            f"        const rows = req.body;\n"
+            f"        const paramList = [];\n"
+            f"        for (const row of rows) {{\n"
+            f"            paramList.push({', '.join(f'row.{param}' for param in query_params)});\n"
+            f"        }}\n\n"
+            f"        // Sending the SQL query to the consensus and validate the response\n"
+            f"        const sql_query = {name}InsertQuery + rows.map(() => {name}RowPlaceholders).join(', ');\n"
+        )
+        return batch_code
+
+    def generate_query_processing(self, method, query_params, pagination=None, consistency='quorum'):
         """
         Generates the processing code for the query based on the HTTP method and query parameters
         :param method: HTTP method (GET, POST, PUT, DELETE)
         :param query_params: List of query parameters
+        :param pagination: Tuple of the primary key, the default and the maximum page size of a paginated GET endpoint
+        :param consistency: Read consistency level of a GET endpoint (quorum, leader or any)
         :return: JavaScript code for processing the query
         """
         processing_code = ""
+        read_function = CONSISTENCY_READ_FUNCTIONS[consistency]
 
-        if method == 'get' and query_params == []:
-            processing_code = f"const queryResult = await consensusVoting.get(fastify, sql_query);\n"
-        elif method == 'get' and query_params != []:
-            processing_code = f"const queryResult = await consensusVoting.get(fastify, sql_query, paramList);\n"
+        if method == 'get' and pagination:
+            processing_code = f"const queryResult = await consensusVoting.{read_function}(fastify, sql_query, pageParamList);\n"
+        elif method == 'get' and not query_params:
+            processing_code = f"const queryResult = await consensusVoting.{read_function}(fastify, sql_query);\n"
+        elif method == 'get' and query_params:
+            processing_code = f"const queryResult = await consensusVoting.{read_function}(fastify, sql_query, paramList);\n"
         else:
             processing_code = f"const queryResult = await consensusVoting.post(fastify, sql_query, paramList);\n"
         
@@ -82,108 +208,580 @@ class NodeJSCodeGenerator:
         processing_code += f"        }}\n"
         return processing_code
     
-    def generate_parmeter_validation(self, query_params):
+    def generate_column_schema(self, column_name, columns, nullable=False):
+        """
+        Generates the JSON schema of a column value
+
+        :param column_name: Name of the column.
+        :param columns: Column nodes of the table.
+        :param nullable: Whether NULL is allowed if the column is neither a primary key nor not null.
+        :return: The JSON schema as a dictionary, empty if the column is unknown.
+        """
+        column = next((column for column in columns if column.name == column_name), None)
+        if column is None:
+            return {}
+        if column.datatype.startswith('string'):
+            size = re.search(r'\((\d+)\)', column.datatype)
+            column_schema = {'type': 'string', 'maxLength': int(size.group(1)) if size else DEFAULT_STRING_LENGTH}
+        else:
+            column_schema = dict(JSON_SCHEMA_TYPES.get(column.datatype, {}))
+        if nullable and not (column.primary_key or column.not_null) and 'type' in column_schema:
+            column_schema['type'] = [column_schema['type'], 'null']
+        return column_schema
+
+    def generate_route_schema(self, method, query_params, returned_columns, pagination, max_batch_size, columns):
         """
-        Generates the parameter validation code for the query parameters
+        Generates the Fastify schema of an endpoint from the datatypes of its columns
+        Fastify compiles it into a validator of the request and, for GET endpoints, a serializer of the response
+
+        :param method: HTTP method (GET, POST, PUT, DELETE).
+        :param query_params: List of query parameters, all of them are required.
+        :param returned_columns: Columns selected by a GET endpoint, all columns if empty.
+        :param pagination: Tuple of the primary key, the default and the maximum page size of a paginated GET endpoint.
+        :param max_batch_size: Maximum number of rows of a batch POST endpoint, None if the endpoint inserts one row.
+        :param columns: Column nodes of the table, empty if the columns are unknown.
+        :return: The schema as a dictionary with the optional keys querystring, body and response.
+        """
+        schema = {}
+        properties = {param: self.generate_column_schema(param, columns, nullable=method != 'get') for param in query_params}
+        parameters_schema = {'type': 'object'}
+        if query_params:
+            parameters_schema['required'] = list(query_params)
+
+        if method == 'get':
+            if pagination:
+                properties['cursor'] = self.generate_column_schema(pagination[0], columns)
+                properties['limit'] = {'type': 'integer', 'minimum': 1, 'maximum': pagination[2], 'default': pagination[1]}
+            if properties:
+                schema['querystring'] = {**parameters_schema, 'properties': properties}
+        elif max_batch_size:
+            schema['body'] = {'type': 'array', 'minItems': 1, 'maxItems': max_batch_size,
+                              'items': {**parameters_schema, 'properties': properties}}
+        elif query_params:
+            schema['body'] = {**parameters_schema, 'properties': properties}
+
+        # Only declared properties are serialized, so the response schema needs the columns of the table
+        column_names = [column.name for column in columns]
+        row_columns = returned_columns or tuple(column_names)
+        if method == 'get' and row_columns and all(column in column_names for column in row_columns):
+            response_properties = {
+                'success': {'type': 'boolean'},
+                'data': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {column: self.generate_column_schema(column, columns, nullable=True) for column in row_columns}
+                    }
+                }
+            }
+            if pagination:
+                cursor_schema = self.generate_column_schema(pagination[0], columns)
+                response_properties['next_cursor'] = {**cursor_schema, 'type': [cursor_schema['type'], 'null']}
+            schema['response'] = {'200': {'type': 'object', 'properties': response_properties}}
+        return schema
+
+    def format_js_value(self, value, indent=0):
+        """
+        Formats a dictionary, list or scalar as a JavaScript literal
+        Objects without nested objects are written on one line if they are short enough
+
+        :param value: The value to format.
+        :param indent: The indentation of the line the value starts on.
+        :return: The value in JavaScript notation.
+        """
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, str):
+            return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+        if isinstance(value, (list, tuple)):
+            return f"[{', '.join(self.format_js_value(item) for item in value)}]"
+
+        if not value:
+            return '{}'
+        keys = [key if re.fullmatch(r'[A-Za-z_$][\w$]*|\d+', key) else self.format_js_value(key) for key in value]
+        if not any(isinstance(item, dict) and item for item in value.values()):
+            inline_object = f"{{ {', '.join(f'{key}: {self.format_js_value(item)}' for key, item in zip(keys, value.values()))} }}"
+            if indent + len(inline_object) <= MAX_INLINE_OBJECT_LENGTH:
+                return inline_object
+        lines = [f"{' ' * (indent + 4)}{key}: {self.format_js_value(item, indent + 4)}" for key, item in zip(keys, value.values())]
+        return "{\n" + ",\n".join(lines) + f"\n{' ' * indent}}}"
+
+    def generate_schema_code(self, name, schema):
+        """
+        Generates the module level declaration of the schema of an endpoint
+
+        :param name: Name of the endpoint, prefix of the schema constant.
+        :param schema: The schema as a dictionary.
+        :return: The generated code in JavaScript notation.
+        """
+        return (
+            f"// Schema validating the request and serializing the response\n"
+            f"const {name}Schema = {self.format_js_value(schema)};\n\n"
+        )
+
+    def generate_validation_error_code(self):
+        """
+        Generates the code rejecting a request which does not match the schema of the endpoint
 
-        :param query_param: List of query parameters.
         :return: The generated code in JavaScript notation for Fastify servers.
         """
-        validation_code = ""
-        for param in query_params:
-            validation_code += f"        if ({param} === undefined) {{\n"
-            validation_code += f"            return res.code(400).send(\n"
-            validation_code += f"                {{\n"
-            validation_code += f"                  success: false,\n"
-            validation_code += f"                  message: 'Missing required parameter {param}'\n"
-            validation_code += f"                }}\n"
-            validation_code += f"            );\n"
-            validation_code += f"        }}\n"
-        return validation_code
+        return (
+            f"        // Reject the request if it does not match the schema\n"
+            f"        if (req.validationError) {{\n"
+            f"            return res.code(400).send(\n"
+            f"                {{\n"
+            f"                  success: false,\n"
+            f"                  message: req.validationError.message\n"
+            f"                }}\n"
+            f"            );\n"
+            f"        }}\n\n"
+        )
 
-    def generate_endpoint_code(self, table_name, method, url, query_params):
+    def generate_cache_lookup_code(self, name, param_list):
+        """
+        Generates the code returning the cached result of a GET endpoint, if an identical request was cached
+
+        :param name: Name of the endpoint, prefix of its cache constant.
+        :param param_list: JavaScript expression of the parameter values identifying the request.
+        :return: The generated code in JavaScript notation.
+        """
+        return (
+            f"        // Return the cached result of an identical request\n"
+            f"        const cacheKey = JSON.stringify({param_list});\n"
+            f"        const cachedResult = {name}Cache.get(cacheKey);\n"
+            f"        if (cachedResult !== undefined) {{\n"
+            f"            return res.code(200).send(cachedResult);\n"
+            f"        }}\n"
+            f"        const generation = {name}Cache.generation();\n\n"
+        )
+
+    def generate_endpoint_code(self, table_name, method, url, query_params, returned_columns=(), pagination=None, consistency='quorum',
+                               max_batch_size=None, read_cache=None, invalidates_cache=False, columns=()):
         """
         Generates the code for a single endpoint based on the table name, HTTP method, URL, and query parameters
+        The SQL queries, the schema and the cache are declared on module level, prefixed with the name of the endpoint,
+        so the code of several endpoints can be combined into one module
 
         :param table_name: Name of the table to generate the endpoint for.
         :param method: HTTP method (GET, POST, PUT, DELETE).
         :param url: URL path for the endpoint.
         :param query_params: List of query parameters.
-        :return: The generated code in JavaScript notation for Fastify servers.
+        :param returned_columns: Columns selected by a GET endpoint, all columns if empty.
+        :param pagination: Tuple of the primary key, the default and the maximum page size of a paginated GET endpoint.
+        :param consistency: Read consistency level of a GET endpoint (quorum, leader or any).
+        :param max_batch_size: Maximum number of rows of a batch POST endpoint, None if the endpoint inserts one row.
+        :param read_cache: Tuple of the TTL in milliseconds and the maximum entries of a cached GET endpoint, None if not cached.
+        :param invalidates_cache: Whether the endpoint writes to a table with cached GET endpoints.
+        :param columns: Column nodes of the table, their datatypes define the schema of the endpoint.
+        :return: Dictionary with the required RaftNode modules, the module level declarations and the route registration
+                 in JavaScript notation for Fastify servers.
         """
+        name = url.replace('/', '')
         query_params_code = self.format_query_params(method, query_params)
-        parameter_validation_code = self.generate_parmeter_validation(query_params)
-        sql_query_code = self.generate_sql_query(table_name, method, query_params)
-        query_processing_code = self.generate_query_processing(method, query_params)
-        
-        # Templating module and endpoint function
-        endpoint_code = (
-            f"const consensusVoting = require('../../Consensus/consensusVoting');\n\n"
-            f"const {url.replace('/', '')} = async (fastify) => {{\n"
-            f"    fastify.{method}('{url}', async (req, res) => {{\n\n"
-        )
+        schema = self.generate_route_schema(method, query_params, returned_columns, pagination, max_batch_size, columns)
+        query_processing_code = self.generate_query_processing(method, query_params, pagination, consistency)
+
+        # Templating the RaftNode modules used by the endpoint
+        requires = ('consensusVoting', 'readCache') if read_cache or invalidates_cache else ('consensusVoting',)
 
-        # Templating parameters and validation if query parameters are present
-        if query_params_code:
-            endpoint_code += (
+        # Templating the module level declarations
+        declarations = f"// {method.upper()} {url}\n"
+        if read_cache:
+            declarations += (
+                f"// Cache of the query results, invalidated by writes to {table_name}\n"
+                f"const {name}Cache = readCache.createReadCache('{table_name}', {read_cache[1]}, {read_cache[0]});\n\n"
+            )
+        if schema:
+            declarations += self.generate_schema_code(name, schema)
+        if max_batch_size:
+            placeholders = ', '.join(['?' for _ in query_params])
+            queries = {
+                f"{name}InsertQuery": f"INSERT INTO {table_name} ({', '.join(query_params)}) VALUES ",
+                f"{name}RowPlaceholders": f"({placeholders})",
+            }
+        elif pagination:
+            first_page_query, next_page_query = self.generate_paginated_sql_queries(table_name, query_params, returned_columns, pagination)
+            queries = {f"{name}FirstPageQuery": first_page_query, f"{name}NextPageQuery": next_page_query}
+        else:
+            queries = {f"{name}Query": self.generate_sql_query(table_name, method, query_params, returned_columns)}
+        declarations += "// SQL of the endpoint\n"
+        declarations += ''.join(f"const {identifier} = `{query}`;\n" for identifier, query in queries.items())
+        declarations += "\n"
+
+        # Templating the route, the schema validation errors are answered like the other errors
+        if 'querystring' in schema or 'body' in schema:
+            route_options = f"{{ schema: {name}Schema, attachValidation: true }}, "
+        elif schema:
+            route_options = f"{{ schema: {name}Schema }}, "
+        else:
+            route_options = ""
+        route_code = f"    fastify.{method}('{url}', {route_options}async (req, res) => {{\n\n"
+        if 'querystring' in schema or 'body' in schema:
+            route_code += self.generate_validation_error_code()
+
+        # Templating parameters if query parameters are present, batches collect the parameters of every row instead
+        # The parameters of an UPDATE query are the updated columns followed by the primary key
+        if query_params_code and not max_batch_size:
+            param_list = sum(self.resolve_update_columns(table_name, query_params), []) if method == 'put' else query_params
+            route_code += (
                 f"        // Destructure query params\n"
                 f"        const {query_params_code};\n"
-                f"        const paramList = [{', '.join(query_params)}];\n"
-                f"{parameter_validation_code}\n"
+                f"        const paramList = [{', '.join(param_list)}];\n\n"
+            )
+
+        if max_batch_size:
+            # Templating the values of the rows and the multi-row SQL query
+            route_code += self.generate_batch_code(name, query_params, max_batch_size)
+            route_code += f"        {query_processing_code}\n"
+        elif pagination:
+            # Templating page parameters and the choice of the keyset SQL query
+            route_code += self.generate_pagination_code(query_params)
+            if read_cache:
+                route_code += self.generate_cache_lookup_code(name, 'pageParamList')
+            route_code += (
+                f"        // Sending the SQL query to the consensus and validate the response\n"
+                f"        const sql_query = cursor === undefined ? {name}FirstPageQuery : {name}NextPageQuery;\n"
+                f"        {query_processing_code}\n"
+            )
+        else:
+            # Templating SQL query
+            if read_cache:
+                route_code += self.generate_cache_lookup_code(name, 'paramList' if query_params else '[]')
+            route_code += (
+                f"        // Sending the SQL query to the consensus and validate the response\n"
+                f"        const sql_query = {name}Query;\n"
+                f"        {query_processing_code}\n"
             )
-        
-        # Templating SQL query
-        endpoint_code += (
-            f"        // Sending the SQL query to the consensus and validate the response\n"
-            f"        const sql_query = `{sql_query_code}`;\n"
-            f"        {query_processing_code}\n"
-        )
-        # Templating success response
-        endpoint_code += (
-            f"        // Return the query result\n"
-            f"        return res.code(200).send(queryResult);\n"
-        )
 
-        # Templating closing brackets for module and endpoint function
-        endpoint_code += (
-            f"    }});\n"
+        if invalidates_cache:
+            # Templating invalidation of the cached reads of the written table
+            route_code += (
+                f"        // Invalidate the cached reads of {table_name}\n"
+                f"        readCache.invalidateTable('{table_name}');\n\n"
+            )
+
+        if pagination and read_cache:
+            # Templating cached success response with the cursor of the next page
+            route_code += (
+                f"        // Return the page and the cursor of the next page, null on the last page\n"
+                f"        const hasNextPage = queryResult.data.length > limit;\n"
+                f"        const rows = hasNextPage ? queryResult.data.slice(0, limit) : queryResult.data;\n"
+                f"        const response = {{\n"
+                f"            success: true,\n"
+                f"            data: rows,\n"
+                f"            next_cursor: hasNextPage ? rows[rows.length - 1].{pagination[0]} : null\n"
+                f"        }};\n"
+                f"        {name}Cache.set(cacheKey, response, generation);\n"
+                f"        return res.code(200).send(response);\n"
+            )
+        elif pagination:
+            # Templating success response with the cursor of the next page
+            route_code += (
+                f"        // Return the page and the cursor of the next page, null on the last page\n"
+                f"        const hasNextPage = queryResult.data.length > limit;\n"
+                f"        const rows = hasNextPage ? queryResult.data.slice(0, limit) : queryResult.data;\n"
+                f"        return res.code(200).send(\n"
+                f"            {{\n"
+                f"              success: true,\n"
+                f"              data: rows,\n"
+                f"              next_cursor: hasNextPage ? rows[rows.length - 1].{pagination[0]} : null\n"
+                f"            }}\n"
+                f"        );\n"
+            )
+        else:
+            # Templating success response
+            route_code += f"        // Return the query result\n"
+            if read_cache:
+                route_code += f"        {name}Cache.set(cacheKey, queryResult, generation);\n"
+            route_code += f"        return res.code(200).send(queryResult);\n"
+
+        # Templating closing bracket of the route
+        route_code += f"    }});\n"
+        return {'name': name, 'requires': requires, 'declarations': declarations, 'route': route_code}
+
+    def generate_module_code(self, module_name, endpoint_codes, module_depth):
+        """
+        Combines the code of one or more endpoints into a module registering all of their routes in one Fastify plugin
+
+        :param module_name: Name of the plugin function exported by the module.
+        :param endpoint_codes: List of the dictionaries returned by generate_endpoint_code.
+        :param module_depth: Number of directories between the module and the RaftNode directory.
+        :return: The generated module in JavaScript notation for Fastify servers.
+        """
+        relative_path = '../' * module_depth or './'
+        required_modules = dict.fromkeys(module for endpoint_code in endpoint_codes for module in endpoint_code['requires'])
+        module_code = ''.join(f"const {module} = require('{relative_path}{RUNTIME_MODULES[module]}');\n" for module in required_modules)
+        module_code += "\n"
+        module_code += ''.join(endpoint_code['declarations'] for endpoint_code in endpoint_codes)
+        module_code += f"const {module_name} = async (fastify) => {{\n"
+        module_code += "\n".join(endpoint_code['route'] for endpoint_code in endpoint_codes)
+        module_code += (
             f"}};\n\n"
+            f"module.exports = {module_name};\n"
         )
-        # Export the endpoint function
-        endpoint_code += f"module.exports = {url.replace('/', '')};\n"
-        return endpoint_code
+        return module_code
 
-    def generate_code(self):
+    def generate_route_modules(self, layout='endpoint'):
+        """
+        Combines the generated endpoints into one module per table or one module for all endpoints
+        Fewer modules and plugins reduce the time the RaftNode needs to resolve and register its routes on startup
+
+        :param layout: 'table' for one module per table, 'bundle' for one module, 'endpoint' for one module per endpoint.
+        :return: List of dictionaries with the file name relative to the REST directory and the generated code,
+                 None for one module per endpoint, which are the generated_code of the endpoints.
+        """
+        if layout not in ROUTE_MODULE_LAYOUTS:
+            raise ValueError(f"Unknown route module layout '{layout}', expected one of {', '.join(ROUTE_MODULE_LAYOUTS)}.")
+        if layout == 'endpoint':
+            return None
+
+        endpoints_by_module = {}
+        for endpoint in self.generated_endpoints:
+            module_name = f"{endpoint['table']}Routes" if layout == 'table' else 'routes'
+            endpoints_by_module.setdefault(module_name, []).append(endpoint)
+
+        route_modules = []
+        for module_name, endpoints in endpoints_by_module.items():
+            # The constants of the endpoints share the module scope, so their names must be unique
+            endpoint_urls = {}
+            for endpoint in endpoints:
+                name = endpoint['code']['name']
+                if name in endpoint_urls:
+                    raise ValueError(f"Endpoints {endpoint_urls[name]} and {endpoint['url']} can not be combined into one module, "
+                                     f"because both are named '{name}'.")
+                endpoint_urls[name] = endpoint['url']
+            file_name = f"{endpoints[0]['table']}.js" if layout == 'table' else 'routes.js'
+            route_modules.append({
+                'file': file_name,
+                'generated_code': self.generate_module_code(module_name, [endpoint['code'] for endpoint in endpoints], 1)
+            })
+        return route_modules
+
+    def generate_cached_endpoint_code(self, table_name, method, url, query_params, returned_columns=(), pagination=None,
+                                      consistency='quorum', max_batch_size=None, read_cache=None, invalidates_cache=False, columns=()):
         """
-        Generates the code for all endpoints based on the provided endpoint data.
+        Generates the code for a single endpoint or takes it from the compilation cache if the endpoint is unchanged
+
+        :param table_name: Name of the table to generate the endpoint for.
+        :param method: HTTP method (GET, POST, PUT, DELETE).
+        :param url: URL path for the endpoint.
+        :param query_params: List of query parameters.
+        :param returned_columns: Columns selected by a GET endpoint, all columns if empty.
+        :param pagination: Tuple of the primary key, the default and the maximum page size of a paginated GET endpoint.
+        :param consistency: Read consistency level of a GET endpoint (quorum, leader or any).
+        :param max_batch_size: Maximum number of rows of a batch POST endpoint, None if the endpoint inserts one row.
+        :param read_cache: Tuple of the TTL in milliseconds and the maximum entries of a cached GET endpoint, None if not cached.
+        :param invalidates_cache: Whether the endpoint writes to a table with cached GET endpoints.
+        :param columns: Column nodes of the table, their datatypes define the schema of the endpoint.
+        :return: Dictionary with the required RaftNode modules, the module level declarations and the route registration.
+        """
+        arguments = (table_name, method, url, query_params, returned_columns, pagination, consistency, max_batch_size,
+                     read_cache, invalidates_cache, columns)
+        if self.cache is None:
+            return self.generate_endpoint_code(*arguments)
+        return self.cache.get_or_generate('endpoint', arguments, lambda: self.generate_endpoint_code(*arguments))
+
+    def generate_endpoints_code_in_parallel(self, endpoint_arguments):
+        """
+        Generates the code for a list of endpoints in worker processes
+        Endpoints unchanged since the last compile run are taken from the compilation cache
+
+        :param endpoint_arguments: List of (table_name, method, url, query_params, returned_columns, pagination, consistency,
+                                   max_batch_size, read_cache, invalidates_cache, columns) tuples
+        :return: List of the generated code dictionaries in the order of endpoint_arguments
+        """
+        def generate_many(missing_arguments):
+            results = generate_in_parallel(self, 'generate_endpoint_code', missing_arguments, self.jobs)
+            if self.profiler is not None:
+                for (table_name, method, url, *options), (code, seconds) in zip(missing_arguments, results):
+                    self.profiler.record_item('endpoint', f"{table_name}{url}", seconds)
+            return [code for code, seconds in results]
+
+        if self.cache is None:
+            return generate_many(endpoint_arguments)
+        return self.cache.get_or_generate_many('endpoint', endpoint_arguments, generate_many)
+
+    def resolve_pagination(self, table_name, endpoint):
+        """
+        Resolves the pagination of an endpoint and checks that it can be paginated
+
+        :param table_name: Name of the table of the endpoint.
+        :param endpoint: The Endpoint node.
+        :return: Tuple of the primary key, the default and the maximum page size, None if the endpoint is not paginated.
+        """
+        if endpoint.page_size is None:
+            return None
+        primary_key = self.primary_keys.get(table_name, ())
+        if not primary_key:
+            raise ValueError(f"Endpoint {endpoint.url} can not be paginated, because table '{table_name}' has no primary key.")
+        if len(primary_key) > 1:
+            raise ValueError(f"Endpoint {endpoint.url} can not be paginated, because the primary key of table '{table_name}' "
+                             f"consists of several columns, the cursor has to be a single column.")
+        max_page_size = endpoint.max_page_size if endpoint.max_page_size is not None else DEFAULT_MAX_PAGE_SIZE
+        if not 1 <= endpoint.page_size <= max_page_size:
+            raise ValueError(f"Page size {endpoint.page_size} of endpoint {endpoint.url} must be between 1 and the maximum page size {max_page_size}.")
+        for param in endpoint.query_params:
+            if param in PAGINATION_PARAMETERS:
+                raise ValueError(f"Query parameter '{param}' of endpoint {endpoint.url} is reserved for pagination.")
+        return primary_key[0], endpoint.page_size, max_page_size
+
+    def resolve_update_columns(self, table_name, query_params):
+        """
+        Resolves the columns set by the UPDATE query of a PUT endpoint and the primary key columns identifying the row
+
+        :param table_name: Name of the table of the endpoint.
+        :param query_params: List of the parameters of the endpoint, containing the primary key columns.
+        :return: Tuple of the list of the updated columns and the list of the primary key columns.
+        """
+        primary_key = list(self.primary_keys.get(table_name, ()))
+        updated_columns = [param for param in query_params if param not in primary_key]
+        return updated_columns, primary_key
+
+    def resolve_update_params(self, table_name, endpoint, primary_key):
+        """
+        Resolves the parameters of a PUT endpoint and checks that they identify the updated row and set a column
+
+        :param table_name: Name of the table of the endpoint.
+        :param endpoint: The Endpoint node.
+        :param primary_key: Tuple of the primary key columns of the table.
+        :return: List of the parameters of the endpoint.
+        """
+        if not primary_key:
+            raise ValueError(f"Endpoint {endpoint.url} can not update rows, because table '{table_name}' has no primary key.")
+        missing_columns = [column for column in primary_key if column not in endpoint.query_params]
+        if missing_columns:
+            raise ValueError(f"Endpoint {endpoint.url} needs the primary key column(s) {', '.join(missing_columns)} "
+                             f"of table '{table_name}' to identify the updated row.")
+        if all(param in primary_key for param in endpoint.query_params):
+            raise ValueError(f"Endpoint {endpoint.url} updates no column, it only has the primary key of table '{table_name}'.")
+        return list(dict.fromkeys(endpoint.query_params))
+
+    def resolve_max_batch_size(self, endpoint, query_params):
+        """
+        Resolves the maximum batch size of a batch POST endpoint and checks that a full batch fits into one statement
+
+        :param endpoint: The Endpoint node.
+        :param query_params: List of the inserted columns.
+        :return: The maximum number of rows of a batch, None if the endpoint inserts one row.
+        """
+        if not endpoint.batch:
+            return None
+        if not query_params:
+            raise ValueError(f"Batch endpoint {endpoint.url} needs at least one column to insert.")
+        max_batch_size = endpoint.max_batch_size if endpoint.max_batch_size is not None else DEFAULT_MAX_BATCH_SIZE
+        if max_batch_size < 1 or max_batch_size * len(query_params) > MAX_STATEMENT_PLACEHOLDERS:
+            raise ValueError(f"Maximum batch size {max_batch_size} of endpoint {endpoint.url} must be between 1 and "
+                             f"{MAX_STATEMENT_PLACEHOLDERS // len(query_params)} for {len(query_params)} columns.")
+        return max_batch_size
+
+    def resolve_read_cache(self, endpoint):
+        """
+        Resolves the read cache of a GET endpoint and checks its TTL and size
+
+        :param endpoint: The Endpoint node.
+        :return: Tuple of the TTL in milliseconds and the maximum number of entries, None if the endpoint is not cached.
+        """
+        if endpoint.cache_ttl is None:
+            return None
+        max_entries = endpoint.cache_size if endpoint.cache_size is not None else DEFAULT_MAX_CACHE_ENTRIES
+        if endpoint.cache_ttl < 1:
+            raise ValueError(f"Cache TTL {endpoint.cache_ttl} of endpoint {endpoint.url} must be at least 1 millisecond.")
+        if max_entries < 1:
+            raise ValueError(f"Maximum cache size {max_entries} of endpoint {endpoint.url} must be at least 1.")
+        return endpoint.cache_ttl, max_entries
+
+    def resolve_returned_columns(self, table_name, endpoint, pagination):
+        """
+        Resolves the columns returned by an endpoint and checks that they exist in its table
+        The primary key is added to the columns of a paginated endpoint, because it is the cursor of the next page
+
+        :param table_name: Name of the table of the endpoint.
+        :param endpoint: The Endpoint node.
+        :param pagination: The resolved pagination of the endpoint, None if it is not paginated.
+        :return: Tuple of the returned columns, empty for all columns.
+        """
+        returned_columns = tuple(dict.fromkeys(endpoint.columns))
+        if not returned_columns:
+            return returned_columns
+        if self.table_columns is not None:
+            for column in returned_columns:
+                if column not in self.table_columns.get(table_name, ()):
+                    raise ValueError(f"Endpoint {endpoint.url} returns column '{column}', which is not a column of table '{table_name}'.")
+        if pagination and pagination[0] not in returned_columns:
+            returned_columns += (pagination[0],)
+        return returned_columns
+
+    def resolve_endpoints(self):
+        """
+        Resolves the options of all endpoints and checks them.
         Filters out parameters that are both primary keys and auto_id columns for each table.
-        
-        :return: List of dictionaries containing endpoint data, including table name, URL, method, query parameters, and generated code.
+
+        :return: List of argument tuples of generate_endpoint_code, one per endpoint.
         """
-        for table in self.endpoint_data['tables']:
-            table_name = table['table']
-            primary_key = self.primary_keys.get(table_name, None)  # Get the primary key for the current table
+        # Tables with cached GET endpoints, whose writing endpoints invalidate the cached reads
+        cached_tables = {table.table for table in self.endpoint_data.tables
+                         for endpoint in table.endpoints if endpoint.cache_ttl is not None}
+
+        endpoint_arguments = []
+        for table in self.endpoint_data.tables:
+            table_name = table.table
+            primary_key = self.primary_keys.get(table_name, ())  # Get the primary key columns for the current table
             
-            for endpoint in table['endpoints']:
-                method = endpoint['method']
-                url = endpoint['url']
-                query_params = endpoint['query_params']
+            for endpoint in table.endpoints:
+                method = endpoint.method
+                url = endpoint.url
+                query_params = endpoint.query_params
                
                 # Filter params: exclude those that are both auto_id and the primary key
                 filtered_params = [param for param in query_params 
-                                if not (param == primary_key and param in self.auto_id_columns and method == 'post')]
-
-                # Generate the code for each endpoint
-                code = self.generate_endpoint_code(table_name, method, url, filtered_params)
-                
-                # Apply the generated code to the endpoint_object list
-                endpoint_object = {
-                    'table': table_name,
-                    'method': method,
-                    'url': url,
-                    'query_params': filtered_params,
-                    'generated_code': code
-                }
-                self.generated_endpoints.append(endpoint_object)
+                                if not (param in primary_key and param in self.auto_id_columns and method == 'post')]
+                if method == 'put':
+                    filtered_params = self.resolve_update_params(table_name, endpoint, primary_key)
+                pagination = self.resolve_pagination(table_name, endpoint)
+                returned_columns = self.resolve_returned_columns(table_name, endpoint, pagination)
+                if endpoint.consistency not in CONSISTENCY_READ_FUNCTIONS:
+                    raise ValueError(f"Unknown consistency level '{endpoint.consistency}' of endpoint {url}, "
+                                     f"expected one of {', '.join(CONSISTENCY_READ_FUNCTIONS)}.")
+                max_batch_size = self.resolve_max_batch_size(endpoint, filtered_params)
+                read_cache = self.resolve_read_cache(endpoint)
+                invalidates_cache = method in WRITE_METHODS and table_name in cached_tables
+                columns = tuple(self.table_columns.get(table_name, {}).values()) if self.table_columns is not None else ()
+                endpoint_arguments.append((table_name, method, url, filtered_params, returned_columns, pagination,
+                                           endpoint.consistency, max_batch_size, read_cache, invalidates_cache, columns))
+        return endpoint_arguments
+
+    def generate_code(self):
+        """
+        Generates the code for all endpoints based on the provided RestBlock node.
+
+        :return: List of dictionaries containing endpoint data, including table name, URL, method, query parameters, and generated code.
+        """
+        endpoint_arguments = self.resolve_endpoints()
+
+        # Generate the code for each endpoint
+        if self.jobs > 1:
+            generated_code = self.generate_endpoints_code_in_parallel(endpoint_arguments)
+        else:
+            generated_code = []
+            for arguments in endpoint_arguments:
+                if self.profiler is None:
+                    generated_code.append(self.generate_cached_endpoint_code(*arguments))
+                else:
+                    with self.profiler.item('endpoint', f"{arguments[0]}{arguments[2]}"):
+                        generated_code.append(self.generate_cached_endpoint_code(*arguments))
+
+        # Apply the generated code to the endpoint_object list
+        for (table_name, method, url, filtered_params, *options), code in zip(endpoint_arguments, generated_code):
+            endpoint_object = {
+                'table': table_name,
+                'method': method,
+                'url': url,
+                'query_params': filtered_params,
+                'code': code,
+                'generated_code': self.generate_module_code(code['name'], [code], 2)
+            }
+            self.generated_endpoints.append(endpoint_object)
 
-        return self.generated_endpoints
\ No newline at end of file
+        return self.generated_endpoints
@@ -0,0 +1,52 @@
+import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Generator instance of a worker process, set once per process by _initialize_worker
+_worker_generator = None
+
+def _initialize_worker(generator):
+    global _worker_generator
+    _worker_generator = generator
+
+def _run_job(job):
+    """
+    Run one generator method call in a worker process
+    :param job: Tuple of the method name and its arguments
+    :return: Tuple of the result and the wall time of the call in seconds
+    """
+    method_name, arguments = job
+    start = time.perf_counter()
+    result = getattr(_worker_generator, method_name)(*arguments)
+    return result, time.perf_counter() - start
+
+def generate_in_parallel(generator, method_name, argument_list, jobs):
+    """
+    Call a method of a code generator for every argument tuple in a process pool.
+    The results keep the order of argument_list, so the generated code is identical to a serial run.
+
+    The worker processes receive a copy of the generator without its cache and profiler,
+    which are neither shared between processes nor cheap to transfer.
+
+    :param generator: The code generator, e.g. a SQLCodeGenerator
+    :param method_name: The name of the generator method creating the code of a single item
+    :param argument_list: List of argument tuples, one per item
+    :param jobs: The number of worker processes
+    :return: List of (result, seconds) tuples in the order of argument_list
+    """
+    if not argument_list:
+        return []
+
+    worker_generator = copy.copy(generator)
+    worker_generator.cache = None
+    worker_generator.profiler = None
+    worker_generator.jobs = 1
+
+    job_list = [(method_name, arguments) for arguments in argument_list]
+    if jobs <= 1 or len(job_list) == 1:
+        _initialize_worker(worker_generator)
+        return [_run_job(job) for job in job_list]
+
+    chunksize = max(1, len(job_list) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialize_worker, initargs=(worker_generator,)) as executor:
+        return list(executor.map(_run_job, job_list, chunksize=chunksize))
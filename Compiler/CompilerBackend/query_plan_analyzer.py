@@ -0,0 +1,206 @@
+import json
+import re
+import sqlite3
+from CompilerBackend.sql_code_generator import SQLCodeGenerator
+
+QUERY_PLAN_ANALYZER_VERSION = '1.0'
+
+# Version of the format of the query plan report
+QUERY_PLAN_REPORT_FORMAT = 1
+
+# Checks of the analysis, --fail-on-query-plan fails the build on findings of the selected checks
+# full-scan: a filtered statement reads the whole table, no index serves its filter
+# missing-fk-index: a foreign key lookup reads the whole referencing or referenced table
+# unbounded-result: a GET endpoint returns all matching rows, neither paginated nor filtered by the primary key
+# filesort: a paginated GET endpoint sorts all matching rows before returning a page
+# invalid-statement: a statement can not be planned, e.g. it references an unknown column
+QUERY_PLAN_CHECKS = ('full-scan', 'missing-fk-index', 'unbounded-result', 'filesort', 'invalid-statement')
+
+# SQLite types of the MariaDB types of the SQLCodeGenerator, a single INTEGER primary key becomes the rowid
+SQLITE_DATATYPES = {
+    'INT AUTO_INCREMENT': 'INTEGER',
+    'INT': 'INTEGER',
+    'FLOAT': 'REAL',
+    'BOOLEAN': 'INTEGER',
+    'DATE': 'TEXT',
+    'TIMESTAMP': 'TEXT',
+}
+
+class QueryPlanAnalyzer:
+    """
+    Checks the SQL of the generated endpoints with the query planner of an in-memory SQLite database.
+
+    The tables are created with the columns, keys, foreign keys and indexes of the MariaDB schema, translated to SQLite.
+    Tables with a primary key other than a single integer are created WITHOUT ROWID, so like InnoDB tables they are
+    clustered by their primary key. Partitions are not created, SQLite has none, so partition pruning is not analyzed.
+    The plan of every statement is taken from EXPLAIN QUERY PLAN, which describes a table without statistics,
+    so a finding shows that no index can serve a statement, not how slow it is.
+
+    - Parameters:
+      schema: Database - The database schema with the derived indexes.
+      nodejs_generator: NodeJSCodeGenerator - The generator of the endpoints, resolves their options and SQL.
+    """
+    def __init__(self, schema, nodejs_generator):
+        self.schema = schema
+        self.nodejs_generator = nodejs_generator
+        # Generates the type mapping and the names of the foreign keys and indexes like in the schema script
+        self.sql_generator = SQLCodeGenerator(schema)
+        self.statements = []  # List of dictionaries of the analyzed statements with their plans
+        self.findings = []  # List of (check, subject, message) tuples
+
+    def analyze(self):
+        """
+        Load the schema into SQLite and analyze the statements of all endpoints and foreign keys
+        :return: The JSON document of the query plan report
+        """
+        connection = sqlite3.connect(':memory:')
+        try:
+            ddl = self._create_tables(connection)
+            self._analyze_endpoints(connection)
+            self._analyze_foreign_keys(connection)
+        finally:
+            connection.close()
+
+        report = {
+            'format': QUERY_PLAN_REPORT_FORMAT,
+            'database': self.schema.name,
+            'sqlite_version': sqlite3.sqlite_version,
+            'ddl': ddl,
+            'statements': self.statements,
+            'findings': [{'check': check, 'subject': subject, 'message': message} for check, subject, message in self.findings],
+        }
+        return json.dumps(report, indent=2) + "\n"
+
+    def _create_tables(self, connection):
+        """
+        Create the tables and indexes of the schema in SQLite
+        A table which SQLite rejects is reported, the statements on it are reported as invalid too
+        :param connection: The SQLite connection
+        :return: List of the executed SQLite statements
+        """
+        ddl = []
+        for table in self.schema.tables:
+            if table.type != 'table':
+                continue
+            statements = [self._generate_create_table(table)]
+            for index in table.indexes:
+                statements.append(f"CREATE INDEX {self.sql_generator._generate_index_name(table.name, index.columns)} "
+                                  f"ON {table.name} ({', '.join(index.columns)});")
+            for statement in statements:
+                try:
+                    connection.execute(statement)
+                except sqlite3.Error as e:
+                    self.findings.append(('invalid-statement', f"TABLE {table.name}",
+                                          f"Table {table.name} can not be created in SQLite: {e}, `{' '.join(statement.split())}`"))
+                    break
+                ddl.append(statement)
+        return ddl
+
+    def _generate_create_table(self, table):
+        """
+        Generate the SQLite statement creating a table
+        :param table: Table node
+        :return: The CREATE TABLE statement
+        """
+        column_types = {column.name: self._translate_datatype(self.sql_generator._map_datatype(column.datatype))
+                        for column in table.columns}
+        primary_keys = [column.name for column in table.columns if column.primary_key]
+        definitions = [f"  {column.name} {column_types[column.name]}{' NOT NULL' if column.not_null else ''}"
+                       for column in table.columns]
+        if primary_keys:
+            definitions.append(f"  PRIMARY KEY ({', '.join(primary_keys)})")
+        for fk in table.foreign_keys:
+            definitions.append(f"  {self.sql_generator._generate_foreign_key(table.name, fk)}")
+        sql = f"CREATE TABLE {table.name} (\n" + ",\n".join(definitions) + "\n)"
+        # A single integer primary key is the rowid, other primary keys cluster the table like in InnoDB
+        if primary_keys and not (len(primary_keys) == 1 and column_types[primary_keys[0]] == 'INTEGER'):
+            sql += " WITHOUT ROWID"
+        return sql + ";"
+
+    def _translate_datatype(self, datatype):
+        """
+        Translate a MariaDB datatype to SQLite
+        :param datatype: MariaDB datatype string
+        :return: SQLite datatype string
+        """
+        if re.match(r'VARCHAR\(\d+\)$', datatype):
+            return 'TEXT'
+        if datatype not in SQLITE_DATATYPES:
+            raise ValueError(f"Unsupported datatype: {datatype}")
+        return SQLITE_DATATYPES[datatype]
+
+    def _explain(self, connection, subject, table_name, sql):
+        """
+        Get the query plan of a statement and record it
+        :param connection: The SQLite connection
+        :param subject: The endpoint or foreign key executing the statement
+        :param table_name: Name of the table of the statement
+        :param sql: The SQL statement with ? placeholders
+        :return: List of the steps of the plan, None if the statement can not be planned
+        """
+        try:
+            # The placeholders are bound to NULL, the plan does not depend on their values
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count('?')).fetchall()
+        except sqlite3.Error as e:
+            self.findings.append(('invalid-statement', subject, f"{subject} can not be planned: {e}, `{sql}`"))
+            self.statements.append({'subject': subject, 'table': table_name, 'sql': sql, 'plan': None})
+            return None
+        plan = [row[3] for row in rows]
+        self.statements.append({'subject': subject, 'table': table_name, 'sql': sql, 'plan': plan})
+        return plan
+
+    def _analyze_endpoints(self, connection):
+        """
+        Analyze the SQL statements of all endpoints
+        :param connection: The SQLite connection
+        """
+        primary_keys = {table.name: {column.name for column in table.columns if column.primary_key}
+                        for table in self.schema.tables if table.type == 'table'}
+        for table_name, method, url, query_params, returned_columns, pagination, *options \
+                in self.nodejs_generator.resolve_endpoints():
+            subject = f"{method.upper()} {url}"
+            if pagination:
+                queries = self.nodejs_generator.generate_paginated_sql_queries(table_name, query_params, returned_columns, pagination)
+            else:
+                # A batch insert has the plan of a single row insert
+                queries = (self.nodejs_generator.generate_sql_query(table_name, method, query_params, returned_columns),)
+
+            for sql in queries:
+                plan = self._explain(connection, subject, table_name, sql)
+                if plan is None:
+                    continue
+                for step in plan:
+                    if ' WHERE ' in sql and re.match(r'SCAN (TABLE )?\w+', step):
+                        self.findings.append(('full-scan', subject, f"{subject} reads all rows of {table_name}, "
+                                                                    f"no index serves its filter: {step}, `{sql}`"))
+                    elif step.startswith('USE TEMP B-TREE'):
+                        self.findings.append(('filesort', subject, f"{subject} sorts all matching rows of {table_name} "
+                                                                   f"before returning a page: {step}, `{sql}`"))
+
+            table_primary_keys = primary_keys.get(table_name, set())
+            if method == 'get' and not pagination and not (table_primary_keys and table_primary_keys <= set(query_params)):
+                self.findings.append(('unbounded-result', subject, f"{subject} returns all matching rows of {table_name}, "
+                                                                   f"paginate it with PAGE or filter it by the primary key"))
+
+    def _analyze_foreign_keys(self, connection):
+        """
+        Analyze the lookups of the foreign keys
+        Inserts look up the referenced row, deletes and updates of the referenced table look up the referencing rows.
+        :param connection: The SQLite connection
+        """
+        for table in self.schema.tables:
+            if table.type != 'table':
+                continue
+            for fk in table.foreign_keys:
+                subject = f"FK {table.name}.{fk.column} -> {fk.table}.{fk.column}"
+                lookups = (
+                    (table.name, f"Foreign key {table.name}.{fk.column} has no index, "
+                                 f"deleting or updating a row of {fk.table} reads all rows of {table.name}"),
+                    (fk.table, f"Referenced column {fk.table}.{fk.column} of table {table.name} has no index, "
+                               f"MariaDB rejects foreign keys without an index on the referenced column"),
+                )
+                for table_name, message in lookups:
+                    sql = f"SELECT 1 FROM {table_name} WHERE {fk.column} = ?"
+                    plan = self._explain(connection, subject, table_name, sql)
+                    if plan is not None and any(re.match(r'SCAN (TABLE )?\w+', step) for step in plan):
+                        self.findings.append(('missing-fk-index', subject, message))
@@ -0,0 +1,242 @@
+import json
+from dataclasses import asdict
+from CompilerFrontend.Parser.ast_nodes import Database, Table, Column, ForeignKey, Index, Partition
+from CompilerBackend.sql_code_generator import SQLCodeGenerator
+
+SCHEMA_MIGRATOR_VERSION = '1.0'
+
+# Version of the format of the schema snapshot file
+SCHEMA_SNAPSHOT_VERSION = 1
+
+def schema_to_snapshot(schema, version, migrations):
+    """
+    Create the snapshot of a compiled database schema
+    :param schema: Database node with the derived indexes
+    :param version: Version of the last migration contained in the schema
+    :param migrations: List of {'version', 'statements'} dictionaries of all migrations
+    :return: Dictionary which can be written as JSON
+    """
+    return {
+        'format': SCHEMA_SNAPSHOT_VERSION,
+        'database': schema.name,
+        'version': version,
+        'tables': [asdict(table) for table in schema.tables],
+        'migrations': migrations,
+    }
+
+def snapshot_to_schema(snapshot):
+    """
+    Restore the database schema of a snapshot
+    :param snapshot: Dictionary read from the snapshot file
+    :return: Database node with the tables of the snapshot
+    """
+    if snapshot.get('format') != SCHEMA_SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported schema snapshot format {snapshot.get('format')}.")
+    tables = []
+    for table in snapshot['tables']:
+        tables.append(Table(
+            table['name'],
+            tuple(Column(**column) for column in table['columns']),
+            tuple(ForeignKey(**fk) for fk in table['foreign_keys']),
+            tuple(Index(tuple(index['columns'])) for index in table['indexes']),
+            Partition(**table['partition']) if table['partition'] else None,
+        ))
+    return Database(snapshot['database'], tuple(tables))
+
+def generate_migration_script(database_name, version, statements):
+    """
+    Generate the SQL script of a migration, which can also be applied manually
+    :param database_name: Name of the migrated database
+    :param version: Version of the migration
+    :param statements: The ALTER, CREATE and DROP statements of the migration
+    :return: The SQL script
+    """
+    sql_statements = [f"-- Migration {version} of database {database_name}", f"USE {database_name};"]
+    sql_statements.extend(statements)
+    sql_statements.append(f"INSERT INTO Consensus_Node_Migration (version) VALUES ({version}) "
+                          f"ON DUPLICATE KEY UPDATE applied_statements = NULL;")
+    return "\n\n".join(sql_statements) + "\n"
+
+def generate_migrations_module(migrations):
+    """
+    Generate the Node.js module listing the migrations for the RaftNode
+    :param migrations: List of {'version', 'statements'} dictionaries of all migrations
+    :return: The JavaScript code of the module
+    """
+    code = "// Schema migrations applied in order by the leader through the consensus log\n"
+    code += "module.exports = [\n"
+    for migration in migrations:
+        code += "    {\n"
+        code += f"        version: {migration['version']},\n"
+        code += "        statements: [\n"
+        for statement in migration['statements']:
+            code += f"            {json.dumps(statement)},\n"
+        code += "        ]\n"
+        code += "    },\n"
+    code += "];\n"
+    return code
+
+class SchemaMigrator:
+    """
+    Compares the database schema of the last compile run with the current one and generates the statements
+    migrating a database of the previous schema, so deployed data is kept instead of being rebuilt.
+
+    Tables and columns are matched by name, a renamed column is dropped and added again.
+    The statements are ordered by their dependencies: foreign keys and indexes are dropped before the tables
+    and columns they depend on, and added after all tables and columns exist. The changes of a table are
+    combined into one ALTER TABLE statement, so MariaDB rebuilds each table at most once per phase.
+
+    - Parameters:
+      previous_schema: Database - The schema of the snapshot of the last compile run.
+      schema: Database - The current schema with the derived indexes.
+    """
+    def __init__(self, previous_schema, schema):
+        self.previous_schema = previous_schema
+        self.schema = schema
+        # Generates the column definitions, constraints and CREATE TABLE statements like in the schema script
+        self.sql_generator = SQLCodeGenerator(schema)
+        self.destructive_statements = []  # Statements dropping tables or columns and their data
+
+    def generate(self):
+        """
+        Generate the migration from the previous to the current schema
+        :return: List of SQL statements in the order they must be applied, empty if the schema is unchanged
+        """
+        previous_tables = {table.name: table for table in self.previous_schema.tables}
+        tables = {table.name: table for table in self.schema.tables}
+        kept_tables = [(previous_tables[table.name], table) for table in self.schema.tables if table.name in previous_tables]
+
+        # Columns whose definition changed and tables whose primary key changed, foreign keys on them are re-created
+        changed_columns = {table.name: self._changed_columns(previous_table, table) for previous_table, table in kept_tables}
+        changed_primary_keys = {table.name for previous_table, table in kept_tables
+                                if self._primary_keys(previous_table) != self._primary_keys(table)}
+
+        def unchanged_foreign_keys(previous_table, table):
+            return [fk for fk in table.foreign_keys if fk in previous_table.foreign_keys
+                    and fk.column not in changed_columns[table.name]
+                    and fk.column not in changed_columns.get(fk.table, ())
+                    and fk.table not in changed_primary_keys]
+
+        statements = []
+
+        # Drop the foreign keys which are removed or depend on changed columns
+        for previous_table, table in kept_tables:
+            kept_foreign_keys = unchanged_foreign_keys(previous_table, table)
+            statements.extend(self._alter_table(table.name, [
+                f"DROP FOREIGN KEY {self.sql_generator._generate_foreign_key_name(table.name, fk)}"
+                for fk in previous_table.foreign_keys if fk not in kept_foreign_keys]))
+
+        # Drop the removed indexes
+        for previous_table, table in kept_tables:
+            index_columns = [index.columns for index in table.indexes]
+            statements.extend(self._alter_table(table.name, [
+                f"DROP INDEX {self.sql_generator._generate_index_name(table.name, index.columns)}"
+                for index in previous_table.indexes if index.columns not in index_columns]))
+
+        # Drop the removed tables, referencing tables before the tables they reference
+        for previous_table in reversed(self.previous_schema.tables):
+            if previous_table.name not in tables:
+                statements.append(self._destructive(f"DROP TABLE {previous_table.name};"))
+
+        # Change the columns, the primary key and the partitioning of the kept tables
+        for previous_table, table in kept_tables:
+            if previous_table.partition is not None and table.partition is None:
+                statements.append(f"ALTER TABLE {table.name} REMOVE PARTITIONING;")
+            drops_columns = not {column.name for column in previous_table.columns} <= {column.name for column in table.columns}
+            statements.extend(self._alter_table(table.name, self._column_changes(previous_table, table, changed_columns[table.name]),
+                                                destructive=drops_columns))
+            if table.partition is not None and table.partition != previous_table.partition:
+                resolved_table = self.sql_generator._resolve_partition_start(table)
+                statements.append(f"ALTER TABLE {table.name}\n{self.sql_generator._generate_partition(resolved_table)};")
+
+        # Create the new tables in the order of the schema, so referenced tables exist first
+        for table in self.schema.tables:
+            if table.name not in previous_tables:
+                statements.append(self.sql_generator._generate_create_table(self.sql_generator._resolve_partition_start(table)))
+
+        # Add the new indexes
+        for previous_table, table in kept_tables:
+            previous_index_columns = [index.columns for index in previous_table.indexes]
+            statements.extend(self._alter_table(table.name, [
+                f"ADD INDEX {self.sql_generator._generate_index_name(table.name, index.columns)} ({', '.join(index.columns)})"
+                for index in table.indexes if index.columns not in previous_index_columns]))
+
+        # Add the new and the dropped foreign keys, all referenced tables and columns exist now
+        for previous_table, table in kept_tables:
+            kept_foreign_keys = unchanged_foreign_keys(previous_table, table)
+            statements.extend(self._alter_table(table.name, [
+                f"ADD {self.sql_generator._generate_foreign_key(table.name, fk)}"
+                for fk in table.foreign_keys if fk not in kept_foreign_keys]))
+
+        return statements
+
+    def _primary_keys(self, table):
+        """
+        Get the primary key columns of a table
+        :param table: Table node
+        :return: Tuple of the primary key column names in their order
+        """
+        return tuple(column.name for column in table.columns if column.primary_key)
+
+    def _changed_columns(self, previous_table, table):
+        """
+        Get the columns of a kept table whose datatype or NOT NULL constraint changed
+        :param previous_table: Table node of the previous schema
+        :param table: Table node of the current schema
+        :return: Set of the changed column names
+        """
+        previous_columns = {column.name: column for column in previous_table.columns}
+        return {column.name for column in table.columns if column.name in previous_columns
+                and (column.datatype, column.not_null) != (previous_columns[column.name].datatype, previous_columns[column.name].not_null)}
+
+    def _column_changes(self, previous_table, table, changed_columns):
+        """
+        Generate the clauses changing the columns and the primary key of a table
+        Added columns are placed after their predecessor, so migrated tables have the column order of new ones
+        :param previous_table: Table node of the previous schema
+        :param table: Table node of the current schema
+        :param changed_columns: Names of the columns whose definition changed
+        :return: List of ALTER TABLE clauses
+        """
+        previous_column_names = [column.name for column in previous_table.columns]
+        column_names = [column.name for column in table.columns]
+        primary_key_changed = self._primary_keys(previous_table) != self._primary_keys(table)
+
+        clauses = []
+        if primary_key_changed and self._primary_keys(previous_table):
+            clauses.append("DROP PRIMARY KEY")
+        for position, column in enumerate(table.columns):
+            definition = ' '.join(self.sql_generator._generate_column_definition(column, inline_primary_key=False).split())
+            if column.name not in previous_column_names:
+                placement = f"AFTER {column_names[position - 1]}" if position > 0 else "FIRST"
+                clauses.append(f"ADD COLUMN {definition} {placement}")
+            elif column.name in changed_columns:
+                clauses.append(f"MODIFY COLUMN {definition}")
+        for column_name in previous_column_names:
+            if column_name not in column_names:
+                clauses.append(f"DROP COLUMN {column_name}")
+        if primary_key_changed and self._primary_keys(table):
+            clauses.append(f"ADD PRIMARY KEY ({', '.join(self._primary_keys(table))})")
+        return clauses
+
+    def _alter_table(self, table_name, clauses, destructive=False):
+        """
+        Combine the clauses of a table into one ALTER TABLE statement
+        :param table_name: Name of the altered table
+        :param clauses: List of ALTER TABLE clauses
+        :param destructive: Whether the statement drops data
+        :return: List with the statement, empty if there are no clauses
+        """
+        if not clauses:
+            return []
+        statement = f"ALTER TABLE {table_name}\n  " + ",\n  ".join(clauses) + ";"
+        return [self._destructive(statement) if destructive else statement]
+
+    def _destructive(self, statement):
+        """
+        Remember a statement dropping data, so the compiler can warn about it
+        :param statement: The SQL statement
+        :return: The statement
+        """
+        self.destructive_statements.append(statement)
+        return statement
@@ -0,0 +1,378 @@
+import os
+import random
+import re
+import string
+import time
+from datetime import date
+
+SEED_DATA_GENERATOR_VERSION = '1.0'
+
+# Formats of the seed data: tab separated files loaded by LOAD DATA LOCAL INFILE or scripts of multi-row INSERTs
+SEED_FORMATS = ('load-data', 'insert')
+
+# Rows of a single INSERT statement of the insert format
+INSERT_CHUNK_ROWS = 1000
+
+# Share of NULL values of nullable columns which are neither keys nor foreign keys
+NULL_RATIO = 0.1
+
+# Maximum length of the random strings, longer string columns get strings of up to this length
+MAX_RANDOM_STRING_LENGTH = 32
+
+# Range of the random values of integer, float, date and timestamp columns
+MAX_RANDOM_INTEGER = 1000000
+MAX_RANDOM_FLOAT = 100000.0
+FIRST_DATE = date(2000, 1, 1)
+LAST_DATE = date(2029, 12, 31)
+# TIMESTAMP values of MariaDB end in January 2038
+FIRST_TIMESTAMP = 946684800  # 2000-01-01 00:00:00 UTC
+LAST_TIMESTAMP = 1893455999  # 2029-12-31 23:59:59 UTC
+MAX_TIMESTAMP = 2147483647  # 2038-01-19 03:14:07 UTC
+
+# Float columns are single precision, larger integers are not exact and can not be unique keys
+MAX_FLOAT_KEY = 2 ** 24
+
+STRING_CHARACTERS = string.ascii_letters + string.digits
+
+# Random strings are slices of a random text of this length per column, joining characters per value is too slow
+STRING_POOL_LENGTH = 65536
+
+class SeedDataGenerator:
+    """
+    Generates synthetic rows for every table of the database schema and the script loading them into a replica.
+
+    The rows are generated from a seeded random generator per table, so every run and every replica gets the same data.
+    Each table gets a row key, a primary key column, whose value is derived from the row number: 1, 2, ... for
+    integers, the row number as text for strings and consecutive dates and timestamps. Columns referenced by foreign keys
+    are derived from the row number as well, so foreign key columns reference an existing row of the referenced table
+    without reading it. The other columns get random values of their datatype, nullable columns are NULL for NULL_RATIO
+    of the rows.
+
+    - Parameters:
+      schema: Database - The database schema.
+      row_counts: dict - Number of rows of single tables by table name.
+      default_rows: int - Number of rows of the tables not contained in row_counts.
+      data_format: str - One of SEED_FORMATS.
+      seed: int - Seed of the random generators.
+    """
+    def __init__(self, schema, row_counts=None, default_rows=0, data_format='load-data', seed=0):
+        if data_format not in SEED_FORMATS:
+            raise ValueError(f"Unknown seed format '{data_format}', expected one of {', '.join(SEED_FORMATS)}.")
+        self.schema = schema
+        self.row_counts = dict(row_counts or {})
+        self.default_rows = default_rows
+        self.data_format = data_format
+        self.seed = seed
+        self.tables = {table.name: table for table in schema.tables if table.type == 'table'}
+        for table_name in self.row_counts:
+            if table_name not in self.tables:
+                raise ValueError(f"Seed rows are given for unknown table '{table_name}'.")
+        # Columns referenced by foreign keys of other tables, their values must be reproducible from the row number
+        self.referenced_columns = {(fk.table, fk.column) for table in self.tables.values() for fk in table.foreign_keys}
+
+    def validate(self):
+        """
+        Check that the seed data of all tables can be generated
+        Raises a ValueError if a key column can not hold the number of rows or a foreign key can not reference a row
+        """
+        for table in self.tables.values():
+            if self.get_rows(table.name) < 0:
+                raise ValueError(f"Number of seed rows of table '{table.name}' must not be negative.")
+            for column in table.columns:
+                self._value_function(table, column, random.Random(self.seed))
+
+    def get_rows(self, table_name):
+        """
+        Get the number of rows generated for a table
+        :param table_name: Name of the table
+        :return: The number of rows
+        """
+        return self.row_counts.get(table_name, self.default_rows)
+
+    def get_data_file_name(self, table_name):
+        """
+        Get the name of the data file of a table
+        :param table_name: Name of the table
+        :return: The file name in the seed directory
+        """
+        return f"{table_name}.tsv" if self.data_format == 'load-data' else f"{table_name}.sql"
+
+    def generate_rows(self, table):
+        """
+        Generate the rows of a table lazily, so millions of rows never have to be held in memory
+        :param table: Table node
+        :return: Iterator of lists with one value per column, None for NULL
+        """
+        value_functions = [self._value_function(table, column, random.Random(f"{self.seed}:{table.name}:{column.name}"))
+                           for column in table.columns]
+        for row in range(1, self.get_rows(table.name) + 1):
+            yield [value_function(row) for value_function in value_functions]
+
+    def write_data_file(self, table_name, seed_dir):
+        """
+        Write the seed data of a table to its data file
+        :param table_name: Name of the table
+        :param seed_dir: The directory of the seed data
+        :return: The number of written rows
+        """
+        table = self.tables[table_name]
+        file_path = os.path.join(seed_dir, self.get_data_file_name(table_name))
+        with open(file_path, 'w', encoding='utf-8', newline='\n') as outputFile:
+            if self.data_format == 'load-data':
+                self._write_tab_separated(table, outputFile)
+            else:
+                self._write_inserts(table, outputFile)
+        return self.get_rows(table_name)
+
+    def generate_load_script(self, container_seed_dir):
+        """
+        Generate the SQL script loading the data files into a replica, it replaces all rows of the seeded tables
+        Foreign key and unique checks are disabled while loading, the generated keys are unique and all references valid.
+        :param container_seed_dir: The directory of the data files where the script is executed
+        :return: The SQL script
+        """
+        sql_statements = [
+            f"-- Seed data of database {self.schema.name}, loaded into every replica without the consensus log",
+            f"USE {self.schema.name};",
+            "SET SESSION foreign_key_checks = 0;\nSET SESSION unique_checks = 0;\nSET SESSION time_zone = '+00:00';",
+        ]
+        tables = list(self.tables.values())
+        sql_statements.append("\n".join(f"TRUNCATE TABLE {table.name};" for table in reversed(tables)))
+        for table in tables:
+            if self.get_rows(table.name) == 0:
+                continue
+            file_path = f"{container_seed_dir}/{self.get_data_file_name(table.name)}"
+            if self.data_format == 'load-data':
+                column_names = ', '.join(column.name for column in table.columns)
+                sql_statements.append(
+                    f"LOAD DATA LOCAL INFILE '{file_path}' INTO TABLE {table.name}\n"
+                    f"CHARACTER SET utf8mb4\n"
+                    f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'\n"
+                    f"LINES TERMINATED BY '\\n'\n"
+                    f"({column_names});")
+            else:
+                # Each file is one transaction, committing every INSERT would flush the redo log for every chunk
+                sql_statements.append(f"SET autocommit = 0;\nsource {file_path}\nCOMMIT;\nSET autocommit = 1;")
+        sql_statements.append("SET SESSION foreign_key_checks = 1;\nSET SESSION unique_checks = 1;")
+        return "\n\n".join(sql_statements) + "\n"
+
+    def _write_tab_separated(self, table, outputFile):
+        """
+        Write the rows of a table in the default format of LOAD DATA, NULL is written as \\N
+        :param table: Table node
+        :param outputFile: The opened data file
+        """
+        format_value = self._format_tab_separated
+        for row in self.generate_rows(table):
+            outputFile.write("\t".join([format_value(value) for value in row]) + "\n")
+
+    def _write_inserts(self, table, outputFile):
+        """
+        Write the rows of a table as INSERT statements of INSERT_CHUNK_ROWS rows each
+        :param table: Table node
+        :param outputFile: The opened data file
+        """
+        insert = f"INSERT INTO {table.name} ({', '.join(column.name for column in table.columns)}) VALUES\n"
+        format_value = self._format_sql
+        values = []
+        for row in self.generate_rows(table):
+            values.append("(" + ", ".join([format_value(value) for value in row]) + ")")
+            if len(values) == INSERT_CHUNK_ROWS:
+                outputFile.write(insert + ",\n".join(values) + ";\n")
+                values = []
+        if values:
+            outputFile.write(insert + ",\n".join(values) + ";\n")
+
+    def _format_tab_separated(self, value):
+        """
+        Format a value for LOAD DATA
+        :param value: The generated value
+        :return: The escaped field
+        """
+        if value is None:
+            return "\\N"
+        text = str(value)
+        if '\\' in text or '\t' in text or '\n' in text:
+            text = text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+        return text
+
+    def _format_sql(self, value):
+        """
+        Format a value as SQL literal
+        :param value: The generated value
+        :return: The SQL literal
+        """
+        if value is None:
+            return "NULL"
+        if isinstance(value, str):
+            return "'" + value.replace('\\', '\\\\').replace("'", "''") + "'"
+        return str(value)
+
+    def _row_key(self, table):
+        """
+        Get the column whose value identifies the row, the first primary key column which is no foreign key
+        A primary key consisting of foreign keys only is identified by its first column
+        :param table: Table node
+        :return: The name of the column, None if the table has no primary key
+        """
+        primary_keys = [column.name for column in table.columns if column.primary_key]
+        foreign_key_columns = {fk.column for fk in table.foreign_keys}
+        return next((name for name in primary_keys if name not in foreign_key_columns), primary_keys[0] if primary_keys else None)
+
+    def _foreign_key(self, table, column):
+        """
+        Get the foreign key of a column
+        :param table: Table node
+        :param column: Column node
+        :return: The ForeignKey node, None if the column is no foreign key
+        """
+        return next((fk for fk in table.foreign_keys if fk.column == column.name), None)
+
+    def _is_key_column(self, table, column):
+        """
+        Check whether the value of a column is derived from the row number
+        :param table: Table node
+        :param column: Column node
+        :return: True for the row key and for columns referenced by foreign keys
+        """
+        return column.name == self._row_key(table) or (table.name, column.name) in self.referenced_columns
+
+    def _value_function(self, table, column, rng):
+        """
+        Create the function generating the values of a column
+        :param table: Table node
+        :param column: Column node
+        :param rng: The random generator of the column
+        :return: Function of the row number returning the value
+        """
+        if self._is_key_column(table, column):
+            return self._key_function(table, column)
+        fk = self._foreign_key(table, column)
+        if fk is not None:
+            referenced_table = self._referenced_table(table, fk)
+            referenced_key = self._key_function(referenced_table, self._referenced_column(referenced_table, fk))
+            referenced_rows = self.get_rows(referenced_table.name)
+            if referenced_rows == 0:
+                if column.not_null and self.get_rows(table.name) > 0:
+                    raise ValueError(f"Table '{table.name}' references table '{fk.table}' without seed rows.")
+                return lambda row: None
+            uniform = rng.random
+            return lambda row: referenced_key(1 + int(uniform() * referenced_rows))
+
+        random_value = self._random_function(table, column, rng)
+        if column.not_null or column.primary_key:
+            return random_value
+        uniform = rng.random
+        return lambda row: None if uniform() < NULL_RATIO else random_value(row)
+
+    def _key_function(self, table, column):
+        """
+        Create the function deriving the values of a key column from the row number
+        :param table: Table node
+        :param column: Column node
+        :return: Function of the row number returning a value unique within the table
+        """
+        fk = self._foreign_key(table, column)
+        if fk is not None:
+            # A foreign key as row key references the row with the same number, a 1:1 relation
+            if column.name != self._row_key(table):
+                raise ValueError(f"Column '{column.name}' of table '{table.name}' is referenced by a foreign key "
+                                 f"but is a foreign key itself, its seed values can not be derived.")
+            referenced_table = self._referenced_table(table, fk)
+            if self.get_rows(table.name) > self.get_rows(referenced_table.name):
+                raise ValueError(f"Table '{table.name}' can have at most {self.get_rows(referenced_table.name)} seed rows, "
+                                 f"its primary key references table '{referenced_table.name}'.")
+            return self._key_function(referenced_table, self._referenced_column(referenced_table, fk))
+
+        rows = self.get_rows(table.name)
+        datatype = column.datatype
+        if datatype in ('auto_id', 'integer'):
+            return lambda row: row
+        if datatype == 'float':
+            if rows > MAX_FLOAT_KEY:
+                raise ValueError(f"Float key column '{column.name}' of table '{table.name}' can not hold {rows} unique seed values.")
+            return float
+        if datatype == 'boolean':
+            if rows > 2:
+                raise ValueError(f"Boolean key column '{column.name}' of table '{table.name}' can not hold {rows} unique seed values.")
+            return lambda row: row - 1
+        if datatype == 'date':
+            if rows > (date.max - FIRST_DATE).days + 1:
+                raise ValueError(f"Date key column '{column.name}' of table '{table.name}' can not hold {rows} unique seed values.")
+            first_ordinal = FIRST_DATE.toordinal() - 1
+            return lambda row: date.fromordinal(first_ordinal + row).isoformat()
+        if datatype == 'timestamp':
+            if FIRST_TIMESTAMP + rows - 1 > MAX_TIMESTAMP:
+                raise ValueError(f"Timestamp key column '{column.name}' of table '{table.name}' can not hold {rows} unique seed values.")
+            return lambda row: time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(FIRST_TIMESTAMP + row - 1))
+        if 'string' in datatype:
+            if len(str(rows)) > self._string_length(datatype):
+                raise ValueError(f"Key column '{column.name}' of table '{table.name}' of type {datatype} "
+                                 f"can not hold {rows} unique seed values.")
+            return str
+        raise ValueError(f"Unsupported datatype: {datatype}")
+
+    def _random_function(self, table, column, rng):
+        """
+        Create the function generating random values of a column
+        :param table: Table node
+        :param column: Column node
+        :param rng: The random generator of the column
+        :return: Function of the row number returning a random value of the datatype
+        """
+        datatype = column.datatype
+        # random() is several times faster than randint(), its values are scaled to the ranges
+        uniform = rng.random
+        if datatype in ('auto_id', 'integer'):
+            return lambda row: int(uniform() * (MAX_RANDOM_INTEGER + 1))
+        if datatype == 'float':
+            return lambda row: round(uniform() * MAX_RANDOM_FLOAT, 2)
+        if datatype == 'boolean':
+            return lambda row: rng.getrandbits(1)
+        if datatype == 'date':
+            first_ordinal = FIRST_DATE.toordinal()
+            days = LAST_DATE.toordinal() - first_ordinal + 1
+            return lambda row: date.fromordinal(first_ordinal + int(uniform() * days)).isoformat()
+        if datatype == 'timestamp':
+            seconds = LAST_TIMESTAMP - FIRST_TIMESTAMP + 1
+            return lambda row: time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(FIRST_TIMESTAMP + int(uniform() * seconds)))
+        if 'string' in datatype:
+            max_length = min(self._string_length(datatype), MAX_RANDOM_STRING_LENGTH)
+            pool = ''.join(rng.choices(STRING_CHARACTERS, k=STRING_POOL_LENGTH + max_length))
+            def random_string(row):
+                start = int(uniform() * STRING_POOL_LENGTH)
+                return pool[start:start + 1 + int(uniform() * max_length)]
+            return random_string
+        raise ValueError(f"Unsupported datatype: {datatype}")
+
+    def _referenced_table(self, table, fk):
+        """
+        Get the table referenced by a foreign key
+        :param table: Table node of the foreign key
+        :param fk: ForeignKey node
+        :return: The referenced Table node
+        """
+        if fk.table not in self.tables:
+            raise ValueError(f"Foreign key of table '{table.name}' references unknown table '{fk.table}'.")
+        return self.tables[fk.table]
+
+    def _referenced_column(self, referenced_table, fk):
+        """
+        Get the column referenced by a foreign key
+        :param referenced_table: The referenced Table node
+        :param fk: ForeignKey node
+        :return: The referenced Column node
+        """
+        column = next((column for column in referenced_table.columns if column.name == fk.column), None)
+        if column is None:
+            raise ValueError(f"Foreign key references unknown column '{fk.column}' of table '{referenced_table.name}'.")
+        return column
+
+    def _string_length(self, datatype):
+        """
+        Get the maximum length of a string datatype
+        :param datatype: ForgeAPI datatype string
+        :return: The maximum number of characters
+        """
+        match = re.search(r'\((\d+)\)', datatype)
+        return int(match.group(1)) if match else 255
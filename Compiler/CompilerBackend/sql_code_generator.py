@@ -1,8 +1,56 @@
-SQL_GENERATOR_VERSION = 1.2
+import hashlib
+from dataclasses import replace
+from datetime import date, timedelta
+from CompilerBackend.parallel_generation import generate_in_parallel
+
+SQL_GENERATOR_VERSION = 2.2
+
+# Maximum length of identifiers in MariaDB
+MAX_IDENTIFIER_LENGTH = 64
+
+# Maximum number of partitions of a MariaDB table
+MAX_PARTITIONS = 8192
+
+# Number of range partitions created from the first one, later rows are stored in the MAXVALUE partition
+PRECREATED_RANGE_PARTITIONS = 12
+
+# Interval between two checks of the range partitions by the leader of the RaftNode in milliseconds
+PARTITION_ROTATION_INTERVAL = 60 * 60 * 1000
+
+# Units of the range partitions of date and timestamp columns
+PARTITION_UNITS = ('DAY', 'MONTH', 'YEAR')
+
+# Datatypes a table can be partitioned by
+PARTITION_DATATYPES = ('auto_id', 'integer', 'date', 'timestamp')
+
+def generate_partitions_module(schema):
+    """
+    Generate the Node.js module listing the range partitions of the RaftNode
+    The leader splits new partitions off the MAXVALUE partition, so the created partitions stay ahead of the current period
+    :param schema: Database node with the start of its range partitions
+    :return: The JavaScript code of the module
+    """
+    code = "// Range partitions kept ahead of the current period or value by the leader\n"
+    code += f"module.exports = {{\n    interval: {PARTITION_ROTATION_INTERVAL},\n    tables: [\n"
+    for table in schema.tables:
+        partition = table.partition if table.type == 'table' else None
+        if partition is None or partition.method != 'range':
+            continue
+        datatype = next(column.datatype for column in table.columns if column.name == partition.column)
+        unit = f"'{partition.unit}'" if partition.unit else 'null'
+        code += (f"        {{ table: '{table.name}', column: '{partition.column}', datatype: '{datatype}', unit: {unit}, "
+                 f"interval: {partition.interval}, ahead: {PRECREATED_RANGE_PARTITIONS} }},\n")
+    code += "    ]\n};\n"
+    return code
 
 class SQLCodeGenerator:
-    def __init__(self, schema):
+    def __init__(self, schema, cache=None, profiler=None, jobs=1, migration_version=0):
         self.schema = schema
+        self.migration_version = migration_version  # Version of the last schema migration contained in the schema
+        self.cache = cache  # Optional CompilationCache for the CREATE TABLE statements
+        self.profiler = profiler  # Optional CompileProfiler counting the generated tables
+        self.jobs = jobs  # Number of worker processes generating the CREATE TABLE statements
+        self.partition_date = date.today()  # Date within the first range partition of date and timestamp columns
         # Mapping of ForgeAPI datatypes to SQL datatypes
         self.datatype_mapping = {
             'string': 'VARCHAR',
@@ -24,7 +72,7 @@ class SQLCodeGenerator:
             raise ValueError("Schema must be of type 'database'")
         
         # Extract database name
-        database_name = self.schema.get('name')
+        database_name = self.schema.name
         if not database_name:
             raise ValueError("Database name is missing in the schema.")
 
@@ -34,14 +82,27 @@ class SQLCodeGenerator:
         sql_statements.append(f"USE {database_name};")
         
         # Create SQL statements for each table
-        tables = self.schema.get('tables', [])
+        tables = self.schema.tables
         if not tables:
             print("Warning: No tables found in schema.")
+        self._validate_partition_references(tables)
+        # The start of the range partitions becomes part of the table, so cached statements of former periods are not reused
+        tables = [self._resolve_partition_start(table) for table in tables]
         
-        for table in tables:
-            if table.get('type') == 'table':
-                sql_statements.append(self._generate_create_table(table))
+        if self.jobs > 1:
+            sql_statements.extend(self._generate_create_tables_in_parallel(
+                [table for table in tables if table.type == 'table']
+            ))
+        else:
+            for table in tables:
+                if table.type == 'table':
+                    if self.profiler is None:
+                        sql_statements.append(self._generate_cached_create_table(table))
+                    else:
+                        with self.profiler.item('table', table.name):
+                            sql_statements.append(self._generate_cached_create_table(table))
 
+        sql_statements.append(self.add_migration_table())
         sql_statements.append(self.add_consensus_log_table())
         
         return "\n\n".join(sql_statements)
@@ -49,59 +110,283 @@ class SQLCodeGenerator:
     def _is_valid_schema(self, schema):
         """
         Check if the schema is valid
-        :param schema: Schema dictionary
+        :param schema: Database node
         :return: True if the schema is valid, False otherwise
         """
-        if schema.get('type') != 'database':
-            print(f"Invalid schema type: {schema.get('type')}")
+        schema_type = getattr(schema, 'type', None)
+        if schema_type != 'database':
+            print(f"Invalid schema type: {schema_type}")
             return False
         return True
     
+    def _validate_partition_references(self, tables):
+        """
+        Check that no foreign key references a partitioned table, MariaDB does not support foreign keys of partitioned tables
+        :param tables: List of Table nodes
+        """
+        partitioned_tables = {table.name for table in tables if table.type == 'table' and table.partition}
+        for table in tables:
+            if table.type != 'table':
+                continue
+            for fk in table.foreign_keys:
+                if fk.table in partitioned_tables:
+                    raise ValueError(f"Foreign key of table '{table.name}' references the partitioned table '{fk.table}', "
+                                     f"MariaDB does not support foreign keys of partitioned tables.")
+
+    def resolve_partition_starts(self, previous_schema=None):
+        """
+        Resolve the start of the range partitions of all tables and keep the start of a partitioning compiled before
+        Only new or changed range partitions start with the period of the partition date, so the schema does not change
+        with the calendar and the leader of the RaftNode adds the partitions of later periods
+        :param previous_schema: Database node of the schema snapshot of the last compile run, None if there is none
+        :return: The Database node with the start of its range partitions
+        """
+        previous_partitions = {table.name: table.partition for table in previous_schema.tables} if previous_schema else {}
+        tables = []
+        for table in self.schema.tables:
+            table = self._resolve_partition_start(table)
+            partition = table.partition if table.type == 'table' else None
+            previous_partition = previous_partitions.get(table.name)
+            if (partition is not None and partition.start is not None and previous_partition is not None
+                    and previous_partition.start is not None and replace(partition, start=previous_partition.start) == previous_partition):
+                table = replace(table, partition=previous_partition)
+            tables.append(table)
+        return replace(self.schema, tables=tuple(tables))
+
+    def _resolve_partition_start(self, table):
+        """
+        Set the start of the range partitions of a date or timestamp column to the period containing the partition date
+        Periods are aligned to multiples of the interval, e.g. quarters for EVERY 3 MONTH
+        :param table: Table node
+        :return: The Table node with the start of its range partitions
+        """
+        partition = table.partition if table.type == 'table' else None
+        if partition is None or partition.method != 'range' or partition.unit is None or partition.start is not None:
+            return table
+        unit = partition.unit.upper()
+        interval = partition.interval
+        if unit not in PARTITION_UNITS:
+            raise ValueError(f"Unknown partition unit '{partition.unit}' of table '{table.name}', "
+                             f"expected one of {', '.join(PARTITION_UNITS)}.")
+        if interval < 1:
+            raise ValueError(f"Partition interval of table '{table.name}' must be at least 1.")
+        if unit == 'DAY':
+            ordinal = self.partition_date.toordinal()
+            start = date.fromordinal(ordinal - ordinal % interval)
+        elif unit == 'MONTH':
+            month = self.partition_date.year * 12 + self.partition_date.month - 1
+            month -= month % interval
+            start = date(month // 12, month % 12 + 1, 1)
+        else:
+            start = date(self.partition_date.year - self.partition_date.year % interval, 1, 1)
+        return replace(table, partition=replace(partition, unit=unit, start=start.isoformat()))
+
+    def _generate_cached_create_table(self, table):
+        """
+        Generate a SQL statement for a table or take it from the compilation cache if the table is unchanged
+        :param table: Table node
+        :return: SQL statement for creating the table
+        """
+        if self.cache is None:
+            return self._generate_create_table(table)
+        return self.cache.get_or_generate('table', table, lambda: self._generate_create_table(table))
+
+    def _generate_create_tables_in_parallel(self, tables):
+        """
+        Generate the SQL statements for a list of tables in worker processes
+        Tables unchanged since the last compile run are taken from the compilation cache
+        :param tables: List of Table nodes
+        :return: List of SQL statements in the order of the tables
+        """
+        def generate_many(missing_tables):
+            results = generate_in_parallel(self, '_generate_create_table', [(table,) for table in missing_tables], self.jobs)
+            if self.profiler is not None:
+                for table, (sql, seconds) in zip(missing_tables, results):
+                    self.profiler.record_item('table', table.name, seconds)
+            return [sql for sql, seconds in results]
+
+        if self.cache is None:
+            return generate_many(tables)
+        return self.cache.get_or_generate_many('table', tables, generate_many)
+
     def _generate_create_table(self, table):
         """
         Generate a SQL statement for a table
-        :param table: Table dictionary
+        :param table: Table node
         :return: SQL statement for creating the table
         """
-        table_name = table.get('name')
+        table_name = table.name
         if not table_name:
             raise ValueError("Table name is missing.")
         
-        columns = table.get('columns', [])
-        foreign_keys = table.get('foreign_keys', [])
+        columns = table.columns
+        foreign_keys = table.foreign_keys
         
         # Create SQL statement for table creation
         sql = f"CREATE TABLE {table_name} (\n"
         
-        # Column definitions
+        # Column definitions, a primary key of several columns is defined after the columns
+        primary_keys = [column.name for column in columns if column.primary_key]
         column_definitions = []
         for column in columns:
-            col_name = column.get('name')
-            col_type = self._map_datatype(column.get('datatype', 'TEXT'))  # Default datatype is TEXT (only one supported currently)
-            primary_key = 'PRIMARY KEY' if column.get('primary_key') else ''
-            not_null = 'NOT NULL' if column.get('not_null') else ''
-            column_definitions.append(f"  {col_name} {col_type} {primary_key} {not_null}".strip())
+            column_definitions.append(self._generate_column_definition(column, len(primary_keys) == 1))
         
         if not column_definitions:
             print(f"Warning: No column definitions for table {table_name}.")
         
         sql += ",\n".join(column_definitions)
+
+        if len(primary_keys) > 1:
+            sql += f",\n  PRIMARY KEY ({', '.join(primary_keys)})"
         
         # Foreign Key-Constraints
         fk_constraints = []
         for fk in foreign_keys:
-            fk_table = fk.get('table')
-            fk_column = fk.get('column')
-            if fk_table and fk_column:
-                fk_constraints.append(f"  FOREIGN KEY ({fk_column}) REFERENCES {fk_table} ({fk_column})")
+            if fk.table and fk.column:
+                fk_constraints.append(f"  {self._generate_foreign_key(table_name, fk)}")
         
         if fk_constraints:
             sql += ",\n" + ",\n".join(fk_constraints)
+
+        # Secondary indexes
+        index_definitions = []
+        for index in table.indexes:
+            index_definitions.append(f"  INDEX {self._generate_index_name(table_name, index.columns)} ({', '.join(index.columns)})")
+
+        if index_definitions:
+            sql += ",\n" + ",\n".join(index_definitions)
         
-        sql += "\n);"
+        sql += "\n)"
+
+        if table.partition is not None:
+            sql += "\n" + self._generate_partition(table)
+
+        sql += ";"
         
         return sql
 
+    def _generate_partition(self, table):
+        """
+        Generate the partition clause of a table
+        MariaDB requires the partition column in every unique key and supports no foreign keys of partitioned tables.
+        :param table: Table node with a Partition node
+        :return: The PARTITION BY clause of the CREATE TABLE statement
+        """
+        partition = table.partition
+        column = next((column for column in table.columns if column.name == partition.column), None)
+        if column is None:
+            raise ValueError(f"Table '{table.name}' is partitioned by unknown column '{partition.column}'.")
+        if column.datatype not in PARTITION_DATATYPES:
+            raise ValueError(f"Table '{table.name}' can not be partitioned by column '{column.name}' of type {column.datatype}, "
+                             f"expected one of {', '.join(PARTITION_DATATYPES)}.")
+        if table.foreign_keys:
+            raise ValueError(f"Partitioned table '{table.name}' can not have foreign keys, "
+                             f"MariaDB does not support foreign keys of partitioned tables.")
+        primary_keys = [primary_key.name for primary_key in table.columns if primary_key.primary_key]
+        if primary_keys and column.name not in primary_keys:
+            raise ValueError(f"Partition column '{column.name}' of table '{table.name}' must be part of the primary key, "
+                             f"MariaDB requires the partition column in every unique key.")
+
+        if partition.method == 'hash':
+            if not 1 <= partition.partitions <= MAX_PARTITIONS:
+                raise ValueError(f"Table '{table.name}' must have between 1 and {MAX_PARTITIONS} hash partitions.")
+            expression = {'date': f"TO_DAYS({column.name})", 'timestamp': f"UNIX_TIMESTAMP({column.name})"}.get(column.datatype, column.name)
+            return f"PARTITION BY HASH ({expression})\nPARTITIONS {partition.partitions}"
+
+        if partition.interval < 1:
+            raise ValueError(f"Partition interval of table '{table.name}' must be at least 1.")
+        time_column = column.datatype in ('date', 'timestamp')
+        if time_column != (partition.unit is not None):
+            raise ValueError(f"Range partitions of {column.datatype} column '{column.name}' of table '{table.name}' "
+                             + ("need a unit (DAY, MONTH or YEAR)." if time_column else "have no unit."))
+
+        partition_definitions = []
+        if not time_column:
+            for number in range(PRECREATED_RANGE_PARTITIONS):
+                partition_definitions.append(f"  PARTITION p{number * partition.interval} "
+                                             f"VALUES LESS THAN ({(number + 1) * partition.interval})")
+            clause = f"PARTITION BY RANGE ({column.name})"
+        else:
+            start = date.fromisoformat(partition.start)
+            name_format = {'DAY': '%Y%m%d', 'MONTH': '%Y%m', 'YEAR': '%Y'}[partition.unit]
+            for number in range(PRECREATED_RANGE_PARTITIONS):
+                end = self._add_partition_interval(start, partition.unit, partition.interval)
+                bound = f"'{end.isoformat()}'" if column.datatype == 'date' else f"UNIX_TIMESTAMP('{end.isoformat()} 00:00:00')"
+                partition_definitions.append(f"  PARTITION p{start.strftime(name_format)} VALUES LESS THAN ({bound})")
+                start = end
+            # Range columns partition dates without a function, so queries on the column are pruned directly
+            clause = (f"PARTITION BY RANGE COLUMNS ({column.name})" if column.datatype == 'date'
+                      else f"PARTITION BY RANGE (UNIX_TIMESTAMP({column.name}))")
+        # Range columns need the parenthesized value list
+        maximum = "(MAXVALUE)" if column.datatype == 'date' else "MAXVALUE"
+        partition_definitions.append(f"  PARTITION pmax VALUES LESS THAN {maximum}")
+        return clause + " (\n" + ",\n".join(partition_definitions) + "\n)"
+
+    def _add_partition_interval(self, start, unit, interval):
+        """
+        Add the interval of a range partition to a date
+        :param start: The start of the partition
+        :param unit: DAY, MONTH or YEAR
+        :param interval: Number of units of a partition
+        :return: The start of the next partition
+        """
+        if unit == 'DAY':
+            return start + timedelta(days=interval)
+        if unit == 'MONTH':
+            month = start.year * 12 + start.month - 1 + interval
+            return date(month // 12, month % 12 + 1, 1)
+        return date(start.year + interval, 1, 1)
+
+    def _generate_column_definition(self, column, inline_primary_key=True):
+        """
+        Generate the definition of a column
+        :param column: Column node
+        :param inline_primary_key: Whether a primary key column is marked with PRIMARY KEY, False for composite primary keys
+        :return: The column definition, e.g. for CREATE TABLE or ALTER TABLE ... ADD COLUMN
+        """
+        col_type = self._map_datatype(column.datatype)
+        primary_key = 'PRIMARY KEY' if column.primary_key and inline_primary_key else ''
+        not_null = 'NOT NULL' if column.not_null else ''
+        return f"  {column.name} {col_type} {primary_key} {not_null}".strip()
+
+    def _generate_foreign_key(self, table_name, fk):
+        """
+        Generate a named foreign key constraint, the name allows migrations to drop it
+        :param table_name: Name of the referencing table
+        :param fk: ForeignKey node
+        :return: The constraint definition
+        """
+        return f"CONSTRAINT {self._generate_foreign_key_name(table_name, fk)} FOREIGN KEY ({fk.column}) REFERENCES {fk.table} ({fk.column})"
+
+    def _generate_foreign_key_name(self, table_name, fk):
+        """
+        Generates the name of a foreign key constraint
+        :param table_name: Name of the referencing table
+        :param fk: ForeignKey node
+        :return: Name of the constraint
+        """
+        return self._shorten_identifier(f"fk_{table_name}_{fk.table}_{fk.column}")
+
+    def _generate_index_name(self, table_name, columns):
+        """
+        Generates the name of an index from the table and its columns
+        :param table_name: Name of the indexed table
+        :param columns: The indexed columns
+        :return: Name of the index
+        """
+        return self._shorten_identifier(f"idx_{table_name}_{'_'.join(columns)}")
+
+    def _shorten_identifier(self, identifier):
+        """
+        Shortens identifiers longer than allowed by MariaDB and makes them unique by a hash of the full identifier
+        :param identifier: The full identifier
+        :return: The identifier with at most MAX_IDENTIFIER_LENGTH characters
+        """
+        if len(identifier) > MAX_IDENTIFIER_LENGTH:
+            name_hash = hashlib.sha256(identifier.encode('utf-8')).hexdigest()[:8]
+            identifier = f"{identifier[:MAX_IDENTIFIER_LENGTH - len(name_hash) - 1]}_{name_hash}"
+        return identifier
+
     def _map_datatype(self, datatype):
         """
         Maps the ForgeAPI datatype to a SQL datatype
@@ -129,14 +414,39 @@ class SQLCodeGenerator:
             return match.group(1)
         return '255'  # Default size if not specified
     
+    def add_migration_table(self):
+        """
+        Add the Consensus_Node_Migration table holding the versions of the applied schema migrations
+        A new database already has the current schema, so it starts with the version of the last migration.
+        A migration in progress records its applied statements, MariaDB commits every DDL statement on its own.
+        :return: SQL code for creating and initializing the Consensus_Node_Migration table
+        """
+        return(
+            "CREATE TABLE Consensus_Node_Migration (\n"
+            "version INT UNSIGNED PRIMARY KEY,\n"
+            "applied_statements INT UNSIGNED NULL,\n"
+            "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP\n"
+            ");\n\n"
+            f"INSERT INTO Consensus_Node_Migration (version) VALUES ({self.migration_version});"
+        )
+
     def add_consensus_log_table(self):
         """
-        Add a Consensus_Node_Log table to the schema
-        :return: SQL code for creating the Consensus_Node_Log table
+        Add the Consensus_Node_Log table and the Consensus_Node_Checkpoint table to the schema
+        The id of a log entry is its log index, the command is stored as encoded BLOB.
+        The checkpoint holds the last applied entry, entries below it can be compacted.
+        :return: SQL code for creating the Consensus_Node_Log and Consensus_Node_Checkpoint tables
         """
         return(
             "CREATE TABLE Consensus_Node_Log (\n"
             "id SERIAL PRIMARY KEY,\n"
-            "command TEXT NOT NULL\n"
+            "term BIGINT UNSIGNED NOT NULL DEFAULT 0,\n"
+            "command MEDIUMBLOB NOT NULL\n"
+            ");\n\n"
+            "CREATE TABLE Consensus_Node_Checkpoint (\n"
+            "id TINYINT UNSIGNED PRIMARY KEY,\n"
+            "log_id BIGINT UNSIGNED NOT NULL,\n"
+            "term BIGINT UNSIGNED NOT NULL,\n"
+            "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP\n"
             ");\n"
         )
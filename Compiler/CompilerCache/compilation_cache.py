@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+COMPILATION_CACHE_VERSION = 1
+
+# Packages whose source code is part of the cache fingerprint. Changing the compiler invalidates the cache.
+FINGERPRINT_PACKAGES = ('CompilerFrontend', 'CompilerBackend')
+
+class CompilationCache:
+    """
+    Persistent on-disk cache for parse trees and generated code.
+
+    Entries are keyed by their kind and a hash of the content they were generated from,
+    e.g. the source file for the parse tree or a single table for its CREATE TABLE statement.
+    Entries that were not used during a compile run are dropped when the cache is saved.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.cache_file = os.path.join(cache_dir, 'compilation_cache.pickle')
+        self.fingerprint = self._compiler_fingerprint()
+        self.entries = {}  # Entries loaded from the previous compile run
+        self.used_entries = {}  # Entries used or generated during the current compile run
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def hash_content(content):
+        """
+        Hash a part of the parse tree or any other content with a stable representation
+        :param content: The content to hash
+        :return: The hex digest of the content
+        """
+        return hashlib.sha256(repr(content).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path):
+        """
+        Hash the content of a file without loading it into memory at once
+        :param file_path: The path to the file
+        :return: The hex digest of the file content
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as inputFile:
+            for chunk in iter(lambda: inputFile.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _compiler_fingerprint(self):
+        """
+        Hash the cache version and the source code of the compiler packages
+        :return: The hex digest identifying the current compiler
+        """
+        digest = hashlib.sha256(str(COMPILATION_CACHE_VERSION).encode('utf-8'))
+        compiler_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for package in FINGERPRINT_PACKAGES:
+            for root, dirs, files in sorted(os.walk(os.path.join(compiler_dir, package))):
+                for file_name in sorted(files):
+                    if file_name.endswith('.py'):
+                        with open(os.path.join(root, file_name), 'rb') as inputFile:
+                            digest.update(inputFile.read())
+        return digest.hexdigest()
+
+    def _load(self):
+        """
+        Load the entries of the previous compile run if they were created by the same compiler
+        """
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'rb') as inputFile:
+                cache_content = pickle.load(inputFile)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logging.warning(f"Ignoring unreadable compilation cache {self.cache_file}: {e}")
+            return
+        if cache_content.get('fingerprint') == self.fingerprint:
+            self.entries = cache_content.get('entries', {})
+        else:
+            logging.info("Compiler changed since the last run, compilation cache is discarded")
+
+    def begin_run(self):
+        """
+        Start another compile run of a resident compiler
+        The entries used by the previous run become the cached entries of the next one
+        """
+        if self.used_entries:
+            self.entries = self.used_entries
+        self.used_entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_generate(self, kind, content, generate):
+        """
+        Return the cached entry for the content or generate and remember it
+        :param kind: The kind of the entry, e.g. 'table' or 'endpoint'
+        :param content: The content the entry is generated from, used as the cache key
+        :param generate: Function without arguments generating the entry on a cache miss
+        :return: The cached or generated entry
+        """
+        return self.get_or_generate_by_hash(kind, self.hash_content(content), generate)
+
+    def get_or_generate_by_hash(self, kind, content_hash, generate):
+        """
+        Return the cached entry for an already hashed content or generate and remember it
+        :param kind: The kind of the entry, e.g. 'parse_tree'
+        :param content_hash: The hash of the content the entry is generated from
+        :param generate: Function without arguments generating the entry on a cache miss
+        :return: The cached or generated entry
+        """
+        key = (kind, content_hash)
+        if key in self.used_entries:
+            self.hits += 1
+            return self.used_entries[key]
+        if key in self.entries:
+            self.hits += 1
+            value = self.entries[key]
+        else:
+            self.misses += 1
+            value = generate()
+        self.used_entries[key] = value
+        return value
+
+    def get_or_generate_many(self, kind, contents, generate_many):
+        """
+        Return the cached entries for a list of contents, generating all missing entries in one call
+        :param kind: The kind of the entries, e.g. 'table' or 'endpoint'
+        :param contents: List of contents the entries are generated from, used as the cache keys
+        :param generate_many: Function taking the list of missing contents and returning their entries in order
+        :return: List of the cached or generated entries in the order of contents
+        """
+        keys = [(kind, self.hash_content(content)) for content in contents]
+        entries = [None] * len(keys)
+        missing_indices = []
+        for index, key in enumerate(keys):
+            if key in self.used_entries:
+                entries[index] = self.used_entries[key]
+            elif key in self.entries:
+                entries[index] = self.entries[key]
+            else:
+                missing_indices.append(index)
+                continue
+            self.hits += 1
+            self.used_entries[key] = entries[index]
+
+        if missing_indices:
+            generated = generate_many([contents[index] for index in missing_indices])
+            for index, value in zip(missing_indices, generated):
+                self.misses += 1
+                entries[index] = value
+                self.used_entries[keys[index]] = value
+        return entries
+
+    def save(self):
+        """
+        Atomically write the entries used during this compile run to the cache file
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'wb') as outputFile:
+                pickle.dump({'fingerprint': self.fingerprint, 'entries': self.used_entries},
+                            outputFile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            logging.warning(f"Could not write compilation cache {self.cache_file}: {e}")
@@ -1,50 +1,77 @@
 from .token_definition import TokenDefinition
+from collections import namedtuple
 import re
 
+# All token patterns joined into one alternation of named groups. Alternatives are tried in
+# the declaration order of TokenDefinition, so the first matching token still wins.
+MASTER_PATTERN = re.compile('|'.join(f"(?P<{token.name}>{token.value})" for token in TokenDefinition))
+
+# The same alternation for binary sources such as memory-mapped files
+BYTES_MASTER_PATTERN = re.compile(MASTER_PATTERN.pattern.encode('ascii'))
+
+# Tokens which are consumed by the lexer but never handed to the parser
+SKIPPED_TOKENS = frozenset((TokenDefinition.WS, TokenDefinition.NEWLINE, TokenDefinition.COMMENT))
+
+# A token found by the lexer. It can still be indexed like the former (TokenDefinition, value) tuples.
+Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
+
 class Lexer:
     def __init__(self, input_text):
+        """
+        Initializes the Lexer with the source code.
+
+        :param input_text: The source code as a string or as a bytes-like object, e.g. a memory-mapped file
+        """
         self.input_text = input_text
         self.position = 0  # Current position in the input_text
+        self.line = 1  # Line of the current position
+        self.line_start = 0  # Position at which the current line starts
         self.tokens = []  # List of found tokens
 
-    def _get_next_substring(self):
+    def generate_tokens(self):
         """
-        Returns the next token and the matched substring from the input_text
+        Lazily yields the tokens of the input_text, skipping whitespaces, newlines and comments.
+        Only the current match is held in memory, so the input_text can be a memory-mapped file.
+
+        :return: Generator of Token tuples
         """
-        if self.position >= len(self.input_text):
-            return None, None
-        
-        for token in TokenDefinition:
-            pattern = re.compile(token.value)
-            match = pattern.match(self.input_text, self.position)
-            if match:
-                token_value = match.group(0)
-                self.position = match.end()
-                
-                # If the matched token is a comment, skip it
-                if token == TokenDefinition.COMMENT:
-                    return self._get_next_substring()
-                
-                return token, token_value
-        
-        # If no token matches, move one character forward and mark it as an unknown token
-        current_char = self.input_text[self.position]
-        self.position += 1
-        return None, current_char
+        input_text = self.input_text
+        is_text = isinstance(input_text, str)
+        match_token = (MASTER_PATTERN if is_text else BYTES_MASTER_PATTERN).match
+        newline = '\n' if is_text else b'\n'
+        token_by_name = TokenDefinition.__members__
+        end = len(input_text)
+
+        while self.position < end:
+            start = self.position
+            match = match_token(input_text, start)
+            if not match:
+                # Handle unknown tokens
+                self.position += 1
+                current_char = input_text[start:start + 1]
+                if not is_text:
+                    current_char = current_char.decode('utf-8', 'replace')
+                raise ValueError(f"Unknown token at line {self.line}, column {start - self.line_start + 1}: '{current_char}'")
+
+            self.position = match.end()
+            token = token_by_name[match.lastgroup]
+            value = match.group(0)
+
+            if token in SKIPPED_TOKENS:
+                # Keep track of the line, only skipped tokens can contain newlines
+                if newline in value:
+                    self.line += value.count(newline)
+                    self.line_start = start + value.rfind(newline) + 1
+                continue
+
+            if not is_text:
+                value = value.decode('utf-8')
+            yield Token(token, value, self.line, start - self.line_start + 1)
 
     def tokenize(self):
         """
-        Tokenize the input string into a list of (TokenDefinition, value) tuples
-        :return: List of (TokenDefinition, value) tuples
+        Tokenize the input string into a list of Token tuples
+        :return: List of (TokenDefinition, value, line, column) tuples
         """
-        while self.position < len(self.input_text):
-            token, substring = self._get_next_substring()
-
-            if token:
-                # Skip over whitespaces and newlines
-                if token not in (TokenDefinition.WS, TokenDefinition.NEWLINE):
-                    self.tokens.append((token, substring))
-            elif substring:  # Handle unknown tokens
-                raise ValueError(f"Unknown token at position {self.position}: '{substring}'")
-
+        self.tokens.extend(self.generate_tokens())
         return self.tokens
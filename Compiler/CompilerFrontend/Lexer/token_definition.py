@@ -6,6 +6,7 @@ class TokenDefinition(enum.Enum):
     """
 
     DATABASE = r'DATABASE\b'
+    INCLUDE = r'INCLUDE\b'
     TABLE = r'TABLE\b'
     COLUMN = r'COLUMN\b'
     AUTO_ID = r'auto_id\b'
@@ -17,17 +18,34 @@ class TokenDefinition(enum.Enum):
     TIMESTAMP = r'timestamp\b'
     PK = r'PK\b'
     FK = r'FK\b'
+    INDEX = r'INDEX\b'
     REST = r'REST\b'
     GET = r'get\b'
     POST = r'post\b'
     PUT = r'put\b'
     DELETE = r'delete\b'
     NOT_NULL = r'not null\b'
+    PAGE = r'PAGE\b'
+    MAX = r'MAX\b'
+    CONSISTENCY = r'CONSISTENCY\b'
+    CACHE = r'CACHE\b'
+    LOG = r'LOG\b'
+    RETAIN = r'RETAIN\b'
+    CHECKPOINT = r'CHECKPOINT\b'
+    PARTITION = r'PARTITION\b'
+    BY = r'BY\b'
+    RANGE = r'RANGE\b'
+    HASH = r'HASH\b'
+    EVERY = r'EVERY\b'
     LBRACE = r'\{'
     RBRACE = r'\}'
     LPAREN = r'\('
     RPAREN = r'\)'
+    LBRACKET = r'\['
+    RBRACKET = r'\]'
     EQUALS = r'='
+    ARROW = r'->'
+    STRING_LITERAL = r'"[^"\n]*"'  # Double quoted string without line breaks, e.g. a module path
     URL = r'/[a-zA-Z_][a-zA-Z_0-9]*(/[a-zA-Z_][a-zA-Z_0-9]*)*'  # Allows multiple segments in URL
     IDENTIFIER = r'[a-zA-Z_][a-zA-Z_0-9]*'
     NUMBER = r'\d+'
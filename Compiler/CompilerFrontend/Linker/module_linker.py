@@ -0,0 +1,175 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from CompilerFrontend.Lexer.lexer import Lexer
+from CompilerFrontend.Parser.parser import Parser
+from CompilerFrontend.Parser.ast_nodes import Include, RestBlock
+
+def parse_module_file(file_path):
+    """
+    Read, tokenize and parse a module file
+    Defined on module level, so it can be run in a worker process
+    :param file_path: The path to the module file
+    :return: The Module node of the file
+    """
+    try:
+        with open(file_path, 'r') as inputFile:
+            source = inputFile.read()
+    except FileNotFoundError:
+        raise ValueError(f"Module {file_path} not found.")
+    try:
+        return Parser(Lexer(source).tokenize()).parse_module()
+    except SyntaxError as e:
+        raise ValueError(f"Syntax error in module {file_path}: {e}")
+    except ValueError as e:
+        raise ValueError(f"Lexical error in module {file_path}: {e}")
+
+class ModuleLinker:
+    """
+    Resolves the INCLUDE statements of a database and merges the included modules into one Database node.
+
+    The modules are parsed level by level, all modules included on the same level in parallel.
+    Each module is parsed once per content, so with a cache only edited modules are parsed again.
+    The tables of a module take the place of its INCLUDE statement, the REST tables of the modules
+    come before the REST tables of the including file.
+
+    - Parameters:
+      cache: CompilationCache - Cache for the parsed modules, None to parse every module.
+      jobs: int - Number of worker processes parsing the modules of one level.
+    """
+    def __init__(self, cache=None, jobs=1):
+        self.cache = cache
+        self.jobs = jobs
+        self.modules = {}  # Absolute path of a module file -> Module node
+        self.included_by = {}  # Absolute path of a module file -> path of the including file
+        self.module_paths = []  # Paths of all included module files in the order they were found
+
+    def link(self, database, source_file):
+        """
+        Replace the includes of the database by the tables and REST tables of the included modules
+        :param database: The Database node parsed from the source file
+        :param source_file: The path to the source file, includes are resolved relative to its directory
+        :return: The linked Database node without Include nodes
+        """
+        source_file = os.path.abspath(source_file)
+        self._load_modules(database.tables, source_file)
+
+        tables, rest_tables = self._expand(database.tables, source_file)
+        if database.rest_block:
+            rest_tables.extend(database.rest_block.tables)
+        self._validate_tables(tables)
+
+        rest_block = RestBlock(tuple(rest_tables)) if rest_tables else database.rest_block
+        return replace(database, tables=tuple(table for table, origin in tables), rest_block=rest_block)
+
+    @staticmethod
+    def _module_path(include, including_file):
+        """
+        Resolve the path of an included module relative to the directory of the including file
+        :param include: The Include node
+        :param including_file: The absolute path of the including file
+        :return: The absolute path of the module file
+        """
+        return os.path.normpath(os.path.join(os.path.dirname(including_file), include.path))
+
+    def _load_modules(self, nodes, source_file):
+        """
+        Parse all modules reachable from the source file, one include level at a time
+        :param nodes: The tables and includes of the source file
+        :param source_file: The absolute path of the source file
+        """
+        executor = None
+        try:
+            level = self._register_includes(nodes, source_file, source_file)
+            while level:
+                if self.jobs > 1 and len(level) > 1 and executor is None:
+                    executor = ProcessPoolExecutor(max_workers=self.jobs)
+                for module_path, module in zip(level, self._parse_modules(level, executor)):
+                    self.modules[module_path] = module
+
+                next_level = []
+                for module_path in level:
+                    next_level.extend(self._register_includes(self.modules[module_path].tables, module_path, source_file))
+                level = next_level
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _register_includes(self, nodes, including_file, source_file):
+        """
+        Register the modules included by a file, every module may only be included once
+        :param nodes: The tables and includes of the file
+        :param including_file: The absolute path of the file
+        :param source_file: The absolute path of the source file, which must not be included
+        :return: List of the newly registered module paths
+        """
+        module_paths = []
+        for module_path in [self._module_path(node, including_file) for node in nodes if isinstance(node, Include)]:
+            if module_path == source_file:
+                raise ValueError(f"Module {including_file} includes the source file {source_file}, cyclic includes are not allowed.")
+            if module_path in self.included_by:
+                raise ValueError(f"Module {module_path} included by {including_file} is already included "
+                                 f"by {self.included_by[module_path]}, cyclic or repeated includes are not allowed.")
+            if not os.path.isfile(module_path):
+                raise ValueError(f"Module {module_path} included by {including_file} not found.")
+            self.included_by[module_path] = including_file
+            self.module_paths.append(module_path)
+            module_paths.append(module_path)
+        return module_paths
+
+    def _parse_modules(self, module_paths, executor):
+        """
+        Parse the modules of one include level, taking unchanged modules from the cache
+        :param module_paths: The absolute paths of the module files
+        :param executor: The process pool parsing the modules, None to parse them in this process
+        :return: List of Module nodes in the order of module_paths
+        """
+        def parse_many(paths):
+            if executor is None or len(paths) == 1:
+                return [parse_module_file(path) for path in paths]
+            return list(executor.map(parse_module_file, paths))
+
+        if self.cache is None:
+            return parse_many(module_paths)
+
+        file_hashes = [self.cache.hash_file(module_path) for module_path in module_paths]
+        paths_by_hash = dict(zip(file_hashes, module_paths))
+        return self.cache.get_or_generate_many(
+            'module', file_hashes, lambda missing_hashes: parse_many([paths_by_hash[file_hash] for file_hash in missing_hashes]))
+
+    def _expand(self, nodes, file_path):
+        """
+        Replace the includes of a file by the tables of the included modules, recursively
+        :param nodes: The tables and includes of the file
+        :param file_path: The absolute path of the file
+        :return: Tuple of the list of (Table, origin file) tuples and the list of REST tables of the included modules
+        """
+        tables = []
+        rest_tables = []
+        for node in nodes:
+            if isinstance(node, Include):
+                module_path = self._module_path(node, file_path)
+                module = self.modules[module_path]
+                module_tables, module_rest_tables = self._expand(module.tables, module_path)
+                tables.extend(module_tables)
+                rest_tables.extend(module_rest_tables)
+                if module.rest_block:
+                    rest_tables.extend(module.rest_block.tables)
+            else:
+                tables.append((node, file_path))
+        return tables, rest_tables
+
+    def _validate_tables(self, tables):
+        """
+        Check the merged tables for duplicate names and foreign keys referencing tables defined later
+        :param tables: List of (Table, origin file) tuples in the order of the merged database
+        """
+        defined_tables = {}  # Table name -> origin file
+        for table, origin in tables:
+            if table.name in defined_tables:
+                raise ValueError(f"Table '{table.name}' in {origin} is already defined in {defined_tables[table.name]}.")
+            for foreign_key in table.foreign_keys:
+                if foreign_key.table != table.name and foreign_key.table not in defined_tables:
+                    raise ValueError(f"Foreign key of table '{table.name}' in {origin} references table "
+                                     f"'{foreign_key.table}', which is not defined before it.")
+            defined_tables[table.name] = origin
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, replace
+from typing import ClassVar, Optional, Tuple, Union
+
+# Typed nodes of the abstract syntax tree created by the Parser.
+# Nodes are immutable and hold their children in tuples, so views of the tree
+# (e.g. the database schema without the REST block) can share nodes instead of copying them.
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    type: ClassVar[str] = 'column'
+    name: str
+    datatype: str
+    primary_key: bool = False
+    not_null: bool = False
+
+@dataclass(frozen=True, slots=True)
+class ForeignKey:
+    type: ClassVar[str] = 'foreign_key'
+    table: str
+    column: str
+
+@dataclass(frozen=True, slots=True)
+class Index:
+    type: ClassVar[str] = 'index'
+    columns: Tuple[str, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    type: ClassVar[str] = 'partition'
+    method: str  # Partitioning method: range or hash
+    column: str
+    interval: Optional[int] = None  # Width of a range partition, in units for date and timestamp columns
+    unit: Optional[str] = None  # DAY, MONTH or YEAR of a range over a date or timestamp column, None for integer columns
+    partitions: Optional[int] = None  # Number of hash partitions
+    start: Optional[str] = None  # ISO date starting the first range partition, set by the SQL generator
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    type: ClassVar[str] = 'table'
+    name: str
+    columns: Tuple[Column, ...] = ()
+    foreign_keys: Tuple[ForeignKey, ...] = ()
+    indexes: Tuple[Index, ...] = ()
+    partition: Optional[Partition] = None  # Partitioning of the table, None if not partitioned
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    type: ClassVar[str] = 'endpoint'
+    table: str
+    method: str
+    url: str
+    query_params: Tuple[str, ...] = ()
+    columns: Tuple[str, ...] = ()  # Columns returned by a GET endpoint, all columns if empty
+    page_size: Optional[int] = None  # Default page size of a paginated GET endpoint, None if not paginated
+    max_page_size: Optional[int] = None  # Maximum page size a client may request, None for the default maximum
+    consistency: str = 'quorum'  # Read consistency level of a GET endpoint: quorum, leader or any
+    batch: bool = False  # Whether a POST endpoint inserts an array of rows
+    max_batch_size: Optional[int] = None  # Maximum number of rows of a batch, None for the default maximum
+    cache_ttl: Optional[int] = None  # Milliseconds a GET endpoint caches its results, None if not cached
+    cache_size: Optional[int] = None  # Maximum number of cached results, None for the default maximum
+
+@dataclass(frozen=True, slots=True)
+class RestTable:
+    type: ClassVar[str] = 'rest_table'
+    table: str
+    endpoints: Tuple[Endpoint, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class RestBlock:
+    type: ClassVar[str] = 'rest'
+    tables: Tuple[RestTable, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class Include:
+    type: ClassVar[str] = 'include'
+    path: str
+
+@dataclass(frozen=True, slots=True)
+class Module:
+    type: ClassVar[str] = 'module'
+    tables: Tuple[Union[Table, Include], ...] = ()
+    rest_block: Optional[RestBlock] = None
+
+@dataclass(frozen=True, slots=True)
+class LogPolicy:
+    type: ClassVar[str] = 'log_policy'
+    retain: Optional[int] = None  # Applied entries kept below the latest checkpoint, None to keep all entries
+    checkpoint_interval: Optional[int] = None  # Applied entries between two checkpoints, None for the default interval
+
+@dataclass(frozen=True, slots=True)
+class Database:
+    type: ClassVar[str] = 'database'
+    name: str
+    tables: Tuple[Union[Table, Include], ...] = ()  # Include nodes are replaced by the module tables when linking
+    rest_block: Optional[RestBlock] = None
+    log_policy: Optional[LogPolicy] = None  # Retention of the consensus log, None to keep all entries
+
+    def schema(self):
+        """
+        Returns the database schema without the REST block, sharing all table nodes with this database
+
+        :return: A Database node without rest_block
+        """
+        return replace(self, rest_block=None)
@@ -0,0 +1,178 @@
+# Generated by CompilerFrontend/Parser/parser_generator.py from DSL/forgeapi-grammar.ebnf, do not edit.
+# Regenerate it after changing the grammar or the tokens of the lexer:
+#     cd Compiler && python3 -m CompilerFrontend.Parser.parser_generator
+
+PARSER_GENERATOR_VERSION = '1.0'
+
+# Rules the parser starts with, the whole input must match them
+START_SYMBOLS = ('database', 'module')
+
+# Terminal of the end of the input
+END_OF_INPUT = 'END'
+
+# Productions as (rule, symbols), symbols in upper case are tokens of the lexer.
+# Helper rules of optional, repeated and grouped parts are named after their rule.
+PRODUCTIONS = (
+    ('database', ('DATABASE', 'IDENTIFIER', 'LBRACE', 'database_1', 'database_2', 'database_3', 'RBRACE')),  # 0
+    ('database_1', ('log_policy',)),  # 1
+    ('database_1', ()),  # 2
+    ('database_2', ('table', 'database_2')),  # 3
+    ('database_2', ('include', 'database_2')),  # 4
+    ('database_2', ()),  # 5
+    ('database_3', ('rest_block',)),  # 6
+    ('database_3', ()),  # 7
+    ('log_policy', ('LOG', 'log_policy_2')),  # 8
+    ('log_policy_1', ('CHECKPOINT', 'NUMBER')),  # 9
+    ('log_policy_1', ()),  # 10
+    ('log_policy_2', ('RETAIN', 'NUMBER', 'log_policy_1')),  # 11
+    ('log_policy_2', ('CHECKPOINT', 'NUMBER')),  # 12
+    ('module', ('module_1', 'module_2')),  # 13
+    ('module_1', ('table', 'module_1')),  # 14
+    ('module_1', ('include', 'module_1')),  # 15
+    ('module_1', ()),  # 16
+    ('module_2', ('rest_block',)),  # 17
+    ('module_2', ()),  # 18
+    ('include', ('INCLUDE', 'STRING_LITERAL')),  # 19
+    ('table', ('TABLE', 'IDENTIFIER', 'LBRACE', 'table_2', 'table_4', 'table_6', 'table_7', 'RBRACE')),  # 20
+    ('table_1', ('COMMA',)),  # 21
+    ('table_1', ()),  # 22
+    ('table_2', ('column', 'table_1', 'table_2')),  # 23
+    ('table_2', ()),  # 24
+    ('table_3', ('COMMA',)),  # 25
+    ('table_3', ()),  # 26
+    ('table_4', ('foreign_key', 'table_3', 'table_4')),  # 27
+    ('table_4', ()),  # 28
+    ('table_5', ('COMMA',)),  # 29
+    ('table_5', ()),  # 30
+    ('table_6', ('index', 'table_5', 'table_6')),  # 31
+    ('table_6', ()),  # 32
+    ('table_7', ('partition',)),  # 33
+    ('table_7', ()),  # 34
+    ('column', ('COLUMN', 'IDENTIFIER', 'datatype', 'column_1')),  # 35
+    ('column_1', ('PK', 'column_1')),  # 36
+    ('column_1', ('NOT_NULL', 'column_1')),  # 37
+    ('column_1', ()),  # 38
+    ('datatype', ('AUTO_ID',)),  # 39
+    ('datatype', ('STRING',)),  # 40
+    ('datatype', ('INTEGER',)),  # 41
+    ('datatype', ('FLOAT',)),  # 42
+    ('datatype', ('BOOLEAN',)),  # 43
+    ('datatype', ('DATE',)),  # 44
+    ('datatype', ('TIMESTAMP',)),  # 45
+    ('foreign_key', ('FK', 'LPAREN', 'IDENTIFIER', 'DOT', 'IDENTIFIER', 'RPAREN')),  # 46
+    ('index', ('INDEX', 'LPAREN', 'IDENTIFIER', 'index_1', 'RPAREN')),  # 47
+    ('index_1', ('COMMA', 'IDENTIFIER', 'index_1')),  # 48
+    ('index_1', ()),  # 49
+    ('partition', ('PARTITION', 'BY', 'partition_2')),  # 50
+    ('partition_1', ('IDENTIFIER',)),  # 51
+    ('partition_1', ()),  # 52
+    ('partition_2', ('RANGE', 'LPAREN', 'IDENTIFIER', 'RPAREN', 'EVERY', 'NUMBER', 'partition_1')),  # 53
+    ('partition_2', ('HASH', 'LPAREN', 'IDENTIFIER', 'RPAREN', 'NUMBER')),  # 54
+    ('rest_block', ('REST', 'LBRACE', 'rest_block_2', 'RBRACE')),  # 55
+    ('rest_block_1', ('COMMA',)),  # 56
+    ('rest_block_1', ()),  # 57
+    ('rest_block_2', ('rest_table', 'rest_block_1', 'rest_block_2')),  # 58
+    ('rest_block_2', ()),  # 59
+    ('rest_table', ('IDENTIFIER', 'LBRACE', 'rest_table_2', 'RBRACE')),  # 60
+    ('rest_table_1', ('COMMA',)),  # 61
+    ('rest_table_1', ()),  # 62
+    ('rest_table_2', ('rest_endpoint', 'rest_table_1', 'rest_table_2')),  # 63
+    ('rest_table_2', ()),  # 64
+    ('rest_endpoint', ('rest_endpoint_1', 'rest_endpoint_5', 'rest_endpoint_6', 'rest_endpoint_7', 'rest_endpoint_8', 'rest_endpoint_9')),  # 65
+    ('rest_endpoint_1', ('GET',)),  # 66
+    ('rest_endpoint_1', ('POST',)),  # 67
+    ('rest_endpoint_1', ('PUT',)),  # 68
+    ('rest_endpoint_1', ('DELETE',)),  # 69
+    ('rest_endpoint_2', ('query_parameters',)),  # 70
+    ('rest_endpoint_2', ()),  # 71
+    ('rest_endpoint_3', ('MAX', 'NUMBER')),  # 72
+    ('rest_endpoint_3', ()),  # 73
+    ('rest_endpoint_4', ('query_parameters',)),  # 74
+    ('rest_endpoint_4', ()),  # 75
+    ('rest_endpoint_5', ('LBRACKET', 'RBRACKET', 'URL', 'rest_endpoint_2', 'rest_endpoint_3')),  # 76
+    ('rest_endpoint_5', ('URL', 'rest_endpoint_4')),  # 77
+    ('rest_endpoint_6', ('returned_columns',)),  # 78
+    ('rest_endpoint_6', ()),  # 79
+    ('rest_endpoint_7', ('pagination',)),  # 80
+    ('rest_endpoint_7', ()),  # 81
+    ('rest_endpoint_8', ('consistency',)),  # 82
+    ('rest_endpoint_8', ()),  # 83
+    ('rest_endpoint_9', ('cache',)),  # 84
+    ('rest_endpoint_9', ()),  # 85
+    ('query_parameters', ('QUESTION_MARK', 'IDENTIFIER', 'query_parameters_1')),  # 86
+    ('query_parameters_1', ('AMPERSAND', 'IDENTIFIER', 'query_parameters_1')),  # 87
+    ('query_parameters_1', ()),  # 88
+    ('returned_columns', ('ARROW', 'returned_column_list')),  # 89
+    ('returned_column_list', ('IDENTIFIER', 'returned_column_list_2')),  # 90
+    ('returned_column_list_1', ('returned_column_list',)),  # 91
+    ('returned_column_list_1', ()),  # 92
+    ('returned_column_list_2', ('COMMA', 'returned_column_list_1')),  # 93
+    ('returned_column_list_2', ()),  # 94
+    ('pagination', ('PAGE', 'NUMBER', 'pagination_1')),  # 95
+    ('pagination_1', ('MAX', 'NUMBER')),  # 96
+    ('pagination_1', ()),  # 97
+    ('consistency', ('CONSISTENCY', 'IDENTIFIER')),  # 98
+    ('cache', ('CACHE', 'NUMBER', 'cache_1')),  # 99
+    ('cache_1', ('MAX', 'NUMBER')),  # 100
+    ('cache_1', ()),  # 101
+)
+
+# Production selected by a rule for the next token
+# COMMA enters the optional or repeated part returned_column_list_2, it can also follow it
+PARSE_TABLE = {
+    'database': {'DATABASE': 0},
+    'database_1': {'INCLUDE': 2, 'TABLE': 2, 'REST': 2, 'LOG': 1, 'RBRACE': 2},
+    'database_2': {'INCLUDE': 4, 'TABLE': 3, 'REST': 5, 'RBRACE': 5},
+    'database_3': {'REST': 6, 'RBRACE': 7},
+    'log_policy': {'LOG': 8},
+    'log_policy_1': {'INCLUDE': 10, 'TABLE': 10, 'REST': 10, 'CHECKPOINT': 9, 'RBRACE': 10},
+    'log_policy_2': {'RETAIN': 11, 'CHECKPOINT': 12},
+    'module': {'INCLUDE': 13, 'TABLE': 13, 'REST': 13, 'END': 13},
+    'module_1': {'INCLUDE': 15, 'TABLE': 14, 'REST': 16, 'END': 16},
+    'module_2': {'REST': 17, 'END': 18},
+    'include': {'INCLUDE': 19},
+    'table': {'TABLE': 20},
+    'table_1': {'COLUMN': 22, 'FK': 22, 'INDEX': 22, 'PARTITION': 22, 'RBRACE': 22, 'COMMA': 21},
+    'table_2': {'COLUMN': 23, 'FK': 24, 'INDEX': 24, 'PARTITION': 24, 'RBRACE': 24},
+    'table_3': {'FK': 26, 'INDEX': 26, 'PARTITION': 26, 'RBRACE': 26, 'COMMA': 25},
+    'table_4': {'FK': 27, 'INDEX': 28, 'PARTITION': 28, 'RBRACE': 28},
+    'table_5': {'INDEX': 30, 'PARTITION': 30, 'RBRACE': 30, 'COMMA': 29},
+    'table_6': {'INDEX': 31, 'PARTITION': 32, 'RBRACE': 32},
+    'table_7': {'PARTITION': 33, 'RBRACE': 34},
+    'column': {'COLUMN': 35},
+    'column_1': {'COLUMN': 38, 'PK': 36, 'FK': 38, 'INDEX': 38, 'NOT_NULL': 37, 'PARTITION': 38, 'RBRACE': 38, 'COMMA': 38},
+    'datatype': {'AUTO_ID': 39, 'STRING': 40, 'INTEGER': 41, 'FLOAT': 42, 'BOOLEAN': 43, 'DATE': 44, 'TIMESTAMP': 45},
+    'foreign_key': {'FK': 46},
+    'index': {'INDEX': 47},
+    'index_1': {'RPAREN': 49, 'COMMA': 48},
+    'partition': {'PARTITION': 50},
+    'partition_1': {'RBRACE': 52, 'IDENTIFIER': 51},
+    'partition_2': {'RANGE': 53, 'HASH': 54},
+    'rest_block': {'REST': 55},
+    'rest_block_1': {'RBRACE': 57, 'IDENTIFIER': 57, 'COMMA': 56},
+    'rest_block_2': {'RBRACE': 59, 'IDENTIFIER': 58},
+    'rest_table': {'IDENTIFIER': 60},
+    'rest_table_1': {'GET': 62, 'POST': 62, 'PUT': 62, 'DELETE': 62, 'RBRACE': 62, 'COMMA': 61},
+    'rest_table_2': {'GET': 63, 'POST': 63, 'PUT': 63, 'DELETE': 63, 'RBRACE': 64},
+    'rest_endpoint': {'GET': 65, 'POST': 65, 'PUT': 65, 'DELETE': 65},
+    'rest_endpoint_1': {'GET': 66, 'POST': 67, 'PUT': 68, 'DELETE': 69},
+    'rest_endpoint_2': {'GET': 71, 'POST': 71, 'PUT': 71, 'DELETE': 71, 'PAGE': 71, 'MAX': 71, 'CONSISTENCY': 71, 'CACHE': 71, 'RBRACE': 71, 'ARROW': 71, 'COMMA': 71, 'QUESTION_MARK': 70},
+    'rest_endpoint_3': {'GET': 73, 'POST': 73, 'PUT': 73, 'DELETE': 73, 'PAGE': 73, 'MAX': 72, 'CONSISTENCY': 73, 'CACHE': 73, 'RBRACE': 73, 'ARROW': 73, 'COMMA': 73},
+    'rest_endpoint_4': {'GET': 75, 'POST': 75, 'PUT': 75, 'DELETE': 75, 'PAGE': 75, 'CONSISTENCY': 75, 'CACHE': 75, 'RBRACE': 75, 'ARROW': 75, 'COMMA': 75, 'QUESTION_MARK': 74},
+    'rest_endpoint_5': {'LBRACKET': 76, 'URL': 77},
+    'rest_endpoint_6': {'GET': 79, 'POST': 79, 'PUT': 79, 'DELETE': 79, 'PAGE': 79, 'CONSISTENCY': 79, 'CACHE': 79, 'RBRACE': 79, 'ARROW': 78, 'COMMA': 79},
+    'rest_endpoint_7': {'GET': 81, 'POST': 81, 'PUT': 81, 'DELETE': 81, 'PAGE': 80, 'CONSISTENCY': 81, 'CACHE': 81, 'RBRACE': 81, 'COMMA': 81},
+    'rest_endpoint_8': {'GET': 83, 'POST': 83, 'PUT': 83, 'DELETE': 83, 'CONSISTENCY': 82, 'CACHE': 83, 'RBRACE': 83, 'COMMA': 83},
+    'rest_endpoint_9': {'GET': 85, 'POST': 85, 'PUT': 85, 'DELETE': 85, 'CACHE': 84, 'RBRACE': 85, 'COMMA': 85},
+    'query_parameters': {'QUESTION_MARK': 86},
+    'query_parameters_1': {'GET': 88, 'POST': 88, 'PUT': 88, 'DELETE': 88, 'PAGE': 88, 'MAX': 88, 'CONSISTENCY': 88, 'CACHE': 88, 'RBRACE': 88, 'ARROW': 88, 'COMMA': 88, 'AMPERSAND': 87},
+    'returned_columns': {'ARROW': 89},
+    'returned_column_list': {'IDENTIFIER': 90},
+    'returned_column_list_1': {'GET': 92, 'POST': 92, 'PUT': 92, 'DELETE': 92, 'PAGE': 92, 'CONSISTENCY': 92, 'CACHE': 92, 'RBRACE': 92, 'IDENTIFIER': 91, 'COMMA': 92},
+    'returned_column_list_2': {'GET': 94, 'POST': 94, 'PUT': 94, 'DELETE': 94, 'PAGE': 94, 'CONSISTENCY': 94, 'CACHE': 94, 'RBRACE': 94, 'COMMA': 93},
+    'pagination': {'PAGE': 95},
+    'pagination_1': {'GET': 97, 'POST': 97, 'PUT': 97, 'DELETE': 97, 'MAX': 96, 'CONSISTENCY': 97, 'CACHE': 97, 'RBRACE': 97, 'COMMA': 97},
+    'consistency': {'CONSISTENCY': 98},
+    'cache': {'CACHE': 99},
+    'cache_1': {'GET': 101, 'POST': 101, 'PUT': 101, 'DELETE': 101, 'MAX': 100, 'RBRACE': 101, 'COMMA': 101},
+}
@@ -1,273 +1,423 @@
 from CompilerFrontend.Lexer.lexer import TokenDefinition
-
-PARSER_VERSION = 1.2
+from CompilerFrontend.Parser.ast_nodes import Database, Table, Column, ForeignKey, RestBlock, RestTable, Endpoint, Include, Module, Index, \
+    LogPolicy, Partition
+from CompilerFrontend.Parser.parse_tables import START_SYMBOLS, END_OF_INPUT, PRODUCTIONS, PARSE_TABLE
+
+PARSER_VERSION = 2.0
+
+# Integer kinds of the tokens in the declaration order of TokenDefinition, looked up by the name of the token type.
+# The kind after the last token is the end of the input.
+TOKEN_KINDS = {token.name: kind for kind, token in enumerate(TokenDefinition)}
+TOKEN_NAMES = tuple(TOKEN_KINDS) + (END_OF_INPUT,)
+END = len(TOKEN_KINDS)
+
+# Tokens whose values are kept for the actions of the rules, all other tokens are only matched
+VALUE_TOKENS = frozenset((
+    TokenDefinition.IDENTIFIER, TokenDefinition.NUMBER, TokenDefinition.URL, TokenDefinition.STRING_LITERAL,
+    TokenDefinition.STRING, TokenDefinition.INTEGER, TokenDefinition.FLOAT, TokenDefinition.BOOLEAN, TokenDefinition.DATE,
+    TokenDefinition.TIMESTAMP, TokenDefinition.AUTO_ID, TokenDefinition.PK, TokenDefinition.NOT_NULL,
+    TokenDefinition.GET, TokenDefinition.POST, TokenDefinition.PUT, TokenDefinition.DELETE, TokenDefinition.LBRACKET,
+    TokenDefinition.MAX, TokenDefinition.RETAIN, TokenDefinition.CHECKPOINT, TokenDefinition.RANGE, TokenDefinition.HASH,
+    TokenDefinition.ARROW, TokenDefinition.PAGE, TokenDefinition.CONSISTENCY, TokenDefinition.CACHE,
+))
+VALUE_KINDS = tuple(token in VALUE_TOKENS for token in TokenDefinition) + (False,)
+
+# Options of an endpoint which only get endpoints can have, by the name of their keyword token
+GET_ONLY_OPTIONS = {
+    'ARROW': "can return selected columns",
+    'PAGE': "can be paginated",
+    'CONSISTENCY': "have a read consistency level",
+    'CACHE': "can be cached",
+}
+
+def describe_token(token):
+    """
+    Describes a token and its location for error messages
+
+    :param token: The token, None at the end of input
+    :return: The value of the token with line and column, if the Lexer provided them
+    """
+    if token is None:
+        return "end of input"
+    description = repr(token[1])
+    if len(token) > 3:
+        description += f" at line {token[2]}, column {token[3]}"
+    return description
 
 class Parser:
     def __init__(self, tokens):
         """
-        Initializes the Parser with a list of tokens.
-
-        :param tokens: A list of tokens generated by the Lexer
-        """
-        self.tokens = tokens
-        self.current_token_index = 0  # Index of the current token being processed
-        self.current_token = self.tokens[self.current_token_index]  # The current token
-
-    def _advance(self):
-        """
-        Moves to the next token in the list of tokens.
-        Updates the current token to the next one in the sequence.
-        """
+        Initializes the Parser with the tokens of the Lexer.
+        The Parser is driven by the parse tables generated from DSL/forgeapi-grammar.ebnf, see parser_generator.py.
 
-        self.current_token_index += 1  # Move to the next token index
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]  # Update the current token
-        else:
-            self.current_token = None  # End of input reached
-
-    def _expect(self, *expected_tokens):
-        """
-        Checks if the current token matches one of the expected tokens.
-        If it matches, returns the token's value and advances to the next token.
-        If it does not match, raises a SyntaxError.
-
-        :param expected_tokens: A list of expected token types to match
-        :return: The value of the token if it matches the expected token type
+        :param tokens: A list of tokens or a token generator (Lexer.generate_tokens) for streaming
         """
-        current_token = self.current_token[0]  # Get the type of the current token
-
-        # Check if the current token matches any of the expected tokens
-        if current_token in expected_tokens:
-            token_value = self.current_token[1]  # Get the value of the token
-            self._advance()  # Move to the next token
-            return token_value
-        else:
-            # Raise a SyntaxError with information about the expected and actual tokens
-            expected_names = ', '.join([repr(token) for token in expected_tokens])
-            raise SyntaxError(f"Expected one of {expected_names}, but found {repr(self.current_token[1])}")
-
+        self.tokens = iter(tokens)  # Tokens are pulled one at a time, so a generator is never materialized
 
     def parse(self):
         """
         The main parsing function that starts the parsing process based on the grammar.
-        
-        :return: AST (Abstract Syntax Tree) representation of the parsed code
-        """
-        return self._parse_forge_api()
-
-    # Parsing functions for each grammar rule
 
-    def _parse_forge_api(self):
+        :return: AST (Abstract Syntax Tree) representation of the parsed code as a Database node
         """
-        Parses a database definition.
+        return self._parse(SYMBOLS['database'])
 
-        :return: A dictionary representing the database definition
+    def parse_module(self):
         """
-        self._expect(TokenDefinition.DATABASE)  # Expect 'DATABASE'
-        dbname = self._expect(TokenDefinition.IDENTIFIER)  # Expect database name
-        self._expect(TokenDefinition.LBRACE)  # Expect '{'
-
-        tables = []  # List to hold table definitions
-        while self.current_token[0] == TokenDefinition.TABLE:
-            tables.append(self._parse_table())  # Parse tables and add to the list
-
-        rest_block = None
-        if self.current_token[0] == TokenDefinition.REST:
-            rest_block = self._parse_rest_block()  # Parse REST block if present
-
-        self._expect(TokenDefinition.RBRACE)  # Expect '}'
-        return {
-            "type": "database",
-            "name": dbname,
-            "tables": tables,
-            "rest_block": rest_block
-        }
-
-    def _parse_table(self):
-        """
-        Parses a table definition.
+        Parses a module file included by a database definition.
 
-        :return: A dictionary representing the table definition.
-        """
-        self._expect(TokenDefinition.TABLE)  # Expect 'TABLE'
-        tablename = self._expect(TokenDefinition.IDENTIFIER)  # Expect table name
-        self._expect(TokenDefinition.LBRACE)  # Expect '{'
-
-        columns = []  # List to hold column definitions
-        while self.current_token[0] == TokenDefinition.COLUMN:
-            columns.append(self._parse_column())  # Parse columns and add to the list
-            if self.current_token[0] == TokenDefinition.COMMA:
-                self._advance()  # Consume the comma
-
-        foreign_keys = []  # List to hold foreign key definitions
-        while self.current_token[0] == TokenDefinition.FK:
-            foreign_keys.append(self._parse_foreign_key())  # Parse foreign keys and add to the list
-            if self.current_token[0] == TokenDefinition.COMMA:
-                self._advance()  # Consume the comma
-
-        self._expect(TokenDefinition.RBRACE)  # Expect '}'
-        return {
-            "type": "table",
-            "name": tablename,
-            "columns": columns,
-            "foreign_keys": foreign_keys
-        }
-
-    def _parse_column(self):
+        :return: AST representation of the parsed module as a Module node
         """
-        Parses a column definition.
+        return self._parse(SYMBOLS['module'])
 
-        :return: A dictionary representing the column definition.
-        """
-        self._expect(TokenDefinition.COLUMN)  # Expect 'COLUMN'
-        columnname = self._expect(TokenDefinition.IDENTIFIER)  # Expect column name
-        datatype = self._parse_datatype()  # Parse datatype (e.g., string(100) or integer)
-
-        # Initialize optional attributes
-        primary_key = False
-        not_null = False
-
-        # Check for optional attributes like PK, FK, and NOT NULL
-        while self.current_token[0] in (TokenDefinition.PK, TokenDefinition.FK, TokenDefinition.NOT_NULL):
-            if self.current_token[0] == TokenDefinition.PK:
-                primary_key = True
-                self._advance()  # Consume 'PK'
-            elif self.current_token[0] == TokenDefinition.NOT_NULL:
-                not_null = True
-                self._advance()  # Consume 'NOT NULL'
-        return {
-            "type": "column",
-            "name": columnname,
-            "datatype": datatype,
-            "primary_key": primary_key,
-            "not_null": not_null
-        }
-
-    def _parse_datatype(self):
+    def _parse(self, start_symbol):
         """
-        Parses the datatype of a column, including possible size for string types
-
-        :return: The datatype of the column as a string
+        Parses the tokens with an explicit stack of symbols instead of recursion.
+        A rule on top of the stack is replaced by the expansion the parse table selects for the next token, which already
+        consumes that token if it starts the expansion. A token on top of the stack must be the next token.
+        A rule with an action pushes a reduce marker below its production, which passes the values of the tokens
+        and rules of the production to the action.
+
+        :param start_symbol: Symbol of the rule matching the whole input
+        :return: The node created by the action of the start rule
         """
-
-        # Check if there is a current token available for parsing
-        if not self.current_token:
-            raise SyntaxError("No current token available for parsing.")
-
-        datatype_token = self.current_token[0]  # Get the type of the current token
-
-        # Check if the datatype is valid
-        if datatype_token in (TokenDefinition.STRING, TokenDefinition.INTEGER, TokenDefinition.FLOAT,
-                            TokenDefinition.BOOLEAN, TokenDefinition.DATE, TokenDefinition.TIMESTAMP,
-                            TokenDefinition.AUTO_ID):  # Include AUTO_ID here
-
-            # Consume the datatype token and get its value
-            datatype_value = self._expect(datatype_token)  # This should get the value of the datatype token
-
-            # Check if it's a datatype that requires parentheses, like string(100)
-            if datatype_token == TokenDefinition.STRING and self.current_token and self.current_token[0] == TokenDefinition.LPAREN:
-                self._expect(TokenDefinition.LPAREN)  # Expect '('
-                size = self._expect(TokenDefinition.NUMBER)  # Expect a number inside the parentheses
-                self._expect(TokenDefinition.RPAREN)  # Expect ')'
-                datatype = f"{datatype_value}({size})"  # Format datatype with size
+        tokens = self.tokens
+        kinds = TOKEN_KINDS
+        rows = EXPANSIONS
+        value_kinds = VALUE_KINDS
+        actions = REDUCE_ACTIONS
+
+        stack = [start_symbol]
+        pop = stack.pop
+        push_symbols = stack.extend
+        values = []  # Values of the matched tokens and reduced rules which are not yet passed to an action
+        push_value = values.append
+        marks = []  # Positions in values at which the values of the rules on the stack start
+
+        token = next(tokens, None)
+        kind = END if token is None else kinds[token[0]._name_]
+        while stack:
+            symbol = pop()
+            if symbol > END:
+                # Rule: replace it by its expansion for the next token, an empty expansion only removes the rule
+                entry = rows[symbol][kind]
+                if entry:
+                    expansion, mark_count, consumes = entry
+                    if mark_count:
+                        marks += [len(values)] * mark_count
+                    push_symbols(expansion)
+                    if consumes:
+                        if value_kinds[kind]:
+                            push_value(token)
+                        token = next(tokens, None)
+                        kind = END if token is None else kinds[token[0]._name_]
+                elif entry is None:
+                    self._raise_unexpected(token, [expected for expected in range(END + 1) if rows[symbol][expected] is not None])
+            elif symbol >= 0:
+                # Token: match it and move to the next token
+                if symbol != kind:
+                    self._raise_unexpected(token, [symbol])
+                if value_kinds[kind]:
+                    push_value(token)
+                token = next(tokens, None)
+                kind = END if token is None else kinds[token[0]._name_]
             else:
-                datatype = datatype_value
-
-            return datatype
-        else:
-            raise SyntaxError(f"Expected a valid datatype, but found {self.current_token[1]}")
-
-    def _parse_foreign_key(self):
-        """
-        Parses a foreign key definition.
-
-        :return: A dictionary representing the foreign key definition
-        """
-        self._expect(TokenDefinition.FK)  # Expect 'FK'
-        self._expect(TokenDefinition.LPAREN)  # Expect '('
-        referenced_table = self._expect(TokenDefinition.IDENTIFIER)  # Expect referenced table
-        self._expect(TokenDefinition.DOT)  # Expect '.'
-        referenced_column = self._expect(TokenDefinition.IDENTIFIER)  # Expect referenced column
-        self._expect(TokenDefinition.RPAREN)  # Expect ')'
-        return {
-            "type": "foreign_key",
-            "table": referenced_table,
-            "column": referenced_column
-        }
-
-    def _parse_rest_block(self):
-        """
-        Parses a REST definition.
-
-        :return: A dictionary representing the REST definition
-        """
-        self._expect(TokenDefinition.REST)  # Expect 'REST'
-        self._expect(TokenDefinition.LBRACE)  # Expect '{'
-
-        rest_tables = []  # List to hold REST table definitions
-
-        while self.current_token and self.current_token[0] != TokenDefinition.RBRACE:
-            rest_tables.append(self._parse_rest_table())  # Parse REST tables and add to the list
-            
-            # Check if there's a comma after the current table and consume it
-            if self.current_token and self.current_token[0] == TokenDefinition.COMMA:
-                self._advance()  # Consume the comma
-
-        self._expect(TokenDefinition.RBRACE)  # Expect '}'
-        return {
-            "type": "rest",
-            "tables": rest_tables
-        }
-
-    def _parse_rest_table(self):
+                # Reduce marker: pass the values of the production to the action of its rule
+                start = marks.pop()
+                children = values[start:]
+                del values[start:]
+                push_value(actions[~symbol](children))
+
+        if token is not None:
+            self._raise_unexpected(token, [END])
+        return values[0]
+
+    @staticmethod
+    def _raise_unexpected(token, expected_kinds):
         """
-        Parses a single table block within the REST block.
+        Raises a SyntaxError for a token which the grammar does not allow at its position.
 
-        :return: A dictionary representing the REST table definition
+        :param token: The unexpected token, None at the end of input
+        :param expected_kinds: The kinds of the tokens allowed at the position
         """
-        table_name = self._expect(TokenDefinition.IDENTIFIER)  # Expect table name
-        self._expect(TokenDefinition.LBRACE)  # Expect '{'
-
-        endpoints = []  # List to hold REST endpoints
-
-        while self.current_token and self.current_token[0] in (TokenDefinition.GET, TokenDefinition.POST, TokenDefinition.PUT, TokenDefinition.DELETE):
-            endpoints.append(self._parse_rest_endpoint(table_name))  # Parse REST endpoints and add to the list
-            
-            # Check if there's a comma after the current endpoint and consume it
-            if self.current_token and self.current_token[0] == TokenDefinition.COMMA:
-                self._advance()  # Consume the comma
-
-        self._expect(TokenDefinition.RBRACE)  # Expect '}'
-        return {
-            "table": table_name,
-            "endpoints": endpoints
-        }
-
-    def _parse_rest_endpoint(self, table_name):
+        expected_names = ', '.join("end of input" if kind == END else repr(TokenDefinition[TOKEN_NAMES[kind]])
+                                   for kind in expected_kinds)
+        raise SyntaxError(f"Expected one of {expected_names}, but found {describe_token(token)}")
+
+# Actions of the rules, they create the nodes of the AST from the values of their productions.
+# Values are the matched tokens and the results of the actions of nested rules, rules without an action
+# (e.g. the helper rules of optional and repeated parts) leave their values to the enclosing rule.
+# Token types are compared by name, an attribute of the TokenDefinition class is an expensive lookup.
+
+def _reduce_database(children):
+    """
+    Creates the Database node from its name, the optional log policy, its tables and includes and the optional REST block
+
+    :param children: Values of the database rule
+    :return: A Database node
+    """
+    tables = []
+    rest_block = None
+    log_policy = None
+    for node in children[1:]:
+        if node.type == 'log_policy':
+            log_policy = node
+        elif node.type == 'rest':
+            rest_block = node
+        else:
+            tables.append(node)
+    return Database(children[0][1], tuple(tables), rest_block, log_policy)
+
+def _reduce_module(children):
+    """
+    Creates the Module node from its tables and includes and the optional REST block
+
+    :param children: Values of the module rule
+    :return: A Module node
+    """
+    if children and children[-1].type == 'rest':
+        return Module(tuple(children[:-1]), children[-1])
+    return Module(tuple(children))
+
+def _reduce_log_policy(children):
+    """
+    Creates the LogPolicy node from the RETAIN and CHECKPOINT keywords and their numbers
+
+    :param children: Values of the log_policy rule
+    :return: A LogPolicy node
+    """
+    settings = {keyword[0]._name_: int(number[1]) for keyword, number in zip(children[::2], children[1::2])}
+    return LogPolicy(settings.get('RETAIN'), settings.get('CHECKPOINT'))
+
+def _reduce_include(children):
+    """
+    Creates the Include node with the path of the module as written in the source
+
+    :param children: Values of the include rule
+    :return: An Include node
+    """
+    return Include(children[0][1][1:-1])
+
+def _reduce_table(children):
+    """
+    Creates the Table node from its name, columns, foreign keys, indexes and the optional partitioning
+
+    :param children: Values of the table rule
+    :return: A Table node
+    """
+    columns = []
+    foreign_keys = []
+    indexes = []
+    partition = None
+    for node in children[1:]:
+        if node.type == 'column':
+            columns.append(node)
+        elif node.type == 'foreign_key':
+            foreign_keys.append(node)
+        elif node.type == 'index':
+            indexes.append(node)
+        else:
+            partition = node
+    return Table(children[0][1], tuple(columns), tuple(foreign_keys), tuple(indexes), partition)
+
+def _reduce_column(children):
+    """
+    Creates the Column node from its name, datatype and the PK and NOT NULL attributes
+
+    :param children: Values of the column rule
+    :return: A Column node
+    """
+    primary_key = False
+    not_null = False
+    for token in children[2:]:
+        if token[0]._name_ == 'PK':
+            primary_key = True
+        else:
+            not_null = True
+    return Column(children[0][1], children[1][1], primary_key, not_null)
+
+def _reduce_foreign_key(children):
+    """
+    Creates the ForeignKey node from the referenced table and column
+
+    :param children: Values of the foreign_key rule
+    :return: A ForeignKey node
+    """
+    return ForeignKey(children[0][1], children[1][1])
+
+def _reduce_index(children):
+    """
+    Creates the Index node with the indexed columns in their order
+
+    :param children: Values of the index rule
+    :return: An Index node
+    """
+    return Index(tuple(token[1] for token in children))
+
+def _reduce_partition(children):
+    """
+    Creates the Partition node from the partitioning method, the column and the number of hash partitions
+    or the width and optional unit of range partitions
+
+    :param children: Values of the partition rule
+    :return: A Partition node
+    """
+    method = children[0][1].lower()
+    column = children[1][1]
+    if method == 'hash':
+        return Partition(method, column, partitions=int(children[2][1]))
+    unit = children[3][1] if len(children) > 3 else None
+    return Partition(method, column, interval=int(children[2][1]), unit=unit)
+
+def _reduce_rest_block(children):
+    """
+    Creates the RestBlock node from its REST tables
+
+    :param children: Values of the rest_block rule
+    :return: A RestBlock node
+    """
+    return RestBlock(tuple(children))
+
+def _reduce_rest_table(children):
+    """
+    Creates the RestTable node and the Endpoint nodes of its table
+
+    :param children: Values of the rest_table rule: the table name and the fields of the endpoints
+    :return: A RestTable node
+    """
+    table_name = children[0][1]
+    return RestTable(table_name, tuple(Endpoint(table_name, *fields) for fields in children[1:]))
+
+def _reduce_rest_endpoint(children):
+    """
+    Collects the fields of a REST endpoint, its table is added by the enclosing rest_table rule.
+    The grammar allows the options after every method, only post endpoints can insert batches
+    and only get endpoints can return selected columns, be paginated, have a consistency level and be cached.
+
+    :param children: Values of the rest_endpoint rule
+    :return: Tuple of the Endpoint fields after the table name
+    """
+    method = children[0][1]
+    url = None
+    query_params = []
+    columns = []
+    page_size = None
+    max_page_size = None
+    consistency = 'quorum'
+    batch = False
+    max_batch_size = None
+    cache_ttl = None
+    cache_size = None
+
+    section = 'URL'  # Name of the keyword of the part the identifiers and numbers belong to
+    maximum = False  # Whether the next number follows MAX
+    for token in children[1:]:
+        token_name = token[0]._name_
+        if token_name == 'IDENTIFIER':
+            if section == 'ARROW':
+                columns.append(token[1])
+            elif section == 'CONSISTENCY':
+                consistency = token[1]
+            else:
+                query_params.append(token[1])
+        elif token_name == 'URL':
+            url = token[1]
+        elif token_name == 'NUMBER':
+            number = int(token[1])
+            if section == 'PAGE':
+                if maximum:
+                    max_page_size = number
+                else:
+                    page_size = number
+            elif section == 'CACHE':
+                if maximum:
+                    cache_size = number
+                else:
+                    cache_ttl = number
+            else:
+                max_batch_size = number
+        elif token_name == 'MAX':
+            maximum = True
+        elif token_name == 'LBRACKET':
+            if method != 'post':
+                raise SyntaxError(f"Only post endpoints can insert batches, but {method} is followed by {describe_token(token)}")
+            batch = True
+        else:
+            if method != 'get':
+                raise SyntaxError(f"Only get endpoints {GET_ONLY_OPTIONS[token_name]}, but {method} {url} is followed by {describe_token(token)}")
+            section = token_name
+            maximum = False
+
+    return (method, url, tuple(query_params), tuple(columns), page_size, max_page_size, consistency,
+            batch, max_batch_size, cache_ttl, cache_size)
+
+# Rules of the grammar mapped to their actions
+RULE_ACTIONS = {
+    'database': _reduce_database,
+    'module': _reduce_module,
+    'log_policy': _reduce_log_policy,
+    'include': _reduce_include,
+    'table': _reduce_table,
+    'column': _reduce_column,
+    'foreign_key': _reduce_foreign_key,
+    'index': _reduce_index,
+    'partition': _reduce_partition,
+    'rest_block': _reduce_rest_block,
+    'rest_table': _reduce_rest_table,
+    'rest_endpoint': _reduce_rest_endpoint,
+}
+
+def _build_expansions():
+    """
+    Converts the generated parse tables to integer symbols: token kinds are 0 to END, rules are numbered after END
+    and the reduce marker of the rule at index i is ~i.
+    The expansion of a rule for a token continues into the expansions of the rules its production starts with,
+    up to the token itself, so the parse loop replaces a chain of rules and matches the token in one step.
+
+    :return: Tuple of the rule symbols by name, the expansion rows indexed by symbol and the actions indexed by ~marker
+    """
+    for rule in RULE_ACTIONS:
+        if rule not in PARSE_TABLE:
+            raise ValueError(f"Action of rule '{rule}' which is not in the parse tables, regenerate them with parser_generator.py")
+    for rule in START_SYMBOLS:
+        if rule not in RULE_ACTIONS:
+            raise ValueError(f"Start rule '{rule}' has no action")
+
+    rules = tuple(PARSE_TABLE)
+    symbols = {rule: END + 1 + index for index, rule in enumerate(rules)}
+    symbols.update((name, kind) for kind, name in enumerate(TOKEN_NAMES))
+    actions = tuple(RULE_ACTIONS.get(rule) for rule in rules)
+
+    def expand(rule, token_name):
         """
-        Parses a single REST endpoint definition, including HTTP method and URL.
-
-        :param table_name: The name of the table associated with the endpoint
-        :return: A dictionary representing the REST endpoint definition
+        :return: Tuple of the symbols to push, the number of rules with an action started by them
+                 and whether the token is consumed
         """
-        method = self._expect(TokenDefinition.GET, TokenDefinition.POST, TokenDefinition.PUT, TokenDefinition.DELETE)  # HTTP method
-        url = self._expect(TokenDefinition.URL)  # URL path
-        
-        # Optionally, handle URL parameters (e.g., /employees?first_name&last_name)
-        query_params = []
-        if self.current_token and self.current_token[0] == TokenDefinition.QUESTION_MARK:
-            self._advance()  # Consume '?'
-            query_params.append(self._expect(TokenDefinition.IDENTIFIER))  # Expect first query parameter
-
-            # Consume additional parameters, separated by '&'
-            while self.current_token and self.current_token[0] == TokenDefinition.AMPERSAND:
-                self._advance()  # Consume '&'
-                query_params.append(self._expect(TokenDefinition.IDENTIFIER))  # Expect next query parameter
-
-        return {
-            "type": "endpoint",
-            "table": table_name,  # Include the table name
-            "method": method,
-            "url": url,
-            "query_params": query_params
-        }
+        production_symbols = PRODUCTIONS[PARSE_TABLE[rule][token_name]][1]
+        expansion = [~rules.index(rule)] if rule in RULE_ACTIONS else []
+        mark_count = len(expansion)
+        # Productions are pushed in reverse order, so their first symbol is on top of the stack
+        expansion.extend(symbols[symbol] for symbol in reversed(production_symbols[1:]))
+        if not production_symbols:
+            return tuple(expansion), mark_count, False
+        first = production_symbols[0]
+        if first not in PARSE_TABLE:
+            if first != token_name:
+                raise ValueError(f"Production of rule '{rule}' for {token_name} starts with {first}, regenerate the parse tables")
+            return tuple(expansion), mark_count, True
+        if token_name not in PARSE_TABLE[first]:
+            expansion.append(symbols[first])  # The parse loop reports the unexpected token
+            return tuple(expansion), mark_count, False
+        first_expansion, first_mark_count, consumes = expand(first, token_name)
+        return tuple(expansion) + first_expansion, mark_count + first_mark_count, consumes
+
+    rows = [None] * (END + 1)
+    for rule in rules:
+        row = [None] * (END + 1)
+        for token_name in PARSE_TABLE[rule]:
+            entry = expand(rule, token_name)
+            row[symbols[token_name]] = entry if entry != ((), 0, False) else ()
+        rows.append(tuple(row))
+    return symbols, tuple(rows), actions
+
+SYMBOLS, EXPANSIONS, REDUCE_ACTIONS = _build_expansions()
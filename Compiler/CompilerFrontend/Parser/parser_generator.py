@@ -0,0 +1,397 @@
+import argparse
+import os
+import re
+import sys
+from CompilerFrontend.Lexer.lexer import Lexer, SKIPPED_TOKENS
+from CompilerFrontend.Lexer.token_definition import TokenDefinition
+
+PARSER_GENERATOR_VERSION = '1.0'
+
+# The grammar of the DSL and the parse tables generated from it
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'DSL', 'forgeapi-grammar.ebnf')
+PARSE_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parse_tables.py')
+
+# Rules the parser starts with: the source file of a database and an included module
+START_SYMBOLS = ('database', 'module')
+
+# Rules of the grammar which are single tokens of the lexer, their definitions in the grammar are not parsed
+TOKEN_RULES = {
+    'identifier': TokenDefinition.IDENTIFIER.name,
+    'length': TokenDefinition.NUMBER.name,
+    'url': TokenDefinition.URL.name,
+    'string_literal': TokenDefinition.STRING_LITERAL.name,
+    'string_datatype': TokenDefinition.STRING.name,
+}
+
+# Terminal of the end of the input, follows the start symbols
+END_OF_INPUT = 'END'
+
+# Start of a rule definition at the beginning of a line
+RULE_PATTERN = re.compile(r'^([a-z_][a-z_0-9]*)\s*::=', re.MULTILINE)
+
+# Tokens of the EBNF notation: rule names, quoted terminals and operators, comments are skipped
+EBNF_TOKEN_PATTERN = re.compile(r'\s+|//[^\n]*|(?P<name>[a-z_][a-z_0-9]*)|(?P<literal>"[^"\n]*"|\'[^\'\n]*\')|(?P<operator>[|()?*+])')
+
+class ParserGenerator:
+    """
+    Generates the parse tables of the table-driven LL(1) Parser from the EBNF grammar of the DSL.
+
+    The rules reachable from the start symbols are converted to productions: optional, repeated and grouped parts
+    become helper rules named after their rule, rules which only rename a single symbol are replaced by it.
+    The FIRST and FOLLOW sets of the rules select the production of a rule for each next token.
+    A grammar in which a token could select two productions is rejected, except for an optional or repeated part
+    whose first token can also follow it: the part is entered, like a hand-written parser would do.
+
+    - Parameters:
+      grammar_text: str - The EBNF grammar.
+    """
+    def __init__(self, grammar_text):
+        self.grammar_text = grammar_text
+        self.definitions = {}  # Rule names mapped to the text of their definitions
+        self.symbols = {}  # Converted rule names mapped to the symbol replacing them in productions
+        self.productions = []  # List of (rule, symbols) tuples, symbols are rule and token names
+        self.helper_rules = {}  # Rule names mapped to the names of their helper rules
+        self.conflicts = []  # List of (rule, token) tuples resolved by entering the optional or repeated part
+
+    def generate(self):
+        """
+        Generate the parse tables
+        :return: The Python module with the productions and the parse table
+        """
+        self.definitions = self._split_rules()
+        for start_symbol in START_SYMBOLS:
+            if start_symbol not in self.definitions:
+                raise ValueError(f"Grammar has no start rule '{start_symbol}'.")
+            self._convert_rule(start_symbol)
+        rules = self._ordered_rules()
+        parse_table = self._build_parse_table(rules)
+        return self._render(rules, parse_table)
+
+    def _split_rules(self):
+        """
+        Split the grammar into the definitions of its rules
+        :return: Dictionary mapping the rule names to the text of their definitions
+        """
+        definitions = {}
+        matches = list(RULE_PATTERN.finditer(self.grammar_text))
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            name = match.group(1)
+            if name in definitions:
+                raise ValueError(f"Rule '{name}' is defined twice.")
+            end = next_match.start() if next_match else len(self.grammar_text)
+            definitions[name] = self.grammar_text[match.end():end]
+        for name in TOKEN_RULES:
+            if name not in definitions:
+                raise ValueError(f"Grammar has no rule '{name}' of the token {TOKEN_RULES[name]}.")
+        return definitions
+
+    def _tokenize_definition(self, name):
+        """
+        Split the definition of a rule into EBNF tokens
+        :param name: Name of the rule
+        :return: List of (kind, text) tuples, kind is name, literal or operator
+        """
+        definition = self.definitions[name]
+        tokens = []
+        position = 0
+        while position < len(definition):
+            match = EBNF_TOKEN_PATTERN.match(definition, position)
+            if not match:
+                raise ValueError(f"Unexpected {definition[position]!r} in the definition of rule '{name}'.")
+            if match.lastgroup:
+                tokens.append((match.lastgroup, match.group(0)))
+            position = match.end()
+        return tokens
+
+    def _parse_definition(self, name):
+        """
+        Parse the definition of a rule into nested alternatives
+        :param name: Name of the rule
+        :return: List of alternatives, each a list of items: ('symbol', name), ('literal', text) or (operator, alternatives)
+        """
+        tokens = self._tokenize_definition(name)
+        position = 0
+
+        def parse_alternatives():
+            nonlocal position
+            alternatives = [parse_sequence()]
+            while position < len(tokens) and tokens[position] == ('operator', '|'):
+                position += 1
+                alternatives.append(parse_sequence())
+            return alternatives
+
+        def parse_sequence():
+            nonlocal position
+            items = []
+            while position < len(tokens) and tokens[position] not in (('operator', '|'), ('operator', ')')):
+                kind, text = tokens[position]
+                position += 1
+                if kind == 'name':
+                    item = ('symbol', text)
+                elif kind == 'literal':
+                    item = ('literal', text[1:-1])
+                elif text == '(':
+                    item = ('group', parse_alternatives())
+                    if position >= len(tokens) or tokens[position] != ('operator', ')'):
+                        raise ValueError(f"Missing ')' in the definition of rule '{name}'.")
+                    position += 1
+                else:
+                    raise ValueError(f"Unexpected '{text}' in the definition of rule '{name}'.")
+                while position < len(tokens) and tokens[position][1] in ('?', '*', '+'):
+                    item = (tokens[position][1], [[item]])
+                    position += 1
+                items.append(item)
+            if not items:
+                raise ValueError(f"Empty alternative in the definition of rule '{name}'.")
+            return items
+
+        alternatives = parse_alternatives()
+        if position < len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position][1]}' in the definition of rule '{name}'.")
+        return alternatives
+
+    def _convert_rule(self, name):
+        """
+        Convert a rule and the rules it references to productions
+        :param name: Name of the rule
+        :return: The symbol replacing the rule in productions: its name, a token name or the symbol it renames
+        """
+        if name in TOKEN_RULES:
+            return TOKEN_RULES[name]
+        if name in self.symbols:
+            return self.symbols[name]
+        if name not in self.definitions:
+            raise ValueError(f"Rule '{name}' is not defined.")
+        self.symbols[name] = name  # A recursive reference is a reference to the rule itself
+        self.helper_rules[name] = []
+        alternatives = [self._convert_sequence(name, sequence) for sequence in self._parse_definition(name)]
+        if len(alternatives) == 1 and len(alternatives[0]) == 1 and alternatives[0][0] != name and not self.helper_rules[name]:
+            self.symbols[name] = alternatives[0][0]  # The rule only renames a symbol, e.g. tablename ::= identifier
+        else:
+            self.productions.extend((name, tuple(symbols)) for symbols in alternatives)
+        return self.symbols[name]
+
+    def _convert_sequence(self, rule, items):
+        """
+        Convert a sequence of EBNF items to the symbols of a production
+        :param rule: Name of the rule containing the sequence, helper rules are named after it
+        :param items: List of items of the sequence
+        :return: List of symbols
+        """
+        symbols = []
+        for kind, content in items:
+            if kind == 'symbol':
+                symbols.append(self._convert_rule(content))
+            elif kind == 'literal':
+                symbols.append(self._literal_token(content))
+            elif kind == 'group' and len(content) == 1:
+                symbols.extend(self._convert_sequence(rule, content[0]))  # A group without alternatives is inlined
+            elif kind == 'group':
+                symbols.append(self._add_helper_rule(rule, [self._convert_sequence(rule, sequence) for sequence in content]))
+            else:
+                # The alternatives of an optional or repeated group become the alternatives of its helper rule
+                part = content[0][0]
+                parts = [self._convert_sequence(rule, sequence) for sequence in (part[1] if part[0] == 'group' else [[part]])]
+                if kind == '?':
+                    symbols.append(self._add_helper_rule(rule, parts + [[]]))
+                    continue
+                if kind == '+' and len(parts) > 1:
+                    parts = [[self._add_helper_rule(rule, parts)]]
+                helper = self._add_helper_rule(rule, None)
+                self.productions.extend((helper, tuple(part_symbols) + (helper,)) for part_symbols in parts)
+                self.productions.append((helper, ()))
+                symbols.extend(parts[0] + [helper] if kind == '+' else [helper])
+        return symbols
+
+    def _add_helper_rule(self, rule, alternatives):
+        """
+        Add a helper rule for an optional, repeated or grouped part of a rule
+        :param rule: Name of the rule containing the part
+        :param alternatives: List of the symbol lists of the alternatives, None to add the productions later
+        :return: Name of the helper rule
+        """
+        helper = f"{rule}_{len(self.helper_rules[rule]) + 1}"
+        self.helper_rules[rule].append(helper)
+        for symbols in alternatives or []:
+            self.productions.append((helper, tuple(symbols)))
+        return helper
+
+    def _literal_token(self, literal):
+        """
+        Get the token of a quoted terminal, the lexer must read the terminal as one keyword or symbol
+        :param literal: The terminal without quotes
+        :return: Name of the token
+        """
+        try:
+            tokens = list(Lexer(literal).generate_tokens())
+        except ValueError:
+            tokens = []
+        if len(tokens) != 1 or tokens[0].value != literal:
+            raise ValueError(f"Terminal \"{literal}\" is not a single token of the lexer.")
+        token = tokens[0].type
+        if token.name in TOKEN_RULES.values() or token in SKIPPED_TOKENS:
+            raise ValueError(f"Terminal \"{literal}\" is read as {token.name} by the lexer, not as a keyword or symbol.")
+        return token.name
+
+    def _ordered_rules(self):
+        """
+        Order the converted rules like their definitions, each followed by its helper rules
+        :return: List of rule names
+        """
+        rules = []
+        for name in self.definitions:
+            if self.symbols.get(name) == name:
+                rules.append(name)
+                rules.extend(self.helper_rules[name])
+        return rules
+
+    def _build_parse_table(self, rules):
+        """
+        Compute the FIRST and FOLLOW sets and select the production of every rule for every next token
+        :param rules: List of rule names
+        :return: Dictionary mapping the rule names to dictionaries mapping token names to production indices
+        """
+        nullable = set()
+        first = {rule: set() for rule in rules}
+        follow = {rule: set() for rule in rules}
+        for start_symbol in START_SYMBOLS:
+            follow[start_symbol].add(END_OF_INPUT)
+
+        def sequence_first(symbols):
+            tokens = set()
+            for symbol in symbols:
+                if symbol not in first:
+                    tokens.add(symbol)
+                    return tokens, False
+                tokens |= first[symbol]
+                if symbol not in nullable:
+                    return tokens, False
+            return tokens, True
+
+        changed = True
+        while changed:
+            changed = False
+            for rule, symbols in self.productions:
+                tokens, is_nullable = sequence_first(symbols)
+                if not tokens <= first[rule] or (is_nullable and rule not in nullable):
+                    first[rule] |= tokens
+                    if is_nullable:
+                        nullable.add(rule)
+                    changed = True
+                for position, symbol in enumerate(symbols):
+                    if symbol not in follow:
+                        continue
+                    tokens, is_nullable = sequence_first(symbols[position + 1:])
+                    if is_nullable:
+                        tokens = tokens | follow[rule]
+                    if not tokens <= follow[symbol]:
+                        follow[symbol] |= tokens
+                        changed = True
+
+        parse_table = {rule: {} for rule in rules}
+        production_first = {}
+        for index, (rule, symbols) in enumerate(self.productions):
+            tokens, is_nullable = sequence_first(symbols)
+            production_first[index] = tokens
+            if is_nullable:
+                tokens = tokens | follow[rule]
+            for token in tokens:
+                selected = parse_table[rule].get(token)
+                if selected is None:
+                    parse_table[rule][token] = index
+                elif not self.productions[selected][1] and token in production_first[index] \
+                        or not symbols and token in production_first[selected]:
+                    # The optional or repeated part is entered if it starts with the next token
+                    if symbols:
+                        parse_table[rule][token] = index
+                    self.conflicts.append((rule, token))
+                else:
+                    raise ValueError(f"Grammar is not LL(1): {token} selects the productions "
+                                     f"{self._describe_production(selected)} and {self._describe_production(index)} of rule '{rule}'.")
+        return parse_table
+
+    def _describe_production(self, index):
+        """
+        Describe a production for error messages
+        :param index: Index of the production
+        :return: The production as text
+        """
+        rule, symbols = self.productions[index]
+        return f"{rule} ::= {' '.join(symbols) or 'ε'}"
+
+    def _render(self, rules, parse_table):
+        """
+        Write the productions and the parse table as Python module
+        :param rules: List of rule names
+        :param parse_table: Dictionary of the productions selected by the rules
+        :return: The code of the module
+        """
+        production_indices = {}
+        for index, (rule, symbols) in enumerate(self.productions):
+            production_indices.setdefault(rule, []).append(index)
+        token_order = {token.name: position for position, token in enumerate(TokenDefinition)}
+        token_order[END_OF_INPUT] = len(token_order)
+
+        code = (
+            "# Generated by CompilerFrontend/Parser/parser_generator.py from DSL/forgeapi-grammar.ebnf, do not edit.\n"
+            "# Regenerate it after changing the grammar or the tokens of the lexer:\n"
+            "#     cd Compiler && python3 -m CompilerFrontend.Parser.parser_generator\n\n"
+            f"PARSER_GENERATOR_VERSION = '{PARSER_GENERATOR_VERSION}'\n\n"
+            "# Rules the parser starts with, the whole input must match them\n"
+            f"START_SYMBOLS = {START_SYMBOLS!r}\n\n"
+            "# Terminal of the end of the input\n"
+            f"END_OF_INPUT = {END_OF_INPUT!r}\n\n"
+            "# Productions as (rule, symbols), symbols in upper case are tokens of the lexer.\n"
+            "# Helper rules of optional, repeated and grouped parts are named after their rule.\n"
+            "PRODUCTIONS = (\n"
+        )
+        # Productions are numbered in the order of the rules
+        numbers = {}
+        for rule in rules:
+            for index in production_indices[rule]:
+                numbers[index] = len(numbers)
+                code += f"    ({rule!r}, {self.productions[index][1]!r}),  # {numbers[index]}\n"
+        code += ")\n\n"
+        code += "# Production selected by a rule for the next token\n"
+        for rule, token in self.conflicts:
+            code += f"# {token} enters the optional or repeated part {rule}, it can also follow it\n"
+        code += "PARSE_TABLE = {\n"
+        for rule in rules:
+            entries = sorted(parse_table[rule].items(), key=lambda entry: token_order[entry[0]])
+            code += f"    {rule!r}: {{{', '.join(f'{token!r}: {numbers[index]}' for token, index in entries)}}},\n"
+        code += "}\n"
+        return code
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Generate the parse tables of the ForgeAPI parser from the grammar")
+    argument_parser.add_argument('--grammar', default=GRAMMAR_PATH, help="The EBNF grammar (default: DSL/forgeapi-grammar.ebnf)")
+    argument_parser.add_argument('--output', default=PARSE_TABLES_PATH,
+                                 help="The generated module (default: CompilerFrontend/Parser/parse_tables.py)")
+    argument_parser.add_argument('--check', action='store_true',
+                                 help="Only check that the generated module is up to date with the grammar")
+    arguments = argument_parser.parse_args()
+
+    with open(arguments.grammar, 'r') as inputFile:
+        grammar_text = inputFile.read()
+    try:
+        code = ParserGenerator(grammar_text).generate()
+    except ValueError as e:
+        sys.exit(f"Invalid grammar: {e}")
+
+    if arguments.check:
+        try:
+            with open(arguments.output, 'r') as inputFile:
+                up_to_date = inputFile.read() == code
+        except FileNotFoundError:
+            up_to_date = False
+        if not up_to_date:
+            sys.exit(f"{arguments.output} is out of date, regenerate it with: python3 -m CompilerFrontend.Parser.parser_generator")
+        print(f"{arguments.output} is up to date")
+        return
+
+    with open(arguments.output, 'w') as outputFile:
+        outputFile.write(code)
+    print(f"Parse tables written to {arguments.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
+from dataclasses import is_dataclass
+
 class PrintTree:
     """
     Formats the parse tree into a readable format.
 
-    Compatible with PARSER_VERSION=1.0
+    Compatible with PARSER_VERSION=2.0
 
     - Parameters:
-      parse_tree: dict - The parse tree to format.
+      parse_tree: Database - The parse tree to format.
     """
     def __init__(self, tree):
         self.tree = tree
@@ -18,7 +20,7 @@ class PrintTree:
         Recursively formats a node of the parse tree with indentation.
 
         - Parameters:
-          node: dict, list, str, bool, or None - The current node to format.
+          node: AST node, list, str, bool, or None - The current node to format.
           indent_level: int - The current level of indentation.
 
         - Returns:
@@ -27,63 +29,63 @@ class PrintTree:
         indent = ' ' * (indent_level * 4)  # Create indentation based on the current level
         result = ""
 
-        if isinstance(node, dict):
-            # Format dictionary nodes (e.g., database, table, column)
-            type_ = node.get('type', 'unknown')  # Get the type of the node, default to 'unknown'
+        if is_dataclass(node):
+            # Format AST nodes (e.g., database, table, column)
+            type_ = getattr(node, 'type', 'unknown')  # Get the type of the node, default to 'unknown'
             result += f"{indent}{{'type': '{type_}'"  # Start formatting with the type
 
             # Append additional attributes if present
-            if 'name' in node:
-                result += f", 'name': '{node['name']}'"
-            if 'datatype' in node:
-                result += f", 'datatype': '{node['datatype']}'"
-            if 'primary_key' in node:
-                result += f", 'primary_key': {node['primary_key']}"
-            if 'foreign_key' in node:
-                result += f", 'foreign_key': {node['foreign_key']}"
-            if 'not_null' in node:
-                result += f", 'not_null': {node['not_null']}"
-            if 'method' in node:
-                result += f", 'method': '{node['method']}'"
-            if 'url' in node:
-                result += f", 'url': '{node['url']}'"
-            if 'query_params' in node:
+            if hasattr(node, 'name'):
+                result += f", 'name': '{node.name}'"
+            if hasattr(node, 'datatype'):
+                result += f", 'datatype': '{node.datatype}'"
+            if hasattr(node, 'primary_key'):
+                result += f", 'primary_key': {node.primary_key}"
+            if hasattr(node, 'foreign_key'):
+                result += f", 'foreign_key': {node.foreign_key}"
+            if hasattr(node, 'not_null'):
+                result += f", 'not_null': {node.not_null}"
+            if hasattr(node, 'method'):
+                result += f", 'method': '{node.method}'"
+            if hasattr(node, 'url'):
+                result += f", 'url': '{node.url}'"
+            if hasattr(node, 'query_params'):
                 result += ", 'query_params': ["
                 # Format query parameters
-                for param in node['query_params']:
+                for param in node.query_params:
                     result += f"'{param}', "
                 result = result.rstrip(', ') + "]"
-            if 'tables' in node:
+            if hasattr(node, 'tables'):
                 # Recursively format tables
                 result += ",\n" + f"{indent}  'tables': [\n"
-                for table in node['tables']:
+                for table in node.tables:
                     result += self._format_node(table, indent_level + 1) + ",\n"
                 result += f"{indent}  ]"
-            if 'columns' in node:
+            if hasattr(node, 'columns'):
                 # Recursively format columns
                 result += ",\n" + f"{indent}  'columns': [\n"
-                for column in node['columns']:
+                for column in node.columns:
                     result += self._format_node(column, indent_level + 1) + ",\n"
                 result += f"{indent}  ]"
-            if 'foreign_keys' in node:
+            if hasattr(node, 'foreign_keys'):
                 # Recursively format foreign keys
                 result += ",\n" + f"{indent}  'foreign_keys': [\n"
-                for fk in node['foreign_keys']:
+                for fk in node.foreign_keys:
                     result += " \t" +  str(fk) + ",\n"
                 result += f"{indent}  ]"
-            if 'rest_block' in node:
+            if hasattr(node, 'rest_block'):
                 # Recursively format rest_block
                 result += ",\n" + f"{indent}  'rest_block': "
-                result += self._format_node(node['rest_block'], indent_level)
-            if 'endpoints' in node:
+                result += self._format_node(node.rest_block, indent_level)
+            if hasattr(node, 'endpoints'):
                 # Recursively format endpoints
                 result += ",\n" + f"{indent}  'endpoints': [\n"
-                for endpoint in node['endpoints']:
+                for endpoint in node.endpoints:
                     result += "\t" + str(endpoint) + ",\n"
                 result += f"{indent}  ]"
             result += "}"
 
-        elif isinstance(node, list):
+        elif isinstance(node, (list, tuple)):
             # Format list nodes (e.g., list of tables or columns)
             result += "[\n"
             for item in node:
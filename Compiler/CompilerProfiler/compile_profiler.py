@@ -0,0 +1,169 @@
+import contextlib
+import cProfile
+import json
+import logging
+import time
+import tracemalloc
+
+PROFILE_REPORT_VERSION = 1
+
+class CompileProfiler:
+    """
+    Records wall time, CPU time and the tracemalloc peak of every compiler phase,
+    as well as counters and generation times of single tables and endpoints.
+
+    A disabled profiler measures nothing, so the compiler can use it unconditionally.
+
+    - Parameters:
+      enabled: bool - Whether to record anything at all.
+      trace_memory: bool - Whether to trace allocations with tracemalloc (slows down the compilation).
+      cprofile_path: str or None - File the cProfile statistics of the whole run are dumped to.
+    """
+    def __init__(self, enabled=True, trace_memory=True, cprofile_path=None):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.cprofile_path = cprofile_path if enabled else None
+        self.cprofile = None
+        self.phases = {}  # Phase name -> accumulated measurements
+        self.counters = {}  # Counter name -> value
+        self.items = {}  # Item kind (e.g. 'table') -> item name -> count and generation time
+        self.started = None
+        self.start_wall = None
+        self.start_cpu = None
+        self.total_wall = None
+        self.total_cpu = None
+        self.total_peak_memory = None  # Maximum of the tracemalloc peaks, every phase resets the peak
+
+    def start(self):
+        """
+        Start the profiling of the whole compile run
+        """
+        if not self.enabled:
+            return
+        self.started = time.strftime('%Y-%m-%dT%H:%M:%S')
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.cprofile_path:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+
+    def stop(self):
+        """
+        Stop the profiling and dump the cProfile statistics if requested
+        """
+        if not self.enabled or self.start_wall is None:
+            return
+        self.total_wall = time.perf_counter() - self.start_wall
+        self.total_cpu = time.process_time() - self.start_cpu
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+            logging.info(f"cProfile statistics written to {self.cprofile_path}")
+        if self.trace_memory:
+            self.total_peak_memory = max(self.total_peak_memory or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Measure the code executed inside the with-block as compiler phase
+        Phases with the same name accumulate their times, the peak memory is the maximum of all runs
+        :param name: The name of the phase
+        """
+        if not self.enabled:
+            yield
+            return
+        if self.trace_memory:
+            # Keep the peak of the run before it is reset for the phase
+            self.total_peak_memory = max(self.total_peak_memory or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            phase = self.phases.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                  'peak_memory_bytes': None})
+            phase['calls'] += 1
+            phase['wall_seconds'] += wall
+            phase['cpu_seconds'] += cpu
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - start_memory
+                phase['peak_memory_bytes'] = max(phase['peak_memory_bytes'] or 0, peak)
+
+    @contextlib.contextmanager
+    def item(self, kind, name):
+        """
+        Count the generation of a single item (e.g. a table or an endpoint) and measure its wall time
+        :param kind: The kind of the item, e.g. 'table' or 'endpoint'
+        :param name: The name of the item
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_item(kind, name, time.perf_counter() - start)
+
+    def record_item(self, kind, name, seconds):
+        """
+        Count the generation of a single item measured elsewhere, e.g. in a worker process
+        :param kind: The kind of the item, e.g. 'table' or 'endpoint'
+        :param name: The name of the item
+        :param seconds: The wall time of the generation
+        """
+        if not self.enabled:
+            return
+        item = self.items.setdefault(kind, {}).setdefault(name, {'generated': 0, 'wall_seconds': 0.0})
+        item['generated'] += 1
+        item['wall_seconds'] += seconds
+
+    def count(self, name, amount=1):
+        """
+        Increase a counter
+        :param name: The name of the counter
+        :param amount: The amount to add
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """
+        Create the profiling report
+        :return: The report as a JSON serializable dictionary
+        """
+        for kind, items in self.items.items():
+            self.counters[f"{kind}s_generated"] = sum(item['generated'] for item in items.values())
+        return {
+            'version': PROFILE_REPORT_VERSION,
+            'started': self.started,
+            'total': {
+                'wall_seconds': self.total_wall,
+                'cpu_seconds': self.total_cpu,
+                'peak_memory_bytes': self.total_peak_memory,
+            },
+            'phases': self.phases,
+            'counters': self.counters,
+            'items': self.items,
+        }
+
+    def write_report(self, report_path):
+        """
+        Write the profiling report as JSON file
+        :param report_path: The path to the report file
+        """
+        if not self.enabled:
+            return
+        try:
+            with open(report_path, 'w') as outputFile:
+                json.dump(self.report(), outputFile, indent=2)
+            logging.info(f"Profiling report written to {report_path}")
+        except IOError as e:
+            logging.error(f"Error writing profiling report: {e}")
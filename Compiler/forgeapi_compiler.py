@@ -1,31 +1,99 @@
-import copy
+import argparse
+import difflib
+import json
+import mmap
 import sys
 import os
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from CompilerFrontend.Lexer.lexer import Lexer
 from CompilerFrontend.Parser.parser import Parser
 from CompilerFrontend.Parser.print_tree import PrintTree
-from CompilerBackend.sql_code_generator import SQLCodeGenerator
-from CompilerBackend.nodejs_endpoint_generator import NodeJSCodeGenerator
+from CompilerFrontend.Parser.ast_nodes import RestBlock
+from CompilerFrontend.Linker.module_linker import ModuleLinker
+from CompilerBackend.sql_code_generator import SQLCodeGenerator, generate_partitions_module
+from CompilerBackend.index_planner import IndexPlanner
+from CompilerBackend.schema_migrator import SchemaMigrator, schema_to_snapshot, snapshot_to_schema, \
+    generate_migration_script, generate_migrations_module
+from CompilerBackend.seed_data_generator import SeedDataGenerator, SEED_FORMATS
+from CompilerBackend.parallel_generation import generate_in_parallel
+from CompilerBackend.nodejs_endpoint_generator import NodeJSCodeGenerator, ROUTE_MODULE_LAYOUTS
 from CompilerBackend.appjs_route_generator import AppJSRouteGenerator
+from CompilerBackend.load_test_generator import LoadTestGenerator
+from CompilerBackend.query_plan_analyzer import QueryPlanAnalyzer, QUERY_PLAN_CHECKS
 from CompilerBackend.env_generator import EnvGenerator
+from CompilerBackend.artifact_emitter import ArtifactEmitter
+from CompilerCache.compilation_cache import CompilationCache
+from CompilerProfiler.compile_profiler import CompileProfiler
 
 # Logging-Konfiguration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def check_arguments():
     """
-    Check command line arguments for the source file
-    :return: The path to the source file
+    Check command line arguments for the source file and compiler options
+    :return: The parsed arguments, including the path to the source file
     """
-    if len(sys.argv) != 2:
-        logging.error("Compiler needs source file as argument.")
-        sys.exit(1)
-    file_path = sys.argv[1]
-    if not file_path.endswith('.forgeapi'):
+    argument_parser = argparse.ArgumentParser(description="ForgeAPI Compiler")
+    argument_parser.add_argument('source_file', help="The .forgeapi source file to compile")
+    argument_parser.add_argument('--stream', action='store_true',
+                                 help="Lex the memory-mapped source lazily while parsing instead of reading it at once")
+    argument_parser.add_argument('--cache-dir', default='./.forgeapi_cache',
+                                 help="Directory of the incremental compilation cache (default: ./.forgeapi_cache)")
+    argument_parser.add_argument('--no-cache', action='store_true',
+                                 help="Compile everything from scratch without reading or writing the compilation cache")
+    argument_parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                                 help="Generate code in N worker processes and write files in N threads (default: 1)")
+    argument_parser.add_argument('--route-modules', choices=ROUTE_MODULE_LAYOUTS, default='endpoint',
+                                 help="Generate one route module per endpoint, per table or one bundle of all routes (default: endpoint)")
+    argument_parser.add_argument('--seed-rows', nargs='+', metavar='ROWS',
+                                 help="Generate seed data with ROWS rows per table, or TABLE=ROWS for single tables, "
+                                      "to be loaded into every replica by seedDatabases.sh")
+    argument_parser.add_argument('--seed-format', choices=SEED_FORMATS, default='load-data',
+                                 help="Write the seed data for LOAD DATA LOCAL INFILE or as multi-row INSERTs (default: load-data)")
+    argument_parser.add_argument('--query-plan-report', metavar='REPORT_JSON',
+                                 help="Write the SQLite query plans of all endpoint statements and their findings to this JSON report")
+    argument_parser.add_argument('--fail-on-query-plan', nargs='*', choices=QUERY_PLAN_CHECKS, metavar='CHECK',
+                                 help="Fail the build on query plan findings of the given checks, of all checks if none are given "
+                                      f"({', '.join(QUERY_PLAN_CHECKS)})")
+    argument_parser.add_argument('--watch', action='store_true',
+                                 help="Stay resident and recompile whenever the source file changes")
+    argument_parser.add_argument('--watch-interval', type=float, default=0.5, metavar='SECONDS',
+                                 help="Polling interval of the watch mode in seconds (default: 0.5)")
+    argument_parser.add_argument('--profile', metavar='REPORT_JSON',
+                                 help="Write per-phase timing, memory and generation counters to this JSON report")
+    argument_parser.add_argument('--cprofile', metavar='STATS_FILE',
+                                 help="With --profile, also dump cProfile statistics of the whole run to this file")
+    arguments = argument_parser.parse_args()
+    if arguments.jobs < 1:
+        argument_parser.error("--jobs must be at least 1")
+    if arguments.cprofile and not arguments.profile:
+        argument_parser.error("--cprofile requires --profile")
+    arguments.seed_default_rows, arguments.seed_row_counts = parse_seed_rows(argument_parser, arguments.seed_rows)
+    if not arguments.source_file.endswith('.forgeapi'):
         logging.error("The source file must have a .forgeapi extension.")
         sys.exit(1)
-    return file_path
+    return arguments
+
+def parse_seed_rows(argument_parser, seed_rows):
+    """
+    Parse the row counts of the --seed-rows option
+    :param argument_parser: The ArgumentParser reporting invalid values
+    :param seed_rows: List of ROWS and TABLE=ROWS values, None if no seed data is generated
+    :return: Tuple of the rows of all other tables and a dictionary of the rows of single tables
+    """
+    default_rows = 0
+    row_counts = {}
+    for value in seed_rows or []:
+        table_name, separator, rows = value.rpartition('=')
+        if not rows.isdigit():
+            argument_parser.error(f"--seed-rows expects ROWS or TABLE=ROWS, got '{value}'")
+        if separator:
+            row_counts[table_name] = int(rows)
+        else:
+            default_rows = int(rows)
+    return default_rows, row_counts
 
 def read_source_file(file_path):
     """
@@ -39,6 +107,21 @@ def read_source_file(file_path):
         logging.error(f"File {file_path} not found.")
         sys.exit(1)
 
+def open_source_stream(file_path):
+    """
+    Memory-map the source file, so the lexer can read it without loading it into memory
+    :param file_path: The path to the source file
+    :return: The memory-mapped source, or empty bytes for an empty file
+    """
+    try:
+        with open(file_path, 'rb') as inputFile:
+            if os.fstat(inputFile.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(inputFile.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        logging.error(f"File {file_path} not found.")
+        sys.exit(1)
+
 def initialize_lexer(source):
     """
     Initialize the lexer and tokenize the source code
@@ -46,7 +129,20 @@ def initialize_lexer(source):
     :return: The tokenized source code
     """
     lexer = Lexer(source)
-    return lexer.tokenize()
+    try:
+        return lexer.tokenize()
+    except ValueError as e:
+        logging.error(f"Lexical error: {e}")
+        sys.exit(1)
+
+def stream_tokens(source):
+    """
+    Initialize the lexer in streaming mode
+    :param source: The source code to tokenize, e.g. the memory-mapped source file
+    :return: A generator yielding the tokens while they are consumed by the parser
+    """
+    lexer = Lexer(source)
+    return lexer.generate_tokens()
 
 def parse_tokens(tokens):
     """
@@ -60,26 +156,212 @@ def parse_tokens(tokens):
     except SyntaxError as e:
         logging.error(f"Syntax error during parsing: {e}")
         sys.exit(1)
+    except ValueError as e:  # Raised by a streaming lexer while parsing
+        logging.error(f"Lexical error: {e}")
+        sys.exit(1)
+
+def parse_source_file(file_path, stream=False):
+    """
+    Read, tokenize and parse the source file
+    :param file_path: The path to the source file
+    :param stream: Whether to lex the memory-mapped source lazily while parsing
+    :return: The parse tree
+    """
+    if stream:
+        source = open_source_stream(file_path)
+        parse_tree = parse_tokens(stream_tokens(source))
+        if isinstance(source, mmap.mmap):
+            source.close()
+        return parse_tree
+    source = read_source_file(file_path)
+    tokens = initialize_lexer(source)
+    return parse_tokens(tokens)
+
+def load_parse_tree(file_path, stream, cache):
+    """
+    Parse the source file or take the parse tree from the compilation cache if the source is unchanged
+    :param file_path: The path to the source file
+    :param stream: Whether to lex the memory-mapped source lazily while parsing
+    :param cache: The CompilationCache, or None to always parse the source
+    :return: The parse tree
+    """
+    if cache is None:
+        return parse_source_file(file_path, stream)
+    try:
+        source_hash = cache.hash_file(file_path)
+    except FileNotFoundError:
+        logging.error(f"File {file_path} not found.")
+        sys.exit(1)
+    return cache.get_or_generate_by_hash('parse_tree', source_hash, lambda: parse_source_file(file_path, stream))
+
+def link_modules(parse_tree, file_path, cache, jobs=1, source_files=None):
+    """
+    Parse the modules included by the source file and merge them into one parse tree
+    :param parse_tree: The parse tree of the source file
+    :param file_path: The path to the source file
+    :param cache: The CompilationCache for the parsed modules, or None to parse every module
+    :param jobs: The number of worker processes parsing the modules
+    :param source_files: List extended by the paths of the included module files
+    :return: The parse tree of the whole database
+    """
+    linker = ModuleLinker(cache, jobs)
+    try:
+        return linker.link(parse_tree, file_path)
+    except ValueError as e:
+        logging.error(f"Error while linking modules: {e}")
+        sys.exit(1)
+    finally:
+        if source_files is not None:
+            source_files.extend(linker.module_paths)
 
 def extract_endpoint_data(parse_tree):
     """
     Extract the endpoint data from the parse tree
     :param parse_tree: The parse tree
-    :return: The endpoint section of the parse tree
+    :return: The endpoint section of the parse tree, an empty RestBlock if there is none
     """
-    return parse_tree.get('rest_block', {})
+    return parse_tree.rest_block or RestBlock()
 
 def process_database_schema(parse_tree):
     """
-    Create and return a deep copy of the parse tree with endpoint data removed
+    Create a view of the parse tree with endpoint data removed
+    The immutable table nodes are shared with the parse tree instead of being copied
     :param parse_tree: The parse tree
     :return: The database schema section of the parse tree
     """
-    database_schema = copy.deepcopy(parse_tree)
-    if 'rest_block' in database_schema:
-        del database_schema['rest_block']
+    return parse_tree.schema()
+
+def plan_indexes(database_schema, endpoint_data):
+    """
+    Add indexes for the foreign keys and the filters of the GET and DELETE endpoints to the database schema
+    :param database_schema: The database schema
+    :param endpoint_data: The endpoint section of the parse tree
+    :return: The database schema with the derived indexes
+    """
+    index_planner = IndexPlanner(database_schema, endpoint_data)
+    try:
+        database_schema = index_planner.plan()
+    except ValueError as e:
+        logging.error(f"Invalid index: {e}")
+        sys.exit(1)
+    for table_name, columns, reasons in index_planner.added_indexes:
+        logging.info(f"Added index on {table_name} ({', '.join(columns)}) for {', '.join(reasons)}")
+    for table_name, columns, reason in index_planner.skipped_indexes:
+        logging.warning(f"No index on {table_name} ({', '.join(columns)}) for {reason}, the key would exceed the maximum key length")
     return database_schema
 
+def read_schema_snapshot(snapshot_path):
+    """
+    Read the snapshot of the schema compiled by the last compile run
+    :param snapshot_path: The path to the snapshot file
+    :return: The snapshot dictionary, None if there is no snapshot
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'r') as inputFile:
+            return json.load(inputFile)
+    except (OSError, ValueError) as e:
+        logging.error(f"Error reading schema snapshot {snapshot_path}: {e}")
+        sys.exit(1)
+
+def resolve_partition_starts(database_schema, snapshot):
+    """
+    Resolve the start of the range partitions, keeping the start recorded in the snapshot of the last compile run
+    :param database_schema: The database schema with the derived indexes
+    :param snapshot: The snapshot dictionary, None if there is no snapshot
+    :return: The database schema with the start of its range partitions
+    """
+    try:
+        previous_schema = None
+        if snapshot is not None and snapshot.get('database') == database_schema.name:
+            previous_schema = snapshot_to_schema(snapshot)
+        return SQLCodeGenerator(database_schema).resolve_partition_starts(previous_schema)
+    except (KeyError, TypeError) as e:
+        logging.error(f"Invalid schema snapshot: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        logging.error(f"Invalid schema: {e}")
+        sys.exit(1)
+
+def migrate_schema(database_schema, snapshot, create_migration=True):
+    """
+    Compare the database schema with the snapshot of the last compile run and create a migration if it changed
+    :param database_schema: The database schema with the derived indexes
+    :param snapshot: The snapshot dictionary, None if there is no snapshot
+    :param create_migration: Whether a changed schema creates a migration, False to only report the change
+    :return: Tuple of the version of the last migration, the list of all migrations and the statements of the new migration,
+             without create_migration the statements of the pending migration, which is not part of the version and migrations
+    """
+    if snapshot is None:
+        logging.info("No schema snapshot found, the schema is compiled without migration")
+        return 0, [], []
+    if snapshot.get('database') != database_schema.name:
+        logging.warning(f"Database was renamed from {snapshot.get('database')} to {database_schema.name}, "
+                        f"the schema is compiled without migration")
+        return 0, [], []
+
+    try:
+        schema_migrator = SchemaMigrator(snapshot_to_schema(snapshot), database_schema)
+        statements = schema_migrator.generate()
+    except (KeyError, TypeError) as e:
+        logging.error(f"Invalid schema snapshot: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        logging.error(f"Invalid schema: {e}")
+        sys.exit(1)
+
+    version = snapshot['version']
+    migrations = snapshot['migrations']
+    if statements and not create_migration:
+        logging.info(f"Schema changed, migration {version + 1} with {len(statements)} statements is created by the next build "
+                     f"without --watch")
+        return version, migrations, statements
+    if statements:
+        version += 1
+        migrations = migrations + [{'version': version, 'statements': statements}]
+        logging.info(f"Schema changed, migration {version} with {len(statements)} statements created")
+        for statement in schema_migrator.destructive_statements:
+            logging.warning(f"Migration {version} drops data: {' '.join(statement.split())}")
+    return version, migrations, statements
+
+def write_partitions_module(database_schema, emitter=None):
+    """
+    Write the partitions module of the RaftNode listing the range partitions kept ahead by the leader
+    :param database_schema: The database schema with the start of its range partitions
+    :param emitter: The ArtifactEmitter writing the file
+    """
+    emitter = emitter or ArtifactEmitter()
+    try:
+        emitter.emit("./RaftNode/partitions.js", generate_partitions_module(database_schema))
+    except IOError as e:
+        logging.error(f"Error writing to file: {e}")
+        sys.exit(1)
+
+def write_migration_files(database_schema, version, migrations, statements, emitter=None):
+    """
+    Write the new migration script, the schema snapshot and the migrations module of the RaftNode
+    :param database_schema: The database schema with the derived indexes
+    :param version: The version of the last migration
+    :param migrations: List of all migrations
+    :param statements: The statements of the new migration, empty if the schema is unchanged
+    :param emitter: The ArtifactEmitter writing the files
+    """
+    emitter = emitter or ArtifactEmitter()
+    migration_dir = "./DB/migrations"
+    try:
+        if statements:
+            os.makedirs(migration_dir, exist_ok=True)
+            migration_file_path = os.path.join(migration_dir, f"{version:04d}.sql")
+            emitter.emit(migration_file_path, generate_migration_script(database_schema.name, version, statements))
+            logging.info(f"Migration script written to {migration_file_path}")
+        snapshot = schema_to_snapshot(database_schema, version, migrations)
+        emitter.emit("./DB/schema_snapshot.json", json.dumps(snapshot, indent=2) + "\n")
+        emitter.emit("./RaftNode/migrations.js", generate_migrations_module(migrations))
+    except IOError as e:
+        logging.error(f"Error writing to file: {e}")
+        sys.exit(1)
+
 def print_endpoint_data(endpoint_data):
     """
     Print the endpoint data and generated code for debugging
@@ -98,135 +380,336 @@ def print_endpoint_data(endpoint_data):
 
 def get_auto_id_columns(database_schema):
      auto_id_columns = []
-     for table in database_schema.get('tables', []):
-         for column in table.get('columns', []):
-             if column.get('datatype') == 'auto_id':
-                 auto_id_columns.append(column['name'])
+     for table in database_schema.tables:
+         for column in table.columns:
+             if column.datatype == 'auto_id':
+                 auto_id_columns.append(column.name)
      return auto_id_columns
 
+def get_table_columns(database_schema):
+    """
+    Get the columns of each table in the database schema
+    :param database_schema: The parse tree representing the database schema
+    :return: A dictionary where the keys are table names and values are dictionaries of their Column nodes by name
+    """
+    return {table.name: {column.name: column for column in table.columns} for table in database_schema.tables}
+
 def get_primary_keys(database_schema):
     """
     Get the primary keys for each table in the database schema
     :param database_schema: The parse tree representing the database schema
-    :return: A dictionary where the keys are table names and values are the primary key column names
+    :return: A dictionary where the keys are table names and values are tuples of the primary key column names
     """
     primary_keys = {}
-    for table in database_schema.get('tables', []):
-        for column in table.get('columns', []):
-            if column.get('primary_key', False):
-                primary_keys[table['name']] = column['name']
-                break  # Assuming only one primary key per table
+    for table in database_schema.tables:
+        primary_key = tuple(column.name for column in table.columns if column.primary_key)
+        if primary_key:
+            primary_keys[table.name] = primary_key
     return primary_keys
 
-def write_sql_to_file(sql_code, output_file_path):
+def write_sql_to_file(sql_code, output_file_path, emitter=None):
     """
-    Write the generated SQL code to a file, overwriting it if it exists
+    Write the generated SQL code to a file, replacing it atomically if its content changed
     :param sql_code: The SQL code to write
     :param output_file_path: The path to the output file
+    :param emitter: The ArtifactEmitter writing the file
     """
+    emitter = emitter or ArtifactEmitter()
     try:
         logging.info(f"Writing SQL code to {output_file_path}")
-        with open(output_file_path, 'w') as outputFile:
-            outputFile.write(sql_code)
-        logging.info(f"SQL code successfully written to {output_file_path}")
+        if emitter.emit(output_file_path, sql_code) == 'unchanged':
+            logging.info(f"SQL code in {output_file_path} is unchanged")
+        else:
+            logging.info(f"SQL code successfully written to {output_file_path}")
+    except IOError as e:
+        logging.error(f"Error writing to file: {e}")
+        sys.exit(1)
+
+def write_seed_data(database_schema, default_rows, row_counts, data_format, jobs=1, emitter=None):
+    """
+    Write the seed data files of all tables and the script loading them into a replica
+    The data files are streamed to disk instead of being emitted, they can hold millions of rows.
+    :param database_schema: The database schema
+    :param default_rows: Number of rows of the tables not contained in row_counts
+    :param row_counts: Dictionary of the number of rows of single tables
+    :param data_format: One of SEED_FORMATS
+    :param jobs: Number of worker processes writing the data files
+    :param emitter: The ArtifactEmitter writing the load script
+    """
+    emitter = emitter or ArtifactEmitter()
+    seed_dir = "./DB/seed"
+    try:
+        seed_generator = SeedDataGenerator(database_schema, row_counts, default_rows, data_format)
+        seed_generator.validate()
+    except ValueError as e:
+        logging.error(f"Invalid seed data: {e}")
+        sys.exit(1)
+
+    table_names = [table_name for table_name in seed_generator.tables if seed_generator.get_rows(table_name) > 0]
+    data_file_names = {seed_generator.get_data_file_name(table_name) for table_name in table_names}
+    try:
+        os.makedirs(seed_dir, exist_ok=True)
+        # Data files of removed tables or of the other format would be loaded by nobody but take up space
+        for file_name in os.listdir(seed_dir):
+            if file_name.endswith(('.tsv', '.sql')) and file_name != 'load.sql' and file_name not in data_file_names:
+                os.remove(os.path.join(seed_dir, file_name))
+        results = generate_in_parallel(seed_generator, 'write_data_file', [(table_name, seed_dir) for table_name in table_names], jobs)
+        for table_name, (rows, seconds) in zip(table_names, results):
+            logging.info(f"Seed data of {table_name}: {rows} rows written in {seconds * 1000:.0f} ms")
+        emitter.emit(os.path.join(seed_dir, "load.sql"), seed_generator.generate_load_script("/seed"))
+        logging.info(f"Seed data successfully written to {seed_dir}, load it with seedDatabases.sh")
     except IOError as e:
         logging.error(f"Error writing to file: {e}")
         sys.exit(1)
 
-def write_endpoints_to_files(endpoint_data, endpoint_output_dir):
+def write_endpoints_to_files(endpoint_data, endpoint_output_dir, jobs=1, emitter=None, route_modules=None):
     """
-    Writes the endpoint data to separate files organized by table names.
+    Writes the endpoint data to separate files organized by table names, or the combined route modules.
+    Only changed files are written, endpoint files which are no longer generated are deleted.
 
     :param endpoint_data: List of dictionaries containing endpoint data, including table name, URL, method, and generated code.
     :param endpoint_output_dir: The root directory where the table folders and endpoint files will be created.
+    :param jobs: The number of threads writing the files
+    :param emitter: The ArtifactEmitter writing the files
+    :param route_modules: List of dictionaries with the file name and generated code of combined route modules,
+                          None to write one file per endpoint
     """
+    emitter = emitter or ArtifactEmitter()
     # Check if the output directory exists, if not create it
     if not os.path.exists(endpoint_output_dir):
         os.makedirs(endpoint_output_dir)
     
-    # Group the endpoints by table name
+    # Group the endpoints by table name, combined route modules replace the endpoint files
     endpoints_by_table = {}
-    for endpoint in endpoint_data:
+    for endpoint in endpoint_data if route_modules is None else []:
         table_name = endpoint['table']
         if table_name not in endpoints_by_table:
             endpoints_by_table[table_name] = []
         endpoints_by_table[table_name].append(endpoint)
     
-    # Create a folder for each table and write the endpoint files
+    # Create a folder for each table and collect the endpoint files
+    endpoint_files = []
     for table_name, endpoints in endpoints_by_table.items():
         table_dir = os.path.join(endpoint_output_dir, table_name)
         if not os.path.exists(table_dir):
             os.makedirs(table_dir)
         
-        # Write each endpoint to a separate file
+        # Each endpoint is written to a separate file
         for endpoint in endpoints:
             file_name = endpoint['url'].strip('/').replace('/', '_') + '.js'
-            file_path = os.path.join(table_dir, file_name)
-            try:
-                with open(file_path, 'w') as file:
-                    file.write(endpoint['generated_code'])
-                logging.info(f"File '{file_name}' was created in '{table_name}' folder")
-            except IOError as e:
-                logging.error(f"Error writing to file: {e}")
-                sys.exit(1)           
-
-def write_env_to_file(env_content, env_file_path):
-    """
-    Write the generated environment variables to a file, overwriting it if it exists
+            endpoint_files.append((table_name, file_name, os.path.join(table_dir, file_name), endpoint['generated_code']))
+
+    # Combined route modules are written directly into the output directory
+    for route_module in route_modules or []:
+        endpoint_files.append((None, route_module['file'], os.path.join(endpoint_output_dir, route_module['file']),
+                               route_module['generated_code']))
+
+    try:
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                statuses = list(executor.map(lambda endpoint_file: emitter.emit(*endpoint_file[2:]), endpoint_files))
+        else:
+            statuses = [emitter.emit(*endpoint_file[2:]) for endpoint_file in endpoint_files]
+        removed_files = emitter.remove_stale_files(endpoint_output_dir, '.js')
+    except IOError as e:
+        logging.error(f"Error writing to file: {e}")
+        sys.exit(1)
+
+    for (table_name, file_name, file_path, generated_code), status in zip(endpoint_files, statuses):
+        if table_name is None:
+            logging.info(f"Route module '{file_name}' was {status}")
+        else:
+            logging.info(f"File '{file_name}' was {status} in '{table_name}' folder")
+    for file_path in removed_files:
+        logging.info(f"Stale endpoint file '{file_path}' was removed")
+
+def analyze_query_plans(database_schema, nodejs_generator, report_path=None, fail_checks=None, emitter=None):
+    """
+    Analyze the query plans of the endpoint statements in SQLite and log the findings
+    :param database_schema: The database schema with the derived indexes
+    :param nodejs_generator: The NodeJSCodeGenerator of the endpoints
+    :param report_path: The path to the JSON report, None to write no report
+    :param fail_checks: List of the checks whose findings fail the build, empty for all checks, None to never fail
+    :param emitter: The ArtifactEmitter writing the report
+    """
+    emitter = emitter or ArtifactEmitter()
+    query_plan_analyzer = QueryPlanAnalyzer(database_schema, nodejs_generator)
+    try:
+        report = query_plan_analyzer.analyze()
+    except ValueError as e:
+        logging.error(f"Invalid schema: {e}")
+        sys.exit(1)
+    for check, subject, message in query_plan_analyzer.findings:
+        logging.warning(f"Query plan ({check}): {message}")
+    logging.info(f"Query plans of {len(query_plan_analyzer.statements)} statements analyzed, "
+                 f"{len(query_plan_analyzer.findings)} findings")
+
+    if report_path:
+        try:
+            if emitter.emit(report_path, report) != 'unchanged':
+                logging.info(f"Query plan report successfully written to {report_path}")
+        except IOError as e:
+            logging.error(f"Error writing to file: {e}")
+            sys.exit(1)
+
+    if fail_checks is not None:
+        failed_findings = [finding for finding in query_plan_analyzer.findings if not fail_checks or finding[0] in fail_checks]
+        if failed_findings:
+            logging.error(f"Build failed on {len(failed_findings)} query plan findings")
+            sys.exit(1)
+
+def write_load_test_endpoints(endpoint_definitions, endpoints_file_path, emitter=None):
+    """
+    Write the endpoint definitions of the load test harness
+    :param endpoint_definitions: The JSON document of the endpoint definitions
+    :param endpoints_file_path: The path to the output file
+    :param emitter: The ArtifactEmitter writing the file
+    """
+    emitter = emitter or ArtifactEmitter()
+    try:
+        os.makedirs(os.path.dirname(endpoints_file_path), exist_ok=True)
+        if emitter.emit(endpoints_file_path, endpoint_definitions) != 'unchanged':
+            logging.info(f"Load test endpoints successfully written to {endpoints_file_path}")
+    except IOError as e:
+        logging.error(f"Error writing to file: {e}")
+        sys.exit(1)
+
+def write_env_to_file(env_content, env_file_path, emitter=None):
+    """
+    Write the generated environment variables to a file, replacing it atomically if its content changed
     :param env_content: The environment variables to write
     :param env_file_path: The path to the output file
+    :param emitter: The ArtifactEmitter writing the file
     """
+    emitter = emitter or ArtifactEmitter()
     try:
-        with open(env_file_path, 'w') as outputFile:
-            outputFile.write(env_content)
-        logging.info(f"Environment variables successfully written to {env_file_path}")
+        if emitter.emit(env_file_path, env_content) == 'unchanged':
+            logging.info(f"Environment variables in {env_file_path} are unchanged")
+        else:
+            logging.info(f"Environment variables successfully written to {env_file_path}")
     except IOError as e:
         logging.error(f"Error writing to file: {e}")
         sys.exit(1)
 
-def main():
-    logging.info("ForgeAPI Compiler started")
-    
-    file_path = check_arguments()
-    source = read_source_file(file_path)
-    tokens = initialize_lexer(source)
-    parse_tree = parse_tokens(tokens)
+def compile_source(arguments, cache, emitter, source_files=None):
+    """
+    Compile the source file and write all generated files
+    :param arguments: The parsed command line arguments
+    :param cache: The CompilationCache, or None to compile everything from scratch
+    :param emitter: The ArtifactEmitter writing the generated files
+    :param source_files: List extended by the paths of the included module files
+    """
+    profiler = CompileProfiler(enabled=bool(arguments.profile), cprofile_path=arguments.cprofile)
+    profiler.start()
+    with profiler.phase('load_parse_tree'):
+        parse_tree = load_parse_tree(arguments.source_file, arguments.stream, cache)
+
+    with profiler.phase('link_modules'):
+        parse_tree = link_modules(parse_tree, arguments.source_file, cache, arguments.jobs, source_files)
     
-    # Extract endpoint data
-    endpoint_data = extract_endpoint_data(parse_tree)
+    with profiler.phase('process_database_schema'):
+        # Extract endpoint data
+        endpoint_data = extract_endpoint_data(parse_tree)
 
-    # Extract database schema
-    database_schema = process_database_schema(parse_tree)
+        # Extract database schema
+        database_schema = process_database_schema(parse_tree)
 
-    # Get primary keys for tables
-    primary_keys = get_primary_keys(database_schema)
+        # Get primary keys for tables
+        primary_keys = get_primary_keys(database_schema)
 
-    # Generate SQL code
-    sql_generator = SQLCodeGenerator(database_schema)
-    sql_code = sql_generator.generate()
-    output_file_path = "./DB/schema.sql"
-    write_sql_to_file(sql_code, output_file_path)
+        # Get auto_id columns
+        auto_id_columns = get_auto_id_columns(database_schema)
+
+        # Get the columns of the tables
+        table_columns = get_table_columns(database_schema)
 
-    # Get auto_id columns
-    auto_id_columns = get_auto_id_columns(database_schema)
+    with profiler.phase('IndexPlanner.plan'):
+        # Add indexes for foreign keys and endpoint filters
+        database_schema = plan_indexes(database_schema, endpoint_data)
+
+    # Pass the profiler to the generators only if it records anything
+    item_profiler = profiler if profiler.enabled else None
+
+    # Compare the schema with the last compiled one
+    with profiler.phase('SchemaMigrator.generate'):
+        snapshot_path = "./DB/schema_snapshot.json"
+        snapshot = read_schema_snapshot(snapshot_path)
+        database_schema = resolve_partition_starts(database_schema, snapshot)
+        # Every save in watch mode would create a migration, so the snapshot is only advanced by a build without --watch
+        migration_version, migrations, migration_statements = migrate_schema(database_schema, snapshot, not arguments.watch)
+
+    # Generate SQL code
+    with profiler.phase('SQLCodeGenerator.generate'):
+        sql_generator = SQLCodeGenerator(database_schema, cache, item_profiler, arguments.jobs, migration_version)
+        try:
+            sql_code = sql_generator.generate()
+        except ValueError as e:
+            logging.error(f"Invalid schema: {e}")
+            sys.exit(1)
 
     # Generate environment variables for database
-    database_name = database_schema.get('name')
-    env_generator = EnvGenerator(database_name)
-    env_content = env_generator.generate_env_content()
-    env_file_path = "./.env"
-    write_env_to_file(env_content, env_file_path)
+    with profiler.phase('EnvGenerator.generate_env_content'):
+        database_name = database_schema.name
+        env_file_path = "./.env"
+        try:
+            env_generator = EnvGenerator(database_name, env_file_path, database_schema.log_policy)
+        except ValueError as e:
+            logging.error(f"Invalid log policy: {e}")
+            sys.exit(1)
+        env_content = env_generator.generate_env_content()
 
     # Generate Node.js code
     endpoint_output_dir = "./RaftNode/REST"
-    nodejs_generator = NodeJSCodeGenerator(auto_id_columns, primary_keys, endpoint_data)
-    nodejs_code = nodejs_generator.generate_code()
-    write_endpoints_to_files(nodejs_code, endpoint_output_dir)
+    with profiler.phase('NodeJSCodeGenerator.generate_code'):
+        nodejs_generator = NodeJSCodeGenerator(auto_id_columns, primary_keys, endpoint_data, cache, item_profiler, arguments.jobs,
+                                               table_columns)
+        try:
+            nodejs_code = nodejs_generator.generate_code()
+            route_modules = nodejs_generator.generate_route_modules(arguments.route_modules)
+        except ValueError as e:
+            logging.error(f"Invalid endpoint: {e}")
+            sys.exit(1)
+
+    # Check the query plans of the endpoints before any file is written,
+    # a failed build must neither create a migration nor advance the schema snapshot
+    with profiler.phase('QueryPlanAnalyzer.analyze'):
+        analyze_query_plans(database_schema, nodejs_generator, arguments.query_plan_report, arguments.fail_on_query_plan, emitter)
+
+    output_file_path = "./DB/schema.sql"
+    if arguments.watch and migration_statements:
+        # A database created from the changed schema would record the old version and fail on the pending migration
+        logging.info(f"{output_file_path} and the partitions module are written by the next build without --watch, "
+                     f"which creates the pending migration")
+    else:
+        with profiler.phase('write_sql_to_file'):
+            write_sql_to_file(sql_code, output_file_path, emitter)
+        with profiler.phase('write_migration_files'):
+            if not arguments.watch:
+                write_migration_files(database_schema, migration_version, migrations, migration_statements, emitter)
+            write_partitions_module(database_schema, emitter)
+
+    # Generate seed data for load tests
+    if arguments.seed_rows:
+        with profiler.phase('write_seed_data'):
+            write_seed_data(database_schema, arguments.seed_default_rows, arguments.seed_row_counts, arguments.seed_format,
+                            arguments.jobs, emitter)
+
+    with profiler.phase('write_env_to_file'):
+        write_env_to_file(env_content, env_file_path, emitter)
+
+    with profiler.phase('write_endpoints_to_files'):
+        write_endpoints_to_files(nodejs_code, endpoint_output_dir, arguments.jobs, emitter, route_modules)
+
+    # Generate the endpoint definitions of the load test
+    with profiler.phase('LoadTestGenerator.generate'):
+        write_load_test_endpoints(LoadTestGenerator(database_schema.name, nodejs_generator).generate(),
+                                  "./LoadTest/endpoints.json", emitter)
 
     # Register routes in app.js
-    app_js_path = "./RaftNode/app.js"
-    app_js_generator = AppJSRouteGenerator(app_js_path)
-    app_js_generator.register_routes(endpoint_data)
+    with profiler.phase('AppJSRouteGenerator.register_routes'):
+        app_js_path = "./RaftNode/app.js"
+        app_js_generator = AppJSRouteGenerator(app_js_path, emitter)
+        app_js_generator.register_routes(endpoint_data, arguments.route_modules)
 
     # Print the formatted parse tree for debugging
     #printed_tree = PrintTree(parse_tree)
@@ -235,6 +718,103 @@ def main():
     # Print endpoint data and generated code for debugging
     #print_endpoint_data(nodejs_code)
 
+    logging.info(f"Generated files: {emitter.summary()}")
+
+    if cache is not None:
+        with profiler.phase('CompilationCache.save'):
+            cache.save()
+        logging.info(f"Compilation cache: {cache.hits} entries reused, {cache.misses} entries generated")
+        profiler.count('cache_hits', cache.hits)
+        profiler.count('cache_misses', cache.misses)
+
+    profiler.count('sql_bytes', len(sql_code))
+    profiler.count('endpoint_code_bytes', sum(len(endpoint['generated_code']) for endpoint in nodejs_code))
+    profiler.stop()
+    if arguments.profile:
+        profiler.write_report(arguments.profile)
+
+def report_artifact_changes(emitter):
+    """
+    Log which generated files changed and print the diff of every updated file
+    :param emitter: The ArtifactEmitter of the last compile run
+    """
+    for file_path in emitter.created:
+        logging.info(f"Created: {file_path}")
+    for file_path in emitter.removed:
+        logging.info(f"Removed: {file_path}")
+    for file_path in emitter.updated:
+        logging.info(f"Updated: {file_path}")
+        old_content, new_content = emitter.diffs.get(file_path, ('', ''))
+        diff = difflib.unified_diff(old_content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+                                    fromfile=f"{file_path} (previous)", tofile=file_path)
+        sys.stdout.writelines(diff)
+
+def get_source_state(file_paths):
+    """
+    Get the modification times and sizes of the source files to detect changes
+    :param file_paths: The paths to the source file and its modules
+    :return: Tuple with the modification time and size of every file, None for files that do not exist
+    """
+    states = []
+    for file_path in file_paths:
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            states.append(None)
+            continue
+        states.append((stat_result.st_mtime_ns, stat_result.st_size))
+    return tuple(states)
+
+def watch_source_file(arguments, cache):
+    """
+    Keep the compiler resident and recompile whenever the source file or one of its modules changes.
+    The compilation cache is kept in memory between runs, so only changed tables and endpoints are regenerated.
+    :param arguments: The parsed command line arguments
+    :param cache: The CompilationCache, or None to compile everything from scratch on every change
+    """
+    logging.info(f"Watching {arguments.source_file} for changes, press Ctrl+C to stop")
+    watched_files = [arguments.source_file]
+    last_state = None
+    try:
+        while True:
+            state = get_source_state(watched_files)
+            if state[0] is not None and state != last_state:
+                emitter = ArtifactEmitter(record_diffs=True)
+                start = time.perf_counter()
+                # The modules found by this run are watched from now on, even if the run fails
+                source_files = [arguments.source_file]
+                try:
+                    if cache is not None:
+                        cache.begin_run()
+                    compile_source(arguments, cache, emitter, source_files)
+                except SystemExit:
+                    logging.error("Compilation failed, waiting for the next change")
+                    continue
+                except Exception as e:
+                    logging.error(f"Compilation failed: {e}, waiting for the next change")
+                    continue
+                finally:
+                    if source_files != watched_files:
+                        watched_files = source_files
+                        state = get_source_state(watched_files)
+                    last_state = state
+                logging.info(f"Recompiled in {(time.perf_counter() - start) * 1000:.0f} ms")
+                report_artifact_changes(emitter)
+            time.sleep(arguments.watch_interval)
+    except KeyboardInterrupt:
+        logging.info("Watch mode stopped")
+
+def main():
+    logging.info("ForgeAPI Compiler started")
+    
+    arguments = check_arguments()
+    cache = None if arguments.no_cache else CompilationCache(arguments.cache_dir)
+    if arguments.watch:
+        watch_source_file(arguments, cache)
+        return
+
+    compile_source(arguments, cache, ArtifactEmitter())
+
     logging.info("ForgeAPI Compiler finished successfully")
 
 if __name__ == "__main__":
@@ -0,0 +1,711 @@
+"""
+Load test of the REST endpoints generated by the ForgeAPI compiler.
+
+Sends requests with random payloads to the endpoints of LoadTest/endpoints.json, which the compiler generates from the
+REST block, and writes the latency percentiles and the throughput of every endpoint to a JSON report.
+
+- closed loop: --concurrency clients send their next request as soon as the previous one was answered.
+- open loop: requests arrive at --rate requests per second, independent of the answers, on up to --concurrency connections.
+  The latency is measured from the scheduled arrival, so a slow server also accounts for the time requests waited.
+
+Usage (from the repository root):
+    python3 LoadTest/load_test.py --url http://localhost:3001 [--mode closed|open] [--concurrency N] [--rate RPS]
+                                  [--duration SECONDS] [--warmup SECONDS] [--mix NAME=WEIGHT ...] [--report REPORT_JSON]
+                                  [--compare REPORT_JSON]
+    python3 LoadTest/load_test.py --stub ...     (against a local stub server validating the requests)
+    python3 LoadTest/load_test.py --self-test    (checks the harness against the stub server)
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import random
+import re
+import string
+import sys
+import time
+from urllib.parse import urlencode, urlsplit, parse_qsl
+
+# Version of the format of the reports
+REPORT_FORMAT_VERSION = 1
+
+# Version of the format of endpoints.json supported by this harness
+ENDPOINTS_FORMAT_VERSION = 1
+
+DEFAULT_ENDPOINTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endpoints.json')
+
+# Percentiles of the latency written to the report
+PERCENTILES = (50, 95, 99)
+
+# Share of NULL values of nullable properties
+NULL_RATIO = 0.1
+
+# Maximum length of random strings, longer string properties get strings of up to this length
+MAX_RANDOM_STRING_LENGTH = 16
+
+# Rows sent to batch endpoints, limited by their minimum and maximum batch size
+DEFAULT_BATCH_SIZE = 10
+
+STRING_CHARACTERS = string.ascii_letters + string.digits
+FIRST_DATE = datetime.date(2000, 1, 1).toordinal()
+LAST_DATE = datetime.date(2029, 12, 31).toordinal()
+FIRST_TIMESTAMP = 946684800  # 2000-01-01 00:00:00 UTC
+LAST_TIMESTAMP = 1893455999  # 2029-12-31 23:59:59 UTC
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+class PayloadGenerator:
+    """
+    Generates random values matching the JSON schemas of the generated endpoints.
+
+    Integers are drawn from 1 to key_range, so ids of PUT, DELETE and filtering GET endpoints hit rows loaded with
+    --seed-rows of the compiler. Only the required properties are generated, e.g. paginated endpoints get no cursor.
+
+    - Parameters:
+      rng: random.Random - The random generator.
+      key_range: int - Largest generated integer.
+      batch_size: int - Number of rows sent to batch endpoints.
+    """
+    def __init__(self, rng, key_range, batch_size=DEFAULT_BATCH_SIZE):
+        self.rng = rng
+        self.key_range = key_range
+        self.batch_size = batch_size
+
+    def generate(self, schema):
+        """
+        Generate a random value of a schema
+        :param schema: JSON schema of the value
+        :return: The value
+        """
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):
+            if 'null' in schema_type and self.rng.random() < NULL_RATIO:
+                return None
+            schema_type = next(item for item in schema_type if item != 'null')
+
+        if schema_type == 'object':
+            properties = schema.get('properties', {})
+            return {name: self.generate(properties.get(name, {})) for name in schema.get('required', [])}
+        if schema_type == 'array':
+            size = min(max(self.batch_size, schema.get('minItems', 1)), schema.get('maxItems', self.batch_size))
+            return [self.generate(schema.get('items', {})) for _ in range(size)]
+        if schema_type == 'integer':
+            return self.rng.randint(max(1, schema.get('minimum', 1)), min(self.key_range, schema.get('maximum', self.key_range)))
+        if schema_type == 'number':
+            return round(self.rng.uniform(0, 100000), 2)
+        if schema_type == 'boolean':
+            return self.rng.random() < 0.5
+        if schema.get('format') == 'date':
+            return datetime.date.fromordinal(self.rng.randint(FIRST_DATE, LAST_DATE)).isoformat()
+        if 'pattern' in schema:
+            # The only pattern of the generated schemas is the one of timestamps
+            return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(self.rng.randint(FIRST_TIMESTAMP, LAST_TIMESTAMP)))
+        length = self.rng.randint(1, min(schema.get('maxLength', MAX_RANDOM_STRING_LENGTH), MAX_RANDOM_STRING_LENGTH))
+        return ''.join(self.rng.choices(STRING_CHARACTERS, k=length))
+
+    def generate_request(self, endpoint):
+        """
+        Generate the path and the body of a request to an endpoint
+        :param endpoint: Endpoint definition of endpoints.json
+        :return: Tuple of the path with the query string and the body, None if the request has no body
+        """
+        path = endpoint['url']
+        if endpoint.get('querystring'):
+            query = self.generate(endpoint['querystring'])
+            if query:
+                path += '?' + urlencode({name: str(value).lower() if isinstance(value, bool) else value
+                                         for name, value in query.items()})
+        body = self.generate(endpoint['body']) if endpoint.get('body') else None
+        return path, body
+
+def validate(schema, value, path='value'):
+    """
+    Check a value against the subset of JSON schema used by the generated endpoints
+    :param schema: JSON schema
+    :param value: The value
+    :param path: Name of the value in the error message
+    :return: The error message, None if the value is valid
+    """
+    schema_types = schema.get('type')
+    if schema_types is None:
+        return None
+    schema_types = schema_types if isinstance(schema_types, list) else [schema_types]
+    checks = {
+        'null': lambda: value is None,
+        'object': lambda: isinstance(value, dict),
+        'array': lambda: isinstance(value, list),
+        'integer': lambda: isinstance(value, int) and not isinstance(value, bool),
+        'number': lambda: isinstance(value, (int, float)) and not isinstance(value, bool),
+        'boolean': lambda: isinstance(value, bool),
+        'string': lambda: isinstance(value, str),
+    }
+    schema_type = next((schema_type for schema_type in schema_types if checks[schema_type]()), None)
+    if schema_type is None:
+        return f"{path} must be of type {' or '.join(schema_types)}"
+
+    if schema_type == 'object':
+        for name in schema.get('required', []):
+            if name not in value:
+                return f"{path} must have property {name}"
+        for name, property_value in value.items():
+            error = validate(schema.get('properties', {}).get(name, {}), property_value, f"{path}.{name}")
+            if error:
+                return error
+    elif schema_type == 'array':
+        if not schema.get('minItems', 0) <= len(value) <= schema.get('maxItems', len(value)):
+            return f"{path} has {len(value)} items"
+        for index, item in enumerate(value):
+            error = validate(schema.get('items', {}), item, f"{path}[{index}]")
+            if error:
+                return error
+    elif schema_type in ('integer', 'number'):
+        if value < schema.get('minimum', value) or value > schema.get('maximum', value):
+            return f"{path} is out of range"
+    elif schema_type == 'string':
+        if len(value) > schema.get('maxLength', len(value)):
+            return f"{path} is longer than {schema['maxLength']}"
+        if schema.get('format') == 'date' and not DATE_PATTERN.match(value):
+            return f"{path} is no date"
+        if 'pattern' in schema and not re.search(schema['pattern'], value):
+            return f"{path} does not match {schema['pattern']}"
+    return None
+
+def coerce_query(schema, query):
+    """
+    Convert the query string values to the types of their schema, like Fastify does before validating them
+    :param schema: JSON schema of the query string
+    :param query: Dictionary of the query string values
+    :return: Dictionary of the converted values, values which can not be converted are kept as strings
+    """
+    properties = schema.get('properties', {})
+    coerced = {}
+    for name, value in query.items():
+        schema_type = properties.get(name, {}).get('type')
+        try:
+            if schema_type == 'integer':
+                value = int(value)
+            elif schema_type == 'number':
+                value = float(value)
+            elif schema_type == 'boolean' and value in ('true', 'false'):
+                value = value == 'true'
+        except ValueError:
+            pass
+        coerced[name] = value
+    return coerced
+
+class HttpConnection:
+    """
+    Keep-alive HTTP/1.1 connection sending JSON requests, reconnects after errors.
+
+    - Parameters:
+      host: str - Host of the server.
+      port: int - Port of the server.
+      timeout: float - Seconds a request may take.
+    """
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=None):
+        """
+        Send a request and read the whole response
+        :param method: HTTP method
+        :param path: Path with the query string
+        :param body: Value sent as JSON body, None for no body
+        :return: The status code of the response
+        """
+        try:
+            return await asyncio.wait_for(self._request(method, path, body), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n"
+        data = b''
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            head += f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+        self.writer.write(head.encode('ascii') + b"\r\n" + data)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
+class StubServer:
+    """
+    Local HTTP server answering the endpoints like the generated ones, without a database.
+    Requests which do not match the schema of their endpoint are answered with 400, so the self-test
+    detects payloads the generated endpoints would reject.
+
+    - Parameters:
+      endpoints: list - Endpoint definitions of endpoints.json.
+      latency: float - Seconds every response is delayed.
+    """
+    def __init__(self, endpoints, latency=0.0):
+        self.routes = {(endpoint['method'], endpoint['url']): endpoint for endpoint in endpoints}
+        self.latency = latency
+        self.server = None
+        self.port = None
+        self.connections = {}  # Handler task -> writer of the open connections
+        self.invalid_requests = []  # List of (endpoint name, error) of the rejected requests
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        # Closing the connections ends their handlers, cancelled handlers would be reported as errors by asyncio
+        self.server.close()
+        for writer in list(self.connections.values()):
+            writer.close()
+        await asyncio.gather(*self.connections)
+        await self.server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('ascii').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                data = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, response = self._respond(method, target, data)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                payload = json.dumps(response).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode('ascii') + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+    def _respond(self, method, target, data):
+        """
+        Validate a request against the schemas of its endpoint
+        :return: Tuple of the status code and the response
+        """
+        url = urlsplit(target)
+        endpoint = self.routes.get((method, url.path))
+        if endpoint is None:
+            return 404, {'success': False, 'message': f"Route {method}:{url.path} not found"}
+        error = None
+        if endpoint.get('querystring'):
+            error = validate(endpoint['querystring'], coerce_query(endpoint['querystring'], dict(parse_qsl(url.query))), 'querystring')
+        if error is None and endpoint.get('body'):
+            try:
+                error = validate(endpoint['body'], json.loads(data or b'null'), 'body')
+            except ValueError:
+                error = "body is no JSON"
+        if error is not None:
+            self.invalid_requests.append((endpoint['name'], error))
+            return 400, {'success': False, 'message': error}
+        return 200, {'success': True, 'data': []}
+
+class LoadTest:
+    """
+    Sends requests to the endpoints in the weighted mix and records the latency of every request.
+
+    - Parameters:
+      endpoints: list - Endpoint definitions with the weight of the mix, endpoints with weight 0 get no requests.
+      host, port: The server.
+      mode: str - closed or open.
+      concurrency: int - Clients of the closed loop, connections of the open loop.
+      rate: float - Requests per second of the open loop.
+      duration: float - Seconds of the measurement.
+      warmup: float - Seconds before the measurement whose requests are not recorded.
+      timeout: float - Seconds a request may take.
+      key_range: int - Largest generated integer, see PayloadGenerator.
+      seed: int - Seed of the random generators, the same seed sends the same requests.
+    """
+    def __init__(self, endpoints, host, port, mode='closed', concurrency=16, rate=100.0, duration=30.0, warmup=5.0,
+                 timeout=10.0, key_range=1000, seed=0):
+        self.endpoints = [endpoint for endpoint in endpoints if endpoint['weight'] > 0]
+        if not self.endpoints:
+            raise ValueError("No endpoint has a weight above 0.")
+        self.weights = [endpoint['weight'] for endpoint in self.endpoints]
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.warmup = warmup
+        self.timeout = timeout
+        self.key_range = key_range
+        self.seed = seed
+        self.samples = {endpoint['name']: [] for endpoint in self.endpoints}  # Endpoint name -> [(latency in seconds, status)]
+        self.measurement_start = None
+
+    async def run(self):
+        """
+        Run the load test
+        :return: Dictionary of the recorded samples by endpoint name
+        """
+        start = time.perf_counter()
+        self.measurement_start = start + self.warmup
+        end = self.measurement_start + self.duration
+        if self.mode == 'closed':
+            await asyncio.gather(*(self._run_client(client, end) for client in range(self.concurrency)))
+        else:
+            await self._run_open_loop(start, end)
+        return self.samples
+
+    async def _send(self, connection, endpoint, path, body, scheduled):
+        """
+        Send one request and record its latency from the scheduled time
+        """
+        try:
+            status = await connection.request(endpoint['method'], path, body)
+        except asyncio.TimeoutError:
+            status = 'timeout'
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            status = 'error'
+        if scheduled >= self.measurement_start:
+            self.samples[endpoint['name']].append((time.perf_counter() - scheduled, status))
+
+    async def _run_client(self, client, end):
+        """
+        Closed loop client sending its next request after the answer of the previous one
+        """
+        rng = random.Random(f"{self.seed}:{client}")
+        payloads = PayloadGenerator(rng, self.key_range)
+        connection = HttpConnection(self.host, self.port, self.timeout)
+        try:
+            while True:
+                scheduled = time.perf_counter()
+                if scheduled >= end:
+                    break
+                endpoint = rng.choices(self.endpoints, self.weights)[0]
+                path, body = payloads.generate_request(endpoint)
+                await self._send(connection, endpoint, path, body, scheduled)
+        finally:
+            connection.close()
+
+    async def _run_open_loop(self, start, end):
+        """
+        Open loop sending requests at exponentially distributed intervals with the mean 1 / rate
+        """
+        rng = random.Random(f"{self.seed}:open")
+        payloads = PayloadGenerator(rng, self.key_range)
+        connections = asyncio.Queue()
+        for _ in range(self.concurrency):
+            connections.put_nowait(HttpConnection(self.host, self.port, self.timeout))
+
+        async def send(endpoint, path, body, scheduled):
+            connection = await connections.get()
+            try:
+                await self._send(connection, endpoint, path, body, scheduled)
+            finally:
+                connections.put_nowait(connection)
+
+        tasks = []
+        scheduled = start
+        while True:
+            scheduled += rng.expovariate(self.rate)
+            if scheduled >= end:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = rng.choices(self.endpoints, self.weights)[0]
+            tasks.append(asyncio.ensure_future(send(endpoint, *payloads.generate_request(endpoint), scheduled)))
+        await asyncio.gather(*tasks)
+        while not connections.empty():
+            connections.get_nowait().close()
+
+def percentile(sorted_values, percent):
+    """
+    Nearest rank percentile
+    :param sorted_values: Sorted list of values
+    :param percent: Percentile between 0 and 100
+    :return: The percentile, None if there are no values
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+def summarize(samples, duration):
+    """
+    Summarize the samples of an endpoint or of all endpoints
+    :param samples: List of (latency in seconds, status) tuples
+    :param duration: Seconds of the measurement
+    :return: Dictionary of the request counts, the throughput and the latency in milliseconds
+    """
+    latencies = sorted(latency * 1000 for latency, status in samples)
+    status_counts = {}
+    for latency, status in samples:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    errors = sum(1 for latency, status in samples if not isinstance(status, int) or status >= 400)
+    latency_summary = {f"p{percent}": round(percentile(latencies, percent), 3) if latencies else None for percent in PERCENTILES}
+    latency_summary['mean'] = round(sum(latencies) / len(latencies), 3) if latencies else None
+    latency_summary['max'] = round(latencies[-1], 3) if latencies else None
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'status': status_counts,
+        'throughput': round((len(samples) - errors) / duration, 2),
+        'latency_ms': latency_summary,
+    }
+
+def create_report(load_test, database, target, samples):
+    """
+    Create the report of a load test
+    :param load_test: The finished LoadTest
+    :param database: Name of the database of the endpoints
+    :param target: URL of the tested server
+    :param samples: The recorded samples by endpoint name
+    :return: The report dictionary
+    """
+    endpoints = {}
+    for endpoint in load_test.endpoints:
+        endpoints[endpoint['name']] = {
+            'method': endpoint['method'],
+            'url': endpoint['url'],
+            'weight': endpoint['weight'],
+            **summarize(samples[endpoint['name']], load_test.duration),
+        }
+    return {
+        'format': REPORT_FORMAT_VERSION,
+        'database': database,
+        'target': target,
+        'mode': load_test.mode,
+        'concurrency': load_test.concurrency,
+        'rate': load_test.rate if load_test.mode == 'open' else None,
+        'duration': load_test.duration,
+        'warmup': load_test.warmup,
+        'seed': load_test.seed,
+        'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'endpoints': endpoints,
+        'total': summarize([sample for endpoint_samples in samples.values() for sample in endpoint_samples], load_test.duration),
+    }
+
+def print_report(report, baseline=None):
+    """
+    Print the throughput and the latency percentiles of every endpoint, with the change against a baseline report
+    :param report: The report dictionary
+    :param baseline: Report of an earlier run, None to print no changes
+    """
+    def change(value, baseline_value):
+        if value is None or not baseline_value:
+            return ''
+        return f" ({(value - baseline_value) / baseline_value * 100:+.1f}%)"
+
+    rows = list(report['endpoints'].items()) + [('total', report['total'])]
+    print(f"{'endpoint':<32} {'requests':>9} {'errors':>7} {'req/s':>20} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>20}")
+    for name, summary in rows:
+        reference = None
+        if baseline is not None:
+            reference = baseline['total'] if name == 'total' else baseline['endpoints'].get(name)
+        latency = summary['latency_ms']
+        throughput = f"{summary['throughput']}{change(summary['throughput'], reference and reference['throughput'])}"
+        p99 = f"{latency['p99']}{change(latency['p99'], reference and reference['latency_ms']['p99'])}"
+        print(f"{name:<32} {summary['requests']:>9} {summary['errors']:>7} {throughput:>20} "
+              f"{str(latency['p50']):>10} {str(latency['p95']):>10} {p99:>20}")
+
+def read_endpoints(endpoints_path):
+    """
+    Read the endpoint definitions generated by the compiler
+    :param endpoints_path: Path to endpoints.json
+    :return: Tuple of the database name and the list of endpoint definitions
+    """
+    try:
+        with open(endpoints_path, 'r') as inputFile:
+            definitions = json.load(inputFile)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error reading the endpoints {endpoints_path}, compile the DSL first: {e}")
+    if definitions.get('format') != ENDPOINTS_FORMAT_VERSION:
+        sys.exit(f"Unsupported format {definitions.get('format')} of {endpoints_path}, compile the DSL again.")
+    return definitions['database'], definitions['endpoints']
+
+def apply_mix(endpoints, mix):
+    """
+    Set the weights of the request mix
+    :param endpoints: List of endpoint definitions
+    :param mix: List of NAME=WEIGHT values
+    :return: List of endpoint definitions with the weights of the mix
+    """
+    weights = {}
+    for value in mix or []:
+        name, separator, weight = value.partition('=')
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            sys.exit(f"--mix expects NAME=WEIGHT, got '{value}'")
+        if not separator or weights[name] < 0:
+            sys.exit(f"--mix expects NAME=WEIGHT with a weight of at least 0, got '{value}'")
+    names = {endpoint['name'] for endpoint in endpoints}
+    for name in weights:
+        if name not in names:
+            sys.exit(f"--mix contains unknown endpoint '{name}', expected one of {', '.join(sorted(names))}")
+    return [{**endpoint, 'weight': weights.get(endpoint['name'], endpoint['weight'])} for endpoint in endpoints]
+
+async def run_load_test(arguments, endpoints, database):
+    """
+    Run the load test against the target or a stub server
+    :return: The report dictionary
+    """
+    stub_server = None
+    if arguments.stub:
+        stub_server = StubServer(endpoints, arguments.stub_latency / 1000)
+        await stub_server.start()
+        target = f"http://127.0.0.1:{stub_server.port}"
+    else:
+        target = arguments.url
+    url = urlsplit(target)
+    load_test = LoadTest(endpoints, url.hostname, url.port or 80, arguments.mode, arguments.concurrency, arguments.rate,
+                         arguments.duration, arguments.warmup, arguments.timeout, arguments.key_range, arguments.seed)
+    try:
+        samples = await load_test.run()
+    finally:
+        if stub_server is not None:
+            await stub_server.stop()
+    report = create_report(load_test, database, target, samples)
+    if stub_server is not None and stub_server.invalid_requests:
+        report['invalid_requests'] = [f"{name}: {error}" for name, error in stub_server.invalid_requests[:20]]
+    return report
+
+async def run_self_test(endpoints, database):
+    """
+    Run short load tests in both modes against the stub server and check the reports
+    :return: List of the failed checks, empty if the harness works
+    """
+    failures = []
+    for mode in ('closed', 'open'):
+        arguments = argparse.Namespace(stub=True, stub_latency=1.0, url=None, mode=mode, concurrency=4, rate=500.0,
+                                       duration=1.0, warmup=0.2, timeout=5.0, key_range=1000, seed=0)
+        report = await run_load_test(arguments, endpoints, database)
+        report = json.loads(json.dumps(report))
+        for error in report.get('invalid_requests', []):
+            failures.append(f"{mode}: request rejected by the schema, {error}")
+        for name, summary in report['endpoints'].items():
+            if summary['requests'] == 0:
+                failures.append(f"{mode}: no requests sent to {name}")
+            elif summary['errors']:
+                failures.append(f"{mode}: {summary['errors']} failed requests to {name}: {summary['status']}")
+            else:
+                latency = summary['latency_ms']
+                if not latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max']:
+                    failures.append(f"{mode}: latency percentiles of {name} are not ordered: {latency}")
+        if report['total']['throughput'] <= 0:
+            failures.append(f"{mode}: no throughput")
+    return failures
+
+def check_arguments():
+    """
+    Check command line arguments of the load test
+    :return: The parsed arguments
+    """
+    argument_parser = argparse.ArgumentParser(description="Load test of the REST endpoints generated by the ForgeAPI compiler")
+    argument_parser.add_argument('--url', default='http://localhost:3001',
+                                 help="URL of the RaftNode, writes are only accepted by the leader (default: http://localhost:3001)")
+    argument_parser.add_argument('--endpoints', default=DEFAULT_ENDPOINTS_PATH,
+                                 help="Endpoint definitions generated by the compiler (default: endpoints.json next to this script)")
+    argument_parser.add_argument('--mode', choices=('closed', 'open'), default='closed',
+                                 help="Closed loop with a fixed number of clients or open loop with a fixed arrival rate (default: closed)")
+    argument_parser.add_argument('--concurrency', type=int, default=16, metavar='N',
+                                 help="Clients of the closed loop, connections of the open loop (default: 16)")
+    argument_parser.add_argument('--rate', type=float, default=100.0, metavar='RPS',
+                                 help="Requests per second of the open loop (default: 100)")
+    argument_parser.add_argument('--duration', type=float, default=30.0, metavar='SECONDS',
+                                 help="Duration of the measurement (default: 30)")
+    argument_parser.add_argument('--warmup', type=float, default=5.0, metavar='SECONDS',
+                                 help="Duration before the measurement whose requests are not recorded (default: 5)")
+    argument_parser.add_argument('--timeout', type=float, default=10.0, metavar='SECONDS',
+                                 help="Time a request may take (default: 10)")
+    argument_parser.add_argument('--mix', nargs='+', metavar='NAME=WEIGHT',
+                                 help="Relative share of the requests of endpoints, all endpoints have the weight 1 by default")
+    argument_parser.add_argument('--key-range', type=int, default=1000, metavar='N',
+                                 help="Integers are drawn from 1 to N, e.g. the rows per table of --seed-rows (default: 1000)")
+    argument_parser.add_argument('--seed', type=int, default=0,
+                                 help="Seed of the random payloads (default: 0)")
+    argument_parser.add_argument('--report', metavar='REPORT_JSON',
+                                 help="Write the report to this JSON file")
+    argument_parser.add_argument('--compare', metavar='REPORT_JSON',
+                                 help="Print the changes of the throughput and the p99 latency against an earlier report")
+    argument_parser.add_argument('--stub', action='store_true',
+                                 help="Run against a local stub server instead of --url")
+    argument_parser.add_argument('--stub-latency', type=float, default=0.0, metavar='MS',
+                                 help="Delay of every response of the stub server (default: 0)")
+    argument_parser.add_argument('--self-test', action='store_true',
+                                 help="Check the harness with short runs against the stub server")
+    arguments = argument_parser.parse_args()
+    if arguments.concurrency < 1:
+        argument_parser.error("--concurrency must be at least 1")
+    if arguments.rate <= 0 or arguments.duration <= 0 or arguments.warmup < 0 or arguments.timeout <= 0:
+        argument_parser.error("--rate, --duration and --timeout must be positive, --warmup must not be negative")
+    if arguments.key_range < 1:
+        argument_parser.error("--key-range must be at least 1")
+    return arguments
+
+def main():
+    arguments = check_arguments()
+    database, endpoints = read_endpoints(arguments.endpoints)
+    if arguments.self_test:
+        failures = asyncio.run(run_self_test(endpoints, database))
+        for failure in failures:
+            print(f"FAILED: {failure}")
+        print("Self-test failed" if failures else f"Self-test passed for {len(endpoints)} endpoints")
+        sys.exit(1 if failures else 0)
+
+    endpoints = apply_mix(endpoints, arguments.mix)
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, 'r') as inputFile:
+            baseline = json.load(inputFile)
+    try:
+        report = asyncio.run(run_load_test(arguments, endpoints, database))
+    except ValueError as e:
+        sys.exit(str(e))
+    print_report(report, baseline)
+    if arguments.report:
+        with open(arguments.report, 'w') as outputFile:
+            json.dump(report, outputFile, indent=2)
+            outputFile.write("\n")
+
+if __name__ == '__main__':
+    main()
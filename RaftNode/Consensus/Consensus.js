@@ -6,6 +6,11 @@ class Consensus{
         //Define Timeout durations
         this.heartbeatTimeoutDuration = 500;
         this.voteTimeoutDuration = 2000;
+        // Shorter than the vote timeout: a follower rejects other candidates until the vote timeout has passed since
+        // the last heartbeat of the leader, which is later than the end of the lease the heartbeat extended
+        this.leaseDuration = 1500;
+        // Number of nodes of the cluster including this node, a majority is counted from it and not from the live connections
+        this.clusterSize = Number(fastify.totalCount);
 
         //Define Timeouts
         this.selectLeaderTimeout = null;
@@ -15,6 +20,16 @@ class Consensus{
         //Define Consensus Variables
         this.leader = null;
         this.fastify = fastify;
+        // Latest election term known to this node, stored with every log entry
+        this.term = 0;
+        // Send time of the last heartbeat acknowledged by each follower
+        this.heartbeatAcknowledgements = new Map();
+        // Receive time of the last heartbeat of the current leader
+        this.lastLeaderHeartbeat = 0;
+        // Latest log id acknowledged by each follower, kept when it disconnects, it still needs the later entries
+        this.followerLogIds = new Map();
+        // Log id up to which the leader allows the compaction of the log, received with its heartbeats
+        this.leaderCompactionLimit = 0;
 
 
         //Call initial Methods
@@ -97,16 +112,75 @@ class Consensus{
     //Receives Heartbeat
     receiveHeartbeat(payload) {
         console.log('Recieved Heartbeat');
+        this.updateTerm(payload.term);
         if(!this.leader){
             this.setLeader(payload.serverId);
         }
+        if(this.checkLeader(payload.serverId)) {
+            this.lastLeaderHeartbeat = Date.now();
+            if(Number.isInteger(payload.compactionLimit)) {
+                this.leaderCompactionLimit = payload.compactionLimit;
+            }
+        }
         this.startsVoteTimeout();
     }
 
-    //sets the leader
-    setLeader(leader) {
+    //checks if the current leader may still hold its lease, then no other candidate may get the vote of this node
+    //a follower heard a heartbeat of the leader within the vote timeout, the leader holds the lease itself
+    //the receive time is kept when the connection to the leader is lost, its lease may still count the last acknowledgement
+    isLeaderActive() {
+        if(this.checkLeader(this.fastify.serverId)) {
+            return this.hasLeaderLease();
+        }
+        return Date.now() - this.lastLeaderHeartbeat < this.voteTimeoutDuration;
+    }
+
+    //Receives the acknowledgement of a heartbeat sent by this leader
+    receiveHeartbeatResponse(payload) {
+        this.heartbeatAcknowledgements.set(payload.serverId.toString(), payload.sentAt);
+        if(Number.isInteger(payload.logId)) {
+            this.followerLogIds.set(payload.serverId.toString(), payload.logId);
+        }
+    }
+
+    //gets the log id up to which entries may be compacted, no follower may still need them to catch up
+    //the leader takes the minimum of all followers of the configured cluster, nothing while one never acknowledged
+    //a follower takes the limit of the leader, so it still has the entries if it becomes the leader
+    getCompactionLimit() {
+        if(!this.checkLeader(this.fastify.serverId)) {
+            return this.leaderCompactionLimit;
+        }
+        if(this.followerLogIds.size < this.clusterSize - 1) {
+            return 0;
+        }
+        return Math.min(...this.followerLogIds.values());
+    }
+
+    //checks if this node is the leader and a majority acknowledged one of its heartbeats within the lease duration
+    //the send time is taken from the own clock, so the lease does not depend on synchronized clocks
+    hasLeaderLease() {
+        if(!this.checkLeader(this.fastify.serverId)) {
+            return false;
+        }
+        const now = Date.now();
+        let acknowledgements = 0;
+        for(const sentAt of this.heartbeatAcknowledgements.values()) {
+            if(now - sentAt < this.leaseDuration) {
+                acknowledgements++;
+            }
+        }
+        // The leader and the acknowledging followers must be a majority of the configured cluster,
+        // a leader cut off from most nodes still has acknowledgements of all its live connections
+        return acknowledgements + 1 > this.clusterSize / 2;
+    }
+
+    //sets the leader, elected in the given term
+    setLeader(leader, term = null) {
         console.log('Leader is: ', leader);
+        this.updateTerm(term);
         this.leader = leader;
+        this.heartbeatAcknowledgements.clear();
+        this.lastLeaderHeartbeat = Date.now();
         this.startsHeartbeatTimeout();
     }
 
@@ -123,6 +197,24 @@ class Consensus{
         return this.leader.toString() === Id.toString();
     }
 
+    //gets the current term
+    getTerm() {
+        return this.term;
+    }
+
+    //starts a new term for an election of this node
+    startTerm() {
+        this.term++;
+        return this.term;
+    }
+
+    //adopts the term of another node if it is newer
+    updateTerm(term) {
+        if(Number.isInteger(term) && term > this.term) {
+            this.term = term;
+        }
+    }
+
     //removes the leader
     removeLeader() {
         this.leader = null;
@@ -5,6 +5,7 @@ const webSocket = require('ws');
 const {dbInteraction} = require('../DB/dbInteraction');
 let {getConsensus, currentLogId} = require('./session');
 const {insert, deleteLog} = require('../DB/consensus_Node_Log');
+const {recordApplied} = require('../DB/logRetention');
 
 const votes = new Map();
 let ownHash = null;
@@ -37,6 +38,29 @@ const get = async (fastify, query, values = null) => {
     return await waitForResponse();
 }
 
+// Hande a REST Request which is a SELECT DB-request read locally on the leader
+// While the leader holds its lease no other node can be elected and write, so the local data is up to date
+// Without a valid lease the request falls back to a quorum read
+const getFromLeader = async (fastify, query, values = null) => {
+    const leader = checkLeaderStatus(fastify);
+    if(leader !== -1){
+        return {
+            success: false,
+            data: 'Not the leader! Leader is: ' + leader
+        }
+    }
+    if(!getConsensus().hasLeaderLease()){
+        return await get(fastify, query, values);
+    }
+    return await dbInteraction(fastify, query, values);
+}
+
+// Hande a REST Request which is a SELECT DB-request read locally on any node
+// The data of a follower may lag behind the leader until it applied the latest logs
+const getFromAny = async (fastify, query, values = null) => {
+    return await dbInteraction(fastify, query, values);
+}
+
 // Hande a REST Request which is NOT a SELECT DB-request
 // First send message to all Nodes to create a Log Entry
 // Second create own Data and Hash
@@ -52,6 +76,7 @@ const post = async (fastify, query, values) => {
     }
 
     votes.clear();
+    const term = getConsensus().getTerm();
 
     // Send the request to all nodes to add a new Entry in the Log Table
     let message = {
@@ -59,14 +84,15 @@ const post = async (fastify, query, values) => {
         payload: {
             method: dbMethods.POST,
             query: query,
-            values: values
+            values: values,
+            term: term
         }
     }
 
     sendMessageToAllNodes(message);
 
     // Set own Data
-    data = await insert(fastify, {query: query, values: values});
+    data = await insert(fastify, {query: query, values: values}, term);
     ownHash = generateHash(data);
 
     const response = await waitForResponse();
@@ -100,6 +126,7 @@ const post = async (fastify, query, values) => {
     }
 
     sendMessageToAllNodes(message);
+    await recordApplied(fastify, message.payload.logId, term);
 
     return {
         success: true,
@@ -147,7 +174,7 @@ const handleVotingRequest = async (fastify, payload) => {
         await responseVoting(fastify, hash);
     }
     else if(payload.method === dbMethods.POST){
-        const response = await insert(fastify, {query: payload.query, values: payload.values});
+        const response = await insert(fastify, {query: payload.query, values: payload.values}, payload.term ?? 0);
         currentLogId = response.data;
         const hash = generateHash(response);
         await responseVoting(fastify, hash);
@@ -231,6 +258,8 @@ const checkLeaderStatus = (fastify) => {
 
 module.exports = {
     get,
+    getFromLeader,
+    getFromAny,
     post,
     responseVoting,
     handleVotingResponse,
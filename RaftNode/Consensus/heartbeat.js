@@ -1,9 +1,11 @@
 const {getAllConnections, getLeaderConnection, getConnection} = require('../Socket/connectionStorage');
 const {consensusTypes} = require('../enums');
 const webSocket = require('ws');
-const {getLatestId, getAllByStartId, insert} = require('../DB/consensus_Node_Log');
+const {getLatestId, getAllByStartId, insert, decodeCommand} = require('../DB/consensus_Node_Log');
 const {dbInteraction} = require('../DB/dbInteraction');
-const {currentLogId} = require('./session');
+const {invalidateQuery} = require('../DB/readCache');
+const {recordApplied} = require('../DB/logRetention');
+const {currentLogId, getConsensus} = require('./session');
 
 const sendHeartbeat = async (fastify) => {
     const connections = getAllConnections();
@@ -16,7 +18,11 @@ const sendHeartbeat = async (fastify) => {
         type: consensusTypes.HEARBEAT,
         payload: {
             serverId: fastify.serverId,
-            logId: logId
+            logId: logId,
+            term: getConsensus().getTerm(),
+            // The followers compact their logs only up to the entries every node has
+            compactionLimit: getConsensus().getCompactionLimit(),
+            sentAt: Date.now()
         }
     }
     for(const connection of connections.values()){
@@ -30,10 +36,32 @@ const sendHeartbeat = async (fastify) => {
     }
 }
 
+//acknowledge the heartbeat, so the leader can hold its lease for leader reads
+//the latest log id of this node tells the leader which entries it may compact
+const sendHeartbeatResponse = (fastify, payload, logId) => {
+    const message = {
+        type: consensusTypes.HEARTBEATRESPONSE,
+        payload: {
+            serverId: fastify.serverId,
+            logId: logId,
+            sentAt: payload.sentAt
+        }
+    }
+    const connection = getConnection(payload.serverId);
+    if(connection && connection.readyState === webSocket.OPEN){
+        try {
+            connection.send(JSON.stringify(message));
+        } catch (error) {
+            console.log(error);
+        }
+    }
+}
+
 //handle incoming heartbeat and check current logId
 const handleHeartbeat = async (fastify, payload) => {
     const payloadLogId = payload.logId;
     const logId = await getLatestId(fastify);
+    sendHeartbeatResponse(fastify, payload, logId.success ? Number(logId.data) : null);
     if(!logId.success)
         return;
     if(logId.data >= payloadLogId){
@@ -65,11 +93,21 @@ const handleMissingLog = async (fastify, payload) => {
     const entries = await getAllByStartId(fastify, payload.logId);
     if(!entries.success)
         return;
+    if(entries.data === null){
+        console.log('Node ', payload.serverId, ' misses log entries after ', payload.logId,
+            ' which were compacted, restore its database from a backup of an up to date node');
+        return;
+    }
+    // The encoded commands are sent as base64, so they keep their compression
     const message = {
         type: consensusTypes.APPENDLOG,
         payload: {
             serverId: fastify.serverId,
-            entries: entries.data
+            entries: entries.data.map((entry) => ({
+                id: Number(entry.id),
+                term: Number(entry.term),
+                command: Buffer.from(entry.command).toString('base64')
+            }))
         }
     }
     const connection = getConnection(payload.serverId);
@@ -86,11 +124,15 @@ const handleMissingLog = async (fastify, payload) => {
 const insertMissingLog = async (fastify, payload) => {
     const entries = payload.entries.sort((a, b) => a.id - b.id);
     for(const entry of entries){
-        const {success} = await insert(fastify, entry.command);
+        const command = Buffer.from(entry.command, 'base64');
+        // The entry keeps the id of the leader, so the logs of both nodes stay aligned
+        const {success} = await insert(fastify, command, entry.term, entry.id);
         if(!success)
             return false;
-        const commandJson = JSON.parse(entry.command);
+        const commandJson = decodeCommand(command);
         await dbInteraction(fastify, commandJson.query, commandJson.values ?? null);
+        invalidateQuery(commandJson.query);
+        await recordApplied(fastify, entry.id, entry.term);
     }
     return true;
 }
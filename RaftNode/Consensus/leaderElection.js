@@ -19,7 +19,8 @@ const startLeaderElection = async (fastify) => {
         type: consensusTypes.LEADERELECTION,
         payload: {
             serverId: serverId,
-            logId: logId.data
+            logId: logId.data,
+            term: getConsensus().startTerm()
         }
     }
     for (const [key, value] of connections) {
@@ -59,9 +60,12 @@ const handleLeaderElection = async (fastify, payload) => {
     if(!logId.success)
         return;
     let acceptLeader = false;
-    if(payloadLogId >= logId.data){
+    const consensus = getConsensus();
+    // Candidates of an older term are rejected, as are all candidates while the current leader may hold its lease
+    if(payloadLogId >= logId.data && (payload.term ?? 0) >= consensus.getTerm() && !consensus.isLeaderActive()){
         // Vote for Leader
         acceptLeader = true;
+        consensus.updateTerm(payload.term);
     }
     await voteForLeader(fastify, payload.serverId, acceptLeader);
 }
@@ -74,7 +78,9 @@ const handleVoteResponse = (fastify, payload) => {
         let acceptLeader = false;
         const voteCount = Array.from(votes.values()).filter((value) => value === true).length;
         console.log('Vote Count: ', voteCount, ' Connection Count: ', connectionCount);
-        if(voteCount > connectionCount / 2)
+        // The votes of the other nodes and the candidate's own vote must be a majority of the configured cluster,
+        // not of the live connections, otherwise a candidate cut off from most nodes is elected while the leader holds its lease
+        if(voteCount + 1 > Number(fastify.totalCount) / 2)
             acceptLeader = true;
         const consensus = getConsensus();
         if(consensus && consensus.getLeader()){
@@ -95,7 +101,8 @@ const publishLeaderElection = async (fastify) => {
     const message = {
         type: consensusTypes.ELECTIONRESULT,
         payload: {
-            serverId: serverId
+            serverId: serverId,
+            term: getConsensus().getTerm()
         }
     }
     for (const [key, value] of connections) {
@@ -1,12 +1,51 @@
+const zlib = require('zlib');
 const {getConnection} = require('./connection');
 
 const tableName = 'Consensus_Node_Log';
+const checkpointTableName = 'Consensus_Node_Checkpoint';
+
+// Maximum number of entries sent to a follower catching up with one message
+const maxCatchUpEntries = 500;
+
+// Latest id of the log, read from the database only after changes other than inserts
+let cachedLatestId = null;
+
+// Commands longer than this are deflated, shorter ones are stored as JSON
+const minCompressedLength = 256;
+
+// Format of an encoded command, stored in its first byte
+const commandFormats = Object.freeze({
+    JSON: 0,
+    DEFLATE: 1
+});
+
+// Encode a command {query, values} as BLOB, large commands are deflated
+const encodeCommand = (command) => {
+    if(Buffer.isBuffer(command)) {
+        return command;
+    }
+    const json = Buffer.from(typeof command === 'string' ? command : JSON.stringify(command));
+    if(json.length >= minCompressedLength) {
+        const deflated = zlib.deflateRawSync(json);
+        if(deflated.length < json.length) {
+            return Buffer.concat([Buffer.from([commandFormats.DEFLATE]), deflated]);
+        }
+    }
+    return Buffer.concat([Buffer.from([commandFormats.JSON]), json]);
+}
+
+// Decode a command stored by encodeCommand
+const decodeCommand = (encodedCommand) => {
+    const buffer = Buffer.isBuffer(encodedCommand) ? encodedCommand : Buffer.from(encodedCommand);
+    const json = buffer[0] === commandFormats.DEFLATE ? zlib.inflateRawSync(buffer.subarray(1)) : buffer.subarray(1);
+    return JSON.parse(json.toString());
+}
 
 // Get all data from the table
 const getAll = async (fastify) => {
     try {
         const db = await getConnection(fastify);
-        const [ rows ] = await db.query(`SELECT * FROM ${tableName}`);
+        const rows = await db.query(`SELECT * FROM ${tableName} ORDER BY id`);
         db.release();
         return {
             success: true,
@@ -21,18 +60,24 @@ const getAll = async (fastify) => {
 }
 
 // Insert data into the table
-const insert = async (fastify, command) => {
+// The id is only given for entries copied from the leader, new entries get the next id
+const insert = async (fastify, command, term = 0, id = null) => {
     try {
-        const query = `INSERT INTO ${tableName} (command) VALUES (?) RETURNING id`;
-        const values = [command];
+        const query = id === null
+            ? `INSERT INTO ${tableName} (term, command) VALUES (?, ?) RETURNING id`
+            : `INSERT INTO ${tableName} (id, term, command) VALUES (?, ?, ?) RETURNING id`;
+        const values = id === null ? [term, encodeCommand(command)] : [id, term, encodeCommand(command)];
         const db = await getConnection(fastify);
         const rows = await db.query(query, values);
         db.release();
         console.log('Rows: ', rows);
         if(rows.length > 0){
+            if(cachedLatestId !== null){
+                cachedLatestId = Math.max(cachedLatestId, Number(rows[0].id));
+            }
             return {
                 success: true,
-                data: rows[0].id,
+                data: Number(rows[0].id),
             };
         }
         console.log('Error inserting data');
@@ -47,22 +92,27 @@ const insert = async (fastify, command) => {
     }
 }
 
-// Get the latest id from the table
+// Get the latest id from the table, the id of the checkpoint if all entries were compacted
+// Every heartbeat needs the latest id, so it is cached until an entry is deleted
 const getLatestId = async (fastify) => {
+    if(cachedLatestId !== null){
+        return {
+            success: true,
+            data: cachedLatestId,
+        };
+    }
     try {
         const db = await getConnection(fastify);
-        const [ rows ] = await db.query(`SELECT id FROM ${tableName} ORDER BY id DESC LIMIT 1`);
+        const [ row ] = await db.query(
+            `SELECT GREATEST(COALESCE((SELECT MAX(id) FROM ${tableName}), 0), ` +
+            `COALESCE((SELECT log_id FROM ${checkpointTableName} WHERE id = 1), 0)) AS id`
+        );
         db.release();
-        if(rows){
-            return {
-                success: true,
-                data: rows.id,
-            };
-        }
+        cachedLatestId = row ? Number(row.id) : 0;
         return {
             success: true,
-            data: 0,
-    };
+            data: cachedLatestId,
+        };
     } catch (err) {
         console.log(err);
         return {
@@ -71,15 +121,27 @@ const getLatestId = async (fastify) => {
     }
 }
 
-// Get all data from the table starting from a specific id
+// Get the oldest entries after a specific id, at most maxCatchUpEntries
+// The data is null if entries after the id were already compacted
 const getAllByStartId = async (fastify, startId) => {
     try {
         const db = await getConnection(fastify);
-        const [ rows ] = await db.query(`SELECT * FROM ${tableName} WHERE id > ?`, [startId]);
+        const [ checkpoint ] = await db.query(`SELECT log_id FROM ${checkpointTableName} WHERE id = 1`);
+        const [ oldest ] = await db.query(`SELECT MIN(id) AS id FROM ${tableName}`);
+        const oldestId = oldest && oldest.id !== null ? Number(oldest.id) : (checkpoint ? Number(checkpoint.log_id) + 1 : 1);
+        if(startId + 1 < oldestId) {
+            db.release();
+            return {
+                success: true,
+                data: null,
+            };
+        }
+        const rows = await db.query(`SELECT id, term, command FROM ${tableName} WHERE id > ? ORDER BY id LIMIT ?`,
+            [startId, maxCatchUpEntries]);
         db.release();
         return {
             success: true,
-            data: Array.of(rows),
+            data: Array.from(rows),
         };
     } catch (err) {
         console.log(err);
@@ -93,12 +155,12 @@ const getAllByStartId = async (fastify, startId) => {
 const getById = async (fastify, id) => {
     try {
         const db = await getConnection(fastify);
-        const [ rows ] = await db.query(`SELECT * FROM ${tableName} WHERE id = ?`, [id]);
+        const rows = await db.query(`SELECT * FROM ${tableName} WHERE id = ?`, [id]);
         console.log('RowsByID: ', rows);
         db.release();
         return {
             success: true,
-            data: Array.of(rows),
+            data: Array.from(rows),
         };
     } catch (err) {
         console.log(err);
@@ -112,8 +174,9 @@ const getById = async (fastify, id) => {
 const deleteLog = async (fastify, id) => {
     try {
         const db = await getConnection(fastify);
-        const [ rows ] = await db.query(`DELETE FROM ${tableName} WHERE id = ?`, [id]);
+        const rows = await db.query(`DELETE FROM ${tableName} WHERE id = ?`, [id]);
         db.release();
+        cachedLatestId = null;
         return {
             success: true,
             data: rows,
@@ -126,11 +189,62 @@ const deleteLog = async (fastify, id) => {
     }
 }
 
+// Get the checkpoint, null if no checkpoint was written yet
+const getCheckpoint = async (fastify) => {
+    try {
+        const db = await getConnection(fastify);
+        const [ row ] = await db.query(`SELECT log_id, term FROM ${checkpointTableName} WHERE id = 1`);
+        db.release();
+        return {
+            success: true,
+            data: row ? {logId: Number(row.log_id), term: Number(row.term)} : null,
+        };
+    } catch (err) {
+        console.log(err);
+        return {
+            success: false
+        };
+    }
+}
+
+// Write the checkpoint of the last applied entry and delete the entries more than retain entries below it
+// retain is null to keep all entries, entries above limit are kept for the nodes which have not received them
+const checkpoint = async (fastify, logId, term, retain = null, limit = Infinity) => {
+    try {
+        const db = await getConnection(fastify);
+        await db.query(
+            `INSERT INTO ${checkpointTableName} (id, log_id, term) VALUES (1, ?, ?) ` +
+            `ON DUPLICATE KEY UPDATE log_id = GREATEST(log_id, VALUES(log_id)), term = GREATEST(term, VALUES(term))`,
+            [logId, term]
+        );
+        let compacted = 0;
+        const compactedId = retain !== null ? Math.min(logId - retain, limit) : 0;
+        if(compactedId > 0) {
+            const result = await db.query(`DELETE FROM ${tableName} WHERE id <= ?`, [compactedId]);
+            compacted = Number(result.affectedRows);
+        }
+        db.release();
+        return {
+            success: true,
+            data: compacted,
+        };
+    } catch (err) {
+        console.log(err);
+        return {
+            success: false
+        };
+    }
+}
+
 module.exports = {
     getAll,
     insert,
     getLatestId,
     getAllByStartId,
     getById,
-    deleteLog
-}
\ No newline at end of file
+    deleteLog,
+    getCheckpoint,
+    checkpoint,
+    encodeCommand,
+    decodeCommand
+}
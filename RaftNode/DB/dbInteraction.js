@@ -1,5 +1,7 @@
 const { getConnection } = require('./connection');
-const {getById} = require('./consensus_Node_Log');
+const {getById, decodeCommand} = require('./consensus_Node_Log');
+const {invalidateQuery} = require('./readCache');
+const {recordApplied} = require('./logRetention');
 let {currentLogId} = require("../Consensus/session");
 
 // Interact with the database with the given query and values of the consensus leader
@@ -46,10 +48,12 @@ const applyLog = async (fastify, logId) => {
     if(!log.success || !log.data || log.data.length === 0)
         return;
     console.log('Log: ', log);
-    const command = log.data[0].command;
-    console.log('Command: ', command);
-    const commandJson = JSON.parse(command);
+    const commandJson = decodeCommand(log.data[0].command);
+    console.log('Command: ', commandJson);
     await dbInteraction(fastify, commandJson.query, commandJson.values ?? null);
+    // Cached reads of the written table are outdated
+    invalidateQuery(commandJson.query);
+    await recordApplied(fastify, logId, Number(log.data[0].term));
     currentLogId = null;
 }
 
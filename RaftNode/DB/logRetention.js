@@ -0,0 +1,44 @@
+const {checkpoint} = require('./consensus_Node_Log');
+const {getConsensus} = require('../Consensus/session');
+
+// Applied entries between two checkpoints if the DSL defines no LOG CHECKPOINT
+const defaultCheckpointInterval = 1000;
+
+let appliedSinceCheckpoint = 0;
+let checkpointRunning = false;
+
+// Applied entries between two checkpoints, LOG CHECKPOINT of the DSL
+const getCheckpointInterval = () => {
+    const interval = Number(process.env.LOG_CHECKPOINT_INTERVAL);
+    return Number.isInteger(interval) && interval > 0 ? interval : defaultCheckpointInterval;
+}
+
+// Applied entries kept below the checkpoint, LOG RETAIN of the DSL, null to keep all entries
+const getRetain = () => {
+    const retain = Number(process.env.LOG_RETAIN);
+    return process.env.LOG_RETAIN && Number.isInteger(retain) && retain >= 0 ? retain : null;
+}
+
+// Record an applied log entry, every checkpoint interval the entry becomes the checkpoint
+// and the entries more than LOG RETAIN entries below it are compacted, if every node of the cluster has them
+const recordApplied = async (fastify, logId, term) => {
+    appliedSinceCheckpoint++;
+    if(appliedSinceCheckpoint < getCheckpointInterval() || checkpointRunning){
+        return;
+    }
+    appliedSinceCheckpoint = 0;
+    checkpointRunning = true;
+    try {
+        const consensus = getConsensus();
+        const result = await checkpoint(fastify, logId, term ?? 0, getRetain(), consensus ? consensus.getCompactionLimit() : 0);
+        if(result.success && result.data > 0){
+            console.log('Compacted ', result.data, ' log entries below checkpoint ', logId);
+        }
+    } finally {
+        checkpointRunning = false;
+    }
+}
+
+module.exports = {
+    recordApplied
+}
@@ -0,0 +1,125 @@
+const partitions = require('../partitions');
+const {dbInteraction} = require('./dbInteraction');
+const {post} = require('../Consensus/consensusVoting');
+const {getConsensus} = require('../Consensus/session');
+
+const dayMilliseconds = 24 * 60 * 60 * 1000;
+
+let rotationTimer = null;
+let rotationRunning = false;
+
+// Start of a partition from its name, partitions are named after their first day or value, e.g. p202610 or p1000000
+const parsePartitionStart = (partition, name) => {
+    const digits = name.slice(1);
+    if(partition.unit === null){
+        return Number(digits);
+    }
+    return new Date(Date.UTC(Number(digits.slice(0, 4)), Number(digits.slice(4, 6) || 1) - 1, Number(digits.slice(6, 8) || 1)));
+}
+
+// Start of the partition following the partition starting at start
+const addPartitionInterval = (partition, start) => {
+    switch (partition.unit){
+        case null:
+            return start + partition.interval;
+        case 'DAY':
+            return new Date(start.getTime() + partition.interval * dayMilliseconds);
+        case 'MONTH':
+            return new Date(Date.UTC(start.getUTCFullYear(), start.getUTCMonth() + partition.interval, 1));
+        default:
+            return new Date(Date.UTC(start.getUTCFullYear() + partition.interval, 0, 1));
+    }
+}
+
+// Definition of the partition from start to end, named and bounded like the partitions of the compiled schema
+const formatPartition = (partition, start, end) => {
+    if(partition.unit === null){
+        return `  PARTITION p${start} VALUES LESS THAN (${end})`;
+    }
+    const name = start.toISOString().slice(0, 10).replace(/-/g, '').slice(0, {DAY: 8, MONTH: 6, YEAR: 4}[partition.unit]);
+    const endDay = end.toISOString().slice(0, 10);
+    const bound = partition.datatype === 'date' ? `'${endDay}'` : `UNIX_TIMESTAMP('${endDay} 00:00:00')`;
+    return `  PARTITION p${name} VALUES LESS THAN (${bound})`;
+}
+
+// Current period of a date or timestamp column, the largest value of an integer column
+const getCurrentValue = async (fastify, partition) => {
+    if(partition.unit !== null){
+        return new Date();
+    }
+    const result = await dbInteraction(fastify, `SELECT COALESCE(MAX(${partition.column}), 0) AS value FROM ${partition.table}`);
+    return result.success && result.data.length > 0 ? Number(result.data[0].value) : null;
+}
+
+// Split the partitions up to ahead partitions after the current value off the MAXVALUE partition of a table
+// The statement is a log entry, so all nodes add the same partitions, expired partitions are dropped manually
+const rotatePartition = async (fastify, partition) => {
+    const result = await dbInteraction(fastify,
+        `SELECT PARTITION_NAME AS name FROM INFORMATION_SCHEMA.PARTITIONS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? ` +
+        `AND PARTITION_NAME <> 'pmax' ORDER BY PARTITION_ORDINAL_POSITION DESC LIMIT 1`, [partition.table]);
+    const currentValue = await getCurrentValue(fastify, partition);
+    if(!result.success || result.data.length === 0 || currentValue === null){
+        console.log('Partition rotation of ', partition.table, ' skipped, its partitions could not be read');
+        return false;
+    }
+    let limit = currentValue;
+    for(let count = 0; count < partition.ahead; count++){
+        limit = addPartitionInterval(partition, limit);
+    }
+    const definitions = [];
+    let start = addPartitionInterval(partition, parsePartitionStart(partition, result.data[0].name));
+    while(start.valueOf() <= limit.valueOf()){
+        const end = addPartitionInterval(partition, start);
+        definitions.push(formatPartition(partition, start, end));
+        start = end;
+    }
+    if(definitions.length === 0){
+        return true;
+    }
+    // Range columns need the parenthesized value list
+    definitions.push(`  PARTITION pmax VALUES LESS THAN ${partition.datatype === 'date' ? '(MAXVALUE)' : 'MAXVALUE'}`);
+    const statement = `ALTER TABLE ${partition.table} REORGANIZE PARTITION pmax INTO (\n${definitions.join(',\n')}\n)`;
+    const response = await post(fastify, statement, null);
+    if(!response.success){
+        console.log('Partition rotation of ', partition.table, ' failed: ', response.data);
+        return false;
+    }
+    console.log('Added ', definitions.length - 1, ' partitions to ', partition.table);
+    return true;
+}
+
+// Rotate the range partitions of all tables, only the leader rotates them
+const rotatePartitions = async (fastify) => {
+    if(rotationRunning){
+        return;
+    }
+    rotationRunning = true;
+    try {
+        for(const partition of partitions.tables){
+            await rotatePartition(fastify, partition);
+        }
+    } finally {
+        rotationRunning = false;
+    }
+}
+
+// Rotate the range partitions now and in every rotation interval, until this node is no longer the leader
+const startPartitionRotation = async (fastify) => {
+    if(partitions.tables.length === 0 || rotationTimer !== null){
+        return;
+    }
+    rotationTimer = setInterval(() => {
+        const consensus = getConsensus();
+        if(!consensus || !consensus.checkLeader(fastify.serverId)){
+            clearInterval(rotationTimer);
+            rotationTimer = null;
+            return;
+        }
+        rotatePartitions(fastify);
+    }, partitions.interval);
+    await rotatePartitions(fastify);
+}
+
+module.exports = {
+    startPartitionRotation
+}
@@ -0,0 +1,95 @@
+// Caches the results of GET endpoints declared with CACHE
+// Every write to a table, by a generated endpoint or by replaying the consensus log, invalidates the caches of the table
+
+// Table name -> Set of the caches of its GET endpoints
+const cachesByTable = new Map();
+
+// Tables written by INSERT, UPDATE and DELETE queries
+const writtenTablePattern = /^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?/i;
+
+// LRU cache with a TTL, the Map keeps its keys in insertion order, so the first key is the least recently used one
+class ReadCache {
+    constructor(maxEntries, ttl) {
+        this.maxEntries = maxEntries;
+        this.ttl = ttl;
+        this.entries = new Map();
+        // Incremented by every invalidation, results read before an invalidation are not cached
+        this.currentGeneration = 0;
+    }
+
+    // Returns the cached value of the key, undefined if it is missing or expired
+    get(key) {
+        const entry = this.entries.get(key);
+        if(!entry) {
+            return undefined;
+        }
+        this.entries.delete(key);
+        if(entry.expiresAt <= Date.now()) {
+            return undefined;
+        }
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    // Returns the generation to pass to set, read it before the query
+    generation() {
+        return this.currentGeneration;
+    }
+
+    // Caches the value of the key if the cache was not invalidated since the generation was read
+    set(key, value, generation) {
+        if(generation !== this.currentGeneration) {
+            return;
+        }
+        this.entries.delete(key);
+        this.entries.set(key, {value: value, expiresAt: Date.now() + this.ttl});
+        if(this.entries.size > this.maxEntries) {
+            this.entries.delete(this.entries.keys().next().value);
+        }
+    }
+
+    // Removes all cached values
+    clear() {
+        this.currentGeneration++;
+        this.entries.clear();
+    }
+}
+
+// Create the cache of a GET endpoint reading the table
+const createReadCache = (table, maxEntries, ttl) => {
+    const cache = new ReadCache(maxEntries, ttl);
+    if(!cachesByTable.has(table)) {
+        cachesByTable.set(table, new Set());
+    }
+    cachesByTable.get(table).add(cache);
+    return cache;
+}
+
+// Invalidate all caches of the table
+const invalidateTable = (table) => {
+    const caches = cachesByTable.get(table);
+    if(!caches) {
+        return;
+    }
+    for(const cache of caches) {
+        cache.clear();
+    }
+}
+
+// Invalidate the caches of the table written by the query, all caches if the table can not be determined
+const invalidateQuery = (query) => {
+    const match = typeof query === 'string' ? query.match(writtenTablePattern) : null;
+    if(match) {
+        invalidateTable(match[1]);
+        return;
+    }
+    for(const table of cachesByTable.keys()) {
+        invalidateTable(table);
+    }
+}
+
+module.exports = {
+    createReadCache,
+    invalidateTable,
+    invalidateQuery
+}
@@ -0,0 +1,73 @@
+const migrations = require('../migrations');
+const {dbInteraction} = require('./dbInteraction');
+const {post} = require('../Consensus/consensusVoting');
+
+const migrationTableName = 'Consensus_Node_Migration';
+
+let migrationRunning = false;
+
+// Get the version of the last migration applied to the database, 0 if none was applied,
+// and the number of applied statements of a migration in progress by its version
+const getAppliedVersion = async (fastify) => {
+    const result = await dbInteraction(fastify, `SELECT version, applied_statements FROM ${migrationTableName}`);
+    if(!result.success){
+        return null;
+    }
+    let version = 0;
+    const appliedStatements = new Map();
+    for(const row of result.data){
+        if(row.applied_statements === null){
+            version = Math.max(version, Number(row.version));
+        } else {
+            appliedStatements.set(Number(row.version), Number(row.applied_statements));
+        }
+    }
+    return {version, appliedStatements};
+}
+
+// Record the number of applied statements of a migration, null once all of them are applied
+const recordProgress = async (fastify, version, appliedStatements) => {
+    return await post(fastify, `INSERT INTO ${migrationTableName} (version, applied_statements) VALUES (?, ?) ` +
+        `ON DUPLICATE KEY UPDATE applied_statements = VALUES(applied_statements)`, [version, appliedStatements]);
+}
+
+// Apply the migrations generated by the compiler which are newer than the database
+// Only the leader applies them, every statement is a log entry, so all nodes migrate in the same order
+// MariaDB commits every DDL statement on its own, so the progress is recorded after each statement
+// A failed statement stops the migration, the next elected leader continues with it
+const applyPendingMigrations = async (fastify) => {
+    if(migrationRunning){
+        return;
+    }
+    migrationRunning = true;
+    try {
+        const applied = await getAppliedVersion(fastify);
+        if(applied === null){
+            console.log('Schema migration skipped, the applied version could not be read');
+            return;
+        }
+        for(const migration of migrations){
+            if(migration.version <= applied.version){
+                continue;
+            }
+            const appliedStatements = applied.appliedStatements.get(migration.version) ?? 0;
+            console.log('Applying schema migration ', migration.version, ' from statement ', appliedStatements + 1);
+            for(let index = appliedStatements; index < migration.statements.length; index++){
+                const response = await post(fastify, migration.statements[index], null);
+                const progress = response.success
+                    ? await recordProgress(fastify, migration.version, index + 1 < migration.statements.length ? index + 1 : null)
+                    : response;
+                if(!progress.success){
+                    console.log('Schema migration ', migration.version, ' failed at statement ', index + 1, ': ', progress.data);
+                    return;
+                }
+            }
+        }
+    } finally {
+        migrationRunning = false;
+    }
+}
+
+module.exports = {
+    applyPendingMigrations
+}
@@ -6,6 +6,8 @@ const {handleHeartbeat, handleMissingLog, insertMissingLog} = require('../Consen
 const {applyLog} = require('../DB/dbInteraction');
 const {handleVotingRequest, handleVotingResponse} = require('../Consensus/consensusVoting');
 const {deleteLog} = require('../DB/consensus_Node_Log');
+const {applyPendingMigrations} = require('../DB/schemaMigration');
+const {startPartitionRotation} = require('../DB/partitionRotation');
 
 //handles the messages from connectionIn and connectionOut
 const handleMessage = (fastify, message, ws) => {
@@ -31,16 +33,22 @@ const handleMessage = (fastify, message, ws) => {
             if(handleVoteResponse(fastify, payload)){
                 updateLeader(fastify.serverId);
                 publishLeaderElection(fastify);
+                // The new leader brings the schema up to the version of the compiled DSL, then keeps the range partitions ahead
+                applyPendingMigrations(fastify).then(() => startPartitionRotation(fastify));
             }
             break;
         case consensusTypes.ELECTIONRESULT:
             // Handle the election result
-            updateLeader(payload.serverId);
+            updateLeader(payload.serverId, payload.term);
             break;
         case consensusTypes.HEARBEAT:
             // Handle the heartbeat
             handleIncomingHeartbeat(fastify, payload);
             break;
+        case consensusTypes.HEARTBEATRESPONSE:
+            // Handle the heartbeat acknowledgement of a follower
+            handleIncomingHeartbeatResponse(payload);
+            break;
         case consensusTypes.MISSINGLOG:
             // Handle the missing log
             handleMissingLog(fastify, payload);
@@ -78,12 +86,12 @@ const handleIncomingLeaderElection = async (fastify, payload) => {
     }
 }
 
-//Update the leader
-const updateLeader = (serverId) => {
+//Update the leader, elected in the given term
+const updateLeader = (serverId, term = null) => {
     const consensus = getConsensus();
     if(consensus){
         consensus.stopsSelectLeaderTimeout();
-        consensus.setLeader(serverId);
+        consensus.setLeader(serverId, term);
     }
 }
 
@@ -96,6 +104,14 @@ const handleIncomingHeartbeat = async (fastify, payload) => {
     }
 }
 
+//handle the acknowledgement of a heartbeat for the leader lease
+const handleIncomingHeartbeatResponse = (payload) => {
+    const consensus = getConsensus();
+    if(consensus){
+        consensus.receiveHeartbeatResponse(payload);
+    }
+}
+
 // Handle the delete log
 const handleDeleteLog = async (fastify, payload) => {
     if(!payload.logId){
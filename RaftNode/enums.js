@@ -8,6 +8,7 @@ const consensusTypes = Object.freeze({
     VOTERESPONSE: "VOTERESPONSE",
     LEADERELECTION: "LEADERELECTION",
     HEARBEAT: "HEARBEAT",
+    HEARTBEATRESPONSE: "HEARTBEATRESPONSE",
     ELECTIONRESULT: "ELECTIONRESULT",
     MISSINGLOG: "MISSINGLOG",
     APPENDLOG: "APPENDLOG",
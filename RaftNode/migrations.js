@@ -0,0 +1,3 @@
+// Schema migrations applied in order by the leader through the consensus log
+module.exports = [
+];
@@ -0,0 +1,6 @@
+// Range partitions kept ahead of the current period or value by the leader
+module.exports = {
+    interval: 3600000,
+    tables: [
+    ]
+};
@@ -0,0 +1,52 @@
+#!/bin/bash
+
+# Check if the required number of arguments is provided
+if [ $# -lt 1 ]; then
+    echo "Please provide the number of database instances as parameter."
+    echo "Example: $0 5"
+    echo "Generate the seed data first, e.g. python3 ./Compiler/forgeapi_compiler.py ./path/to/file.forgeapi --seed-rows 1000000"
+    exit 1
+fi
+
+INSTANCE_COUNT=$1
+SEED_DIR=./DB/seed
+
+# Check if the seed data was generated
+if [ ! -f "$SEED_DIR/load.sql" ]; then
+    echo "Error: No seed data found in $SEED_DIR, run the compiler with --seed-rows first."
+    exit 1
+fi
+
+# Read the database name and the root password generated by the compiler
+set -a
+source ./.env
+set +a
+
+# Every replica loads the same files, so all of them end up with identical rows
+# The replicas are loaded in parallel, the seeded rows are not written to the consensus log
+PIDS=()
+for i in $(seq 1 $INSTANCE_COUNT)
+do
+  (
+    docker exec db-${i} rm -rf /seed &&
+    docker cp "$SEED_DIR" db-${i}:/seed &&
+    docker exec -i db-${i} mariadb --local-infile=1 -uroot -p"$MYSQL_ROOT_PASSWORD" "$MYSQL_DATABASE" < "$SEED_DIR/load.sql" &&
+    docker exec db-${i} rm -rf /seed
+  ) &
+  PIDS+=($!)
+done
+
+FAILED=0
+for i in $(seq 1 $INSTANCE_COUNT)
+do
+  if ! wait ${PIDS[$((i - 1))]}; then
+    echo "Error: Seeding db-${i} failed."
+    FAILED=1
+  fi
+done
+
+if [ $FAILED -ne 0 ]; then
+    exit 1
+fi
+
+echo "Seeded: $INSTANCE_COUNT database containers"
@@ -3,12 +3,14 @@
 # Check if the required number of arguments is provided
 if [ $# -lt 2 ]; then
     echo "Please provide the number of server instances and the file path as parameters."
-    echo "Example: $0 5 ./path/to/file.forgeapi"
+    echo "Example: $0 5 ./path/to/file.forgeapi [--reset]"
+    echo "--reset deletes the database volumes, otherwise the schema is migrated and the data is kept."
     exit 1
 fi
 
 INSTANCE_COUNT=$1
 FILE_PATH=$2
+RESET=$3
 
 # Check if the file path exists
 if [ ! -f "$FILE_PATH" ]; then
@@ -16,12 +18,15 @@ if [ ! -f "$FILE_PATH" ]; then
     exit 1
 fi
 
-# Delete generated Files
-rm -rf ./RaftNode/REST/*
+# Generated files are not deleted up front: the compiler only rewrites changed files
+# and removes stale endpoint files itself, so unchanged files keep their modification times
 
 # Clear Docker
+# The database volumes are kept, the leader migrates their schema to the compiled DSL
 docker compose down
-docker volume rm $(docker volume ls -q)
+if [ "$RESET" == "--reset" ]; then
+    docker volume rm $(docker volume ls -q)
+fi
 
 # Execute the compiler script with the provided file path
 if ! python3 ./Compiler/forgeapi_compiler.py "$FILE_PATH"; then